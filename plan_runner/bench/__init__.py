@@ -0,0 +1,4 @@
+"""Benchmarks for plan runner internals.
+
+Each module is runnable on its own, e.g. ``python -m plan_runner.bench.state_writes``.
+"""
@@ -0,0 +1,140 @@
+"""Compare the thread-pool and asyncio engines under a fake CLI.
+
+Usage:
+    python -m plan_runner.bench.engines [--tasks 400] [--workers 50 200] [--latency 1.0]
+
+Each engine runs in its own child process so peak RSS and thread counts
+are not shared between measurements.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from ..models.config import PlanConfig
+from ..models.plan import Plan, Phase, Task
+from ..state.state_manager import StateManager
+from ..executor.scheduler import TaskScheduler, ENGINES
+from ..executor.async_engine import AsyncTaskScheduler
+
+FAKE_CLAUDE = Path(__file__).with_name("fake_claude.py")
+
+
+def run_engine(engine: str, task_count: int, workers: int, latency: float, workdir: Path) -> dict:
+    """Run a single-phase synthetic plan on one engine.
+
+    Args:
+        engine: One of ENGINES
+        task_count: Number of tasks
+        workers: Concurrent CLI sessions
+        latency: Seconds each fake CLI session takes
+        workdir: Scratch directory
+
+    Returns:
+        Dict with wall time, throughput, overhead, peak threads and peak RSS
+    """
+    config = PlanConfig(
+        name="bench",
+        workers=workers,
+        retries=1,
+        working_dir=str(workdir),
+        claude_command=f"{sys.executable} {FAKE_CLAUDE} --latency {latency}",
+    )
+    phase = Phase(name="bench")
+    plan = Plan(name="bench", config=config, phases=[phase])
+    tasks = [Task(task_id=f"task-{i:06d}", phase_name="bench", prompt="x" * 400) for i in range(task_count)]
+
+    manager = StateManager(workdir / f"state-{engine}.json", durability="none")
+    manager.initialize(plan, tasks)
+    scheduler_class = AsyncTaskScheduler if engine == "asyncio" else TaskScheduler
+    scheduler = scheduler_class(config=config, state_manager=manager)
+
+    peak_threads = threading.active_count()
+    stop = threading.Event()
+
+    def sample_threads() -> None:
+        nonlocal peak_threads
+        while not stop.wait(0.01):
+            peak_threads = max(peak_threads, threading.active_count())
+
+    sampler = threading.Thread(target=sample_threads, daemon=True)
+    sampler.start()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        _success, completed, failed = scheduler.execute([phase], {"bench": tasks})
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    sampler.join()
+    manager.close()
+
+    ideal = math.ceil(task_count / workers) * latency
+    return {
+        "engine": engine,
+        "workers": workers,
+        "completed": completed,
+        "failed": failed,
+        "wall_s": elapsed,
+        "tasks_per_s": task_count / elapsed,
+        "overhead_ms_per_task": (elapsed - ideal) / task_count * 1000,
+        # The sampler thread itself is not a worker
+        "peak_threads": peak_threads - 1,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main(args: list[str] = None) -> int:
+    """Run each engine in a child process and print a table."""
+    parser = argparse.ArgumentParser(prog="plan_runner.bench.engines")
+    parser.add_argument("--tasks", type=int, default=400)
+    parser.add_argument("--workers", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--single", choices=ENGINES, help=argparse.SUPPRESS)
+    parsed = parser.parse_args(args)
+
+    if parsed.single:
+        with tempfile.TemporaryDirectory() as tmp:
+            result = run_engine(parsed.single, parsed.tasks, parsed.workers[0], parsed.latency, Path(tmp))
+        print(json.dumps(result))
+        return 0
+
+    print(
+        f"{'engine':>8} {'workers':>8} {'wall s':>8} {'tasks/s':>9} "
+        f"{'overhead ms/task':>17} {'threads':>8} {'RSS MB':>8}"
+    )
+    for workers in parsed.workers:
+        for engine in parsed.engines:
+            output = subprocess.run(
+                [
+                    sys.executable, "-m", "plan_runner.bench.engines",
+                    "--single", engine,
+                    "--tasks", str(parsed.tasks),
+                    "--workers", str(workers),
+                    "--latency", str(parsed.latency),
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{engine:>8} {workers:>8} {result['wall_s']:>8.2f} {result['tasks_per_s']:>9.1f} "
+                f"{result['overhead_ms_per_task']:>17.2f} {result['peak_threads']:>8} "
+                f"{result['peak_rss_mb']:>8.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,174 @@
+"""Stand-in for the claude CLI used by benchmarks.
+
+Reads the prompt from stdin, sleeps, and prints a result in the shape of
+``claude --print --output-format json`` (or ``stream-json``). Only the standard library is
+used so the script starts quickly when run by path:
+
+    python plan_runner/bench/fake_claude.py --latency 0.5 --print ...
+
+Options before the regular CLI flags configure the fake; unknown flags
+(``--model``, ``--dangerously-skip-permissions``...) are ignored:
+
+- ``--latency``, ``--latency-dist``, ``--latency-spread``: seconds per
+  session, fixed or drawn from a uniform, exponential or lognormal
+  distribution with that mean
+- ``--fail-rate``, ``--fail-kind``: share of sessions that fail, and how
+  (the stderr of a task failure, rate limit, overload or auth error)
+- ``--output-bytes``, ``--input-tokens``, ``--output-tokens``: size of the
+  result text and the usage reported (input defaults to prompt length / 4)
+
+The same options drive the in-process ``fake`` runner (see fake_runner).
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+# stderr of a failed session, by kind (see executor.failures for how each is classified)
+FAILURE_MESSAGES = {
+    "task": "Error: the task could not be completed",
+    "rate_limit": "API Error: 429 rate_limit_error: Number of requests has exceeded your rate limit; retry-after: 1",
+    "transient": "API Error: 529 overloaded_error: Overloaded",
+    "permanent": "Invalid API key · Please run /login",
+}
+
+
+@dataclass
+class FakeProfile:
+    """Behaviour of the fake CLI."""
+
+    latency: float = 0.1  # mean seconds per session
+    latency_dist: str = "fixed"
+    latency_spread: float = 0.5  # uniform: +/- fraction of the mean; lognormal: sigma
+    fail_rate: float = 0.0
+    fail_kind: str = "task"
+    output_bytes: int = 2
+    input_tokens: Optional[int] = None  # None: prompt length / 4
+    output_tokens: int = 16
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Draw the duration of one session."""
+        if self.latency <= 0:
+            return 0.0
+        if self.latency_dist == "uniform":
+            return rng.uniform(self.latency * (1 - self.latency_spread), self.latency * (1 + self.latency_spread))
+        if self.latency_dist == "exponential":
+            return rng.expovariate(1 / self.latency)
+        if self.latency_dist == "lognormal":
+            sigma = self.latency_spread
+            return rng.lognormvariate(math.log(self.latency) - sigma * sigma / 2, sigma)
+        return self.latency
+
+    def session(self, prompt: str, rng: random.Random) -> tuple[float, int, dict, str]:
+        """Decide the outcome of one session.
+
+        Returns:
+            Tuple of (latency, exit code, result message, stderr)
+        """
+        latency = self.sample_latency(rng)
+        usage = {
+            "input_tokens": self.input_tokens if self.input_tokens is not None else len(prompt) // 4,
+            "output_tokens": self.output_tokens,
+        }
+        if rng.random() < self.fail_rate:
+            message = FAILURE_MESSAGES[self.fail_kind]
+            result = {"type": "result", "result": message, "is_error": True, "usage": usage}
+            return latency, 1, result, message
+        text = ("ok " * (self.output_bytes // 3 + 1))[:self.output_bytes]
+        result = {"type": "result", "result": text, "is_error": False, "usage": usage}
+        return latency, 0, result, ""
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the parser of the fake's options."""
+    parser = argparse.ArgumentParser(prog="fake_claude", add_help=False)
+    parser.add_argument("--latency", type=float, default=0.1, help="Mean seconds per session")
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--latency-spread", type=float, default=0.5)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--fail-kind", choices=sorted(FAILURE_MESSAGES), default="task")
+    parser.add_argument("--output-bytes", type=int, default=2)
+    parser.add_argument("--input-tokens", type=int)
+    parser.add_argument("--output-tokens", type=int, default=16)
+    parser.add_argument("--version", action="store_true")
+    parser.add_argument("--output-format", default="text")
+    return parser
+
+
+def parse_profile(args: list[str]) -> tuple[FakeProfile, argparse.Namespace]:
+    """Parse the fake's options, ignoring everything else.
+
+    Returns:
+        Tuple of (profile, parsed options)
+    """
+    parsed, _unknown = build_parser().parse_known_args(args)
+    profile = FakeProfile(
+        latency=parsed.latency,
+        latency_dist=parsed.latency_dist,
+        latency_spread=parsed.latency_spread,
+        fail_rate=parsed.fail_rate,
+        fail_kind=parsed.fail_kind,
+        output_bytes=parsed.output_bytes,
+        input_tokens=parsed.input_tokens,
+        output_tokens=parsed.output_tokens,
+    )
+    return profile, parsed
+
+
+def stream_messages(result: dict) -> tuple[list[dict], list[dict]]:
+    """Split a session into stream-json messages sent before and after its midpoint."""
+    assistant = {
+        "type": "assistant",
+        "message": {
+            "id": "msg_fake",
+            "content": [{"type": "text", "text": result["result"]}],
+            "usage": result["usage"],
+        },
+    }
+    return [{"type": "system", "subtype": "init"}], [assistant, result]
+
+
+def main(args: list[str] = None) -> int:
+    """Emulate one CLI session."""
+    profile, parsed = parse_profile(sys.argv[1:] if args is None else args)
+
+    if parsed.version:
+        print("0.0.0 (fake claude)")
+        return 0
+
+    prompt = sys.stdin.read()
+    latency, exit_code, result, stderr = profile.session(prompt, random.Random())
+
+    if parsed.output_format == "stream-json":
+        first, rest = stream_messages(result)
+        for message in first:
+            emit(message)
+        time.sleep(latency / 2)
+        emit(rest[0])
+        time.sleep(latency / 2)
+        for message in rest[1:]:
+            emit(message)
+    else:
+        time.sleep(latency)
+        if exit_code == 0:
+            json.dump(result, sys.stdout)
+    if stderr:
+        print(stderr, file=sys.stderr)
+    return exit_code
+
+
+def emit(message: dict) -> None:
+    """Write one stream-json line."""
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
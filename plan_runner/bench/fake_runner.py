@@ -0,0 +1,114 @@
+"""In-process fake CLI, for load tests that would otherwise spawn millions of processes.
+
+Selected with ``runner: fake``. The fake's options are read from
+``claude_command`` exactly as the fake CLI script would read them, so a
+plan can switch between spawning ``fake_claude.py`` and simulating it in
+process without changing anything else. Results go through the same
+parsing (and, with stream-json, the same transcript writing) as real CLI
+output.
+"""
+
+import asyncio
+import json
+import random
+import shlex
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from ..models.config import PlanConfig
+from ..executor.cancellation import CancelToken
+from ..executor.claude_runner import ClaudeResult, ClaudeRunner
+from ..executor.stream import OutputTail
+from .fake_claude import FakeProfile, parse_profile, stream_messages
+
+
+class FakeRunner(ClaudeRunner):
+    """Simulate fake_claude sessions without starting a process."""
+
+    name = "fake"
+
+    def __init__(self, profile: Optional[FakeProfile] = None, **kwargs):
+        """Initialize fake runner.
+
+        Args:
+            profile: Behaviour of the simulated CLI
+            **kwargs: ClaudeRunner arguments
+        """
+        super().__init__(**kwargs)
+        self.profile = profile or FakeProfile()
+        self.rng = random.Random()
+
+    @classmethod
+    def from_config(cls, config: PlanConfig) -> "FakeRunner":
+        """Create a runner simulating the fake CLI configured in ``claude_command``."""
+        profile, _parsed = parse_profile(shlex.split(config.claude_command))
+        return cls(
+            profile=profile,
+            working_dir=config.working_dir,
+            model=config.model,
+            timeout=config.timeout,
+            command=config.claude_command,
+            output_format=config.output_format,
+            transcript_dir=Path(config.output_dir) / "transcripts",
+            tail_bytes=config.output_tail_bytes,
+        )
+
+    def run(
+        self,
+        prompt: str,
+        task_id: str = "",
+        on_usage: Optional[Callable[[int, int], None]] = None,
+        cancel: Optional[CancelToken] = None,
+    ) -> ClaudeResult:
+        """Simulate a session, sleeping the calling thread."""
+        latency, exit_code, result, stderr = self.profile.session(prompt, self.rng)
+        wait = min(latency, self.timeout)
+        if cancel is not None:
+            if cancel.wait(wait):
+                return self.cancelled_result()
+        elif wait > 0:
+            time.sleep(wait)
+        if latency > self.timeout:
+            return self.timeout_result()
+        return self._result(exit_code, result, stderr, task_id, on_usage)
+
+    async def run_async(
+        self,
+        prompt: str,
+        task_id: str = "",
+        on_usage: Optional[Callable[[int, int], None]] = None,
+    ) -> ClaudeResult:
+        """Simulate a session, suspending the coroutine."""
+        latency, exit_code, result, stderr = self.profile.session(prompt, self.rng)
+        await asyncio.sleep(min(latency, self.timeout))
+        if latency > self.timeout:
+            return self.timeout_result()
+        return self._result(exit_code, result, stderr, task_id, on_usage)
+
+    def _result(
+        self,
+        exit_code: int,
+        result: dict,
+        stderr: str,
+        task_id: str,
+        on_usage: Optional[Callable[[int, int], None]],
+    ) -> ClaudeResult:
+        """Parse simulated output like the output of a real session."""
+        if not self.streaming:
+            stdout = json.dumps(result) if exit_code == 0 else ""
+            return self.parse_result(exit_code, stdout, stderr)
+        collector = self._new_collector(task_id, on_usage)
+        stderr_tail = OutputTail(self.tail_bytes)
+        stderr_tail.append(stderr.encode("utf-8"))
+        try:
+            first, rest = stream_messages(result)
+            for message in first + rest:
+                collector.feed((json.dumps(message) + "\n").encode("utf-8"))
+        finally:
+            collector.close()
+        return self.stream_result(exit_code, collector, stderr_tail)
+
+    def check_available(self) -> bool:
+        """The simulation is always available."""
+        return True
@@ -0,0 +1,285 @@
+"""Load-test plan_runner itself against the fake CLI.
+
+Usage:
+    python -m plan_runner bench [--tasks 1000 100000] [--workers 100] [--latency 0]
+    python -m plan_runner.bench.load ...
+
+Drives a synthetic plan of ``--tasks`` tasks (split over ``--phases``
+dependent phases) through PlanExecutor: task generation, state, the
+scheduler and the runner. By default the fake CLI is simulated in process
+(``runner: fake``) so that a million tasks do not mean a million process
+starts; ``--mode process`` spawns ``fake_claude.py`` for every attempt.
+The fake's options (``--latency``, ``--latency-dist``, ``--fail-rate``,
+``--output-bytes``...) are passed through.
+
+Reported per run:
+- dispatch throughput: attempts per second while tasks were executing
+- scheduler overhead: worker time per task not spent in simulated latency
+- state-write latency: time workers spend in StateManager calls, and the
+  duration of each flush to the backend
+- peak RSS of the runner (and of the fake CLI processes, if spawned)
+
+Each size runs in its own child process so peak RSS is not shared.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+from typing import Callable
+
+from ..models.config import PlanConfig
+from ..models.plan import DataSource, Phase, Plan, TaskOutput, TaskTemplate
+from ..executor.plan_executor import PlanExecutor
+from ..executor.scheduler import ENGINES, EXECUTION_MODES
+from ..state.backend import STATE_BACKENDS
+from .engines import FAKE_CLAUDE
+from .fake_claude import build_parser, parse_profile
+
+MODES = ("inline", "process")
+
+
+class Timings:
+    """Durations of calls to a set of wrapped methods (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: list[float] = []
+
+    def wrap(self, function: Callable) -> Callable:
+        """Wrap a function so each call's duration is recorded."""
+        @wraps(function)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.samples.append(elapsed)
+        return timed
+
+    def summary(self, scale: float) -> dict:
+        """Count, p50, p99 and max of the samples, multiplied by ``scale``."""
+        samples = sorted(self.samples)
+        if not samples:
+            return {"count": 0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+        return {
+            "count": len(samples),
+            "p50": samples[len(samples) // 2] * scale,
+            "p99": samples[min(int(len(samples) * 0.99), len(samples) - 1)] * scale,
+            "max": samples[-1] * scale,
+        }
+
+
+def make_plan(
+    task_count: int,
+    phases: int,
+    prompt_bytes: int,
+    config: PlanConfig,
+) -> Plan:
+    """Build a synthetic plan of ``phases`` chained phases over one data source.
+
+    Args:
+        task_count: Total number of tasks (rounded down to a multiple of phases)
+        phases: Number of phases, each depending on the previous one
+        prompt_bytes: Approximate length of each rendered prompt
+        config: Plan configuration
+
+    Returns:
+        Plan with an inline data source and one template per phase
+    """
+    per_phase = max(task_count // phases, 1)
+    items = [{"id": f"{i:07d}"} for i in range(per_phase)]
+    filler = "x" * max(prompt_bytes - 40, 0)
+    plan_phases = []
+    for index in range(phases):
+        template = TaskTemplate(
+            name=f"step{index}",
+            foreach="${data.items}",
+            task_id_template=f"step{index}-${{item.id}}",
+            prompt_template=f"Step {index} of item ${{item.id}}. {filler}",
+            outputs=[TaskOutput("result", f"out/step{index}/${{item.id}}.md")],
+        )
+        plan_phases.append(Phase(
+            name=f"phase{index}",
+            depends_on=[f"phase{index - 1}"] if index else [],
+            task_templates=[template],
+        ))
+    return Plan(
+        name="bench",
+        config=config,
+        data_sources={"items": DataSource("items", "inline", items)},
+        phases=plan_phases,
+    )
+
+
+def run_load(parsed: argparse.Namespace, fake_args: list[str], task_count: int, workdir: Path) -> dict:
+    """Run one synthetic plan and measure it.
+
+    Args:
+        parsed: Harness options
+        fake_args: Options of the fake CLI
+        task_count: Number of tasks
+        workdir: Scratch directory
+
+    Returns:
+        Dict of measurements
+    """
+    profile, _options = parse_profile(fake_args)
+    command = " ".join([sys.executable, str(FAKE_CLAUDE), *fake_args])
+    config = PlanConfig(
+        name="bench",
+        workers=parsed.workers,
+        retries=parsed.retries,
+        retry_delay=0,
+        breaker_threshold=0,
+        working_dir=str(workdir),
+        output_dir=str(workdir / "output"),
+        runner="fake" if parsed.mode == "inline" else "cli",
+        claude_command=command,
+        output_format=parsed.output_format,
+        state_backend=parsed.state_backend,
+        state_durability=parsed.state_durability,
+        cache=False,
+        history_file="",
+        progress_interval=3600,
+        execution=parsed.execution,
+        engine=parsed.engine,
+    )
+    plan = make_plan(task_count, parsed.phases, parsed.prompt_bytes, config)
+    executor = PlanExecutor(plan)
+    manager = executor.state_manager
+
+    calls = Timings()
+    for name in ("task_started", "task_completed", "task_failed"):
+        setattr(manager, name, calls.wrap(getattr(manager, name)))
+    flushes = Timings()
+    manager.flush = flushes.wrap(manager.flush)
+    generation = Timings()
+    executor._generate_all_tasks = generation.wrap(executor._generate_all_tasks)
+
+    attempts = 0
+    first_start = None
+    started = manager.task_started
+
+    def count_start(task_id: str) -> None:
+        nonlocal attempts, first_start
+        if first_start is None:
+            first_start = time.perf_counter()
+        attempts += 1
+        started(task_id)
+
+    manager.task_started = count_start
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            executor.execute()
+        finally:
+            sys.stdout = stdout
+    end = time.perf_counter()
+
+    tasks = len(executor.tasks)
+    status = {"completed": 0, "failed": 0}
+    for result in manager.state.tasks.values():
+        if result.status.value in status:
+            status[result.status.value] += 1
+    running = end - (first_start or end)
+    busy = attempts * max(profile.latency, 0.0)  # every distribution has the configured mean
+    return {
+        "tasks": tasks,
+        "attempts": attempts,
+        **status,
+        "wall_s": end - start,
+        "generate_s": sum(generation.samples),
+        "run_s": running,
+        "dispatch_per_s": attempts / running if running else 0.0,
+        "overhead_ms_per_task": (running * parsed.workers - busy) / tasks * 1000 if tasks else 0.0,
+        "state_call_us": calls.summary(1e6),
+        "flush_ms": flushes.summary(1e3),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "children_peak_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }
+
+
+def main(args: list[str] = None) -> int:
+    """Run each size in a child process and print a table."""
+    parser = argparse.ArgumentParser(
+        prog="plan_runner bench",
+        description="Measure plan_runner's own overhead against a fake claude CLI",
+        epilog="Other options configure the fake CLI: --latency-dist, --latency-spread, "
+        "--fail-rate, --fail-kind, --output-bytes, --input-tokens, --output-tokens",
+    )
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000], help="Task counts to run")
+    parser.add_argument("--workers", type=int, default=100)
+    parser.add_argument("--phases", type=int, default=1, help="Chained phases the tasks are split over")
+    parser.add_argument("--prompt-bytes", type=int, default=400)
+    parser.add_argument("--retries", type=int, default=1)
+    parser.add_argument("--mode", choices=MODES, default="inline",
+                        help="Simulate the fake CLI in process, or spawn it per attempt")
+    parser.add_argument("--engine", choices=ENGINES, default="threads")
+    parser.add_argument("--execution", choices=EXECUTION_MODES, default="pipeline")
+    parser.add_argument("--output-format", choices=["json", "stream-json"], default="json")
+    parser.add_argument("--state-backend", choices=STATE_BACKENDS, default="json")
+    parser.add_argument("--state-durability", choices=["none", "flush", "fsync"], default="flush")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean seconds per fake session")
+    parser.add_argument("--json", action="store_true", help="Print one JSON line per run instead of a table")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    parsed, fake_args = parser.parse_known_args(args)
+    _known, unknown = build_parser().parse_known_args(fake_args)
+    if unknown:
+        parser.error(f"unrecognized arguments: {' '.join(unknown)}")
+    fake_args = ["--latency", str(parsed.latency), *fake_args]
+
+    if parsed.single is not None:
+        with tempfile.TemporaryDirectory() as tmp:
+            result = run_load(parsed, fake_args, parsed.single, Path(tmp))
+        print(json.dumps(result))
+        return 0
+
+    own_args = list(args if args is not None else sys.argv[1:])
+    if not parsed.json:
+        print(
+            f"{'tasks':>9} {'done':>9} {'failed':>7} {'gen s':>7} {'run s':>8} {'attempts/s':>11} "
+            f"{'overhead ms':>12} {'state p50/p99 us':>17} {'flush p50/p99 ms':>17} {'RSS MB':>8}"
+        )
+    for task_count in parsed.tasks:
+        output = subprocess.run(
+            [sys.executable, "-m", "plan_runner.bench.load", *own_args, "--single", str(task_count)],
+            capture_output=True,
+            text=True,
+        )
+        if output.returncode != 0:
+            print(output.stderr, file=sys.stderr)
+            return output.returncode
+        line = output.stdout.strip().splitlines()[-1]
+        if parsed.json:
+            print(line)
+            continue
+        result = json.loads(line)
+        state, flush = result["state_call_us"], result["flush_ms"]
+        rss = result["peak_rss_mb"]
+        if parsed.mode == "process":
+            rss = f"{rss:.0f}+{result['children_peak_rss_mb']:.0f}"
+        else:
+            rss = f"{rss:.1f}"
+        print(
+            f"{result['tasks']:>9} {result['completed']:>9} {result['failed']:>7} "
+            f"{result['generate_s']:>7.2f} {result['run_s']:>8.2f} {result['dispatch_per_s']:>11.0f} "
+            f"{result['overhead_ms_per_task']:>12.3f} "
+            f"{state['p50']:>8.1f}/{state['p99']:<8.1f} {flush['p50']:>8.2f}/{flush['p99']:<8.2f} {rss:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,317 @@
+"""Micro-benchmarks of the pure-Python hot paths, with a regression guard.
+
+Usage:
+    python -m plan_runner.bench.micro [--filter template] [--scale 2]
+        [--history bench-history.jsonl] [--threshold 0.15]
+
+Times plan parsing, template rendering and resolution, state
+serialization, state snapshots and task generation. Each benchmark is run
+with ``timeit``'s auto-ranging loop and the best of ``--repeat`` rounds is
+reported as the time per call.
+
+Every run is appended to ``--history`` (JSON lines, ``""`` to disable)
+together with the commit, Python version and host. A benchmark is flagged
+when it is slower than the median of the last ``--window`` comparable runs
+(same host, Python and scale) by more than ``--threshold``; the exit code
+is then 1, so the suite can guard CI or a before/after comparison.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from ..models.config import PlanConfig
+from ..models.plan import Phase, Plan, Task
+from ..models.state import ExecutionState, PhaseResult
+from ..parser.plan_parser import PlanParser
+from ..state.state_manager import StateManager
+from ..template.context import TemplateContext
+from ..template.engine import TemplateEngine
+from ..executor.plan_executor import PlanExecutor
+from .generation import build_plan
+
+# name -> setup(scale, workdir) returning the zero-argument function to time
+BENCHMARKS: dict[str, Callable[[int, Path], Callable[[], Any]]] = {}
+
+
+def benchmark(name: str) -> Callable:
+    """Register a benchmark setup function under ``name``."""
+    def register(setup: Callable[[int, Path], Callable[[], Any]]) -> Callable:
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def plan_markdown(phases: int, items: int) -> str:
+    """Generate a plan file with ``phases`` chained phases over ``items`` items."""
+    lines = [
+        "---",
+        "config:",
+        '  name: "Bench"',
+        "  workers: 10",
+        '  output_dir: "./output"',
+        "variables:",
+        '  project_name: "Bench"',
+        "data_sources:",
+        "  pages:",
+        "    type: inline",
+        "    items:",
+    ]
+    for i in range(items):
+        lines += [
+            f'      - id: "page-{i}"',
+            f'        route: "/section/page-{i}"',
+            f'        name: "Page {i}"',
+        ]
+    lines.append("---")
+    for index in range(phases):
+        depends = f"Phase {index - 1}" if index else "none"
+        lines += [
+            "",
+            f"# Phase {index}",
+            "**execution:** parallel",
+            f"**depends_on:** {depends}",
+            "",
+            f"## Task Template: step{index}",
+            "**foreach:** ${data.pages}",
+            f"**task_id:** step{index}-${{item.id}}",
+            "",
+            "**outputs:**",
+            "",
+            "- name: report",
+            f"  path: ${{config.output_dir}}/step{index}/${{item.id}}.md",
+            "",
+            "```prompt",
+            f"## Step {index}: ${{item.name}}",
+            "",
+            "Redesign the page at ${item.route} for ${variables.project_name}.",
+            "Write the report to ${config.output_dir}.",
+            "```",
+            "",
+            "---",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def render_context() -> TemplateContext:
+    """Context with config, variables, a data source and a current item."""
+    item = {"id": "page-42", "route": "/services/Dental Implants", "name": "Dental Implants page"}
+    return TemplateContext(
+        config={"output_dir": "/srv/output", "workers": 10, "model": "opus"},
+        data={"pages": [item] * 100},
+        item=item,
+        variables={"project_name": "Ottawa South Dentist", "build": {"command": "npm run build"}},
+        task_id="page-42-mobile",
+    )
+
+
+def execution_state(task_count: int) -> ExecutionState:
+    """State of a half-finished run: every other task completed, the rest pending."""
+    state = ExecutionState(plan_name="bench", plan_file="bench.md")
+    state.phases["bench"] = PhaseResult(phase_name="bench")
+    for i in range(task_count):
+        state.add_pending_task(f"task-{i:07d}", "bench")
+    for i in range(0, task_count, 2):
+        task_id = f"task-{i:07d}"
+        state.mark_started(task_id)
+        state.mark_completed(task_id, {"report": f"/srv/output/reports/{i}.md"})
+    return state
+
+
+@benchmark("parse_plan")
+def bench_parse_plan(scale: int, workdir: Path) -> Callable[[], Any]:
+    """PlanParser.parse on a plan of 50 phases over 1000 data items."""
+    plan_file = workdir / "plan.md"
+    plan_file.write_text(plan_markdown(50 * scale, 1000 * scale), encoding="utf-8")
+    return PlanParser(plan_file).parse
+
+
+@benchmark("render_filters")
+def bench_render_filters(scale: int, workdir: Path) -> Callable[[], Any]:
+    """TemplateEngine.render of a prompt with eight expressions and chained filters."""
+    engine = TemplateEngine()
+    context = render_context()
+    template = (
+        "## ${item.name | upper}\n"
+        "Route ${item.route | strip_slashes | slugify} of ${variables.project_name}.\n"
+        "Write ${config.output_dir}/${item.id | slugify}/${item.route | basename | lower}.md\n"
+        "Task ${TASK_ID}, owner ${item.owner | default('unassigned')}, "
+        "build with ${variables.build.command | replace('npm', 'pnpm')}.\n"
+    ) * scale
+    return lambda: engine.render(template, context)
+
+
+@benchmark("resolve")
+def bench_resolve(scale: int, workdir: Path) -> Callable[[], Any]:
+    """TemplateContext.resolve over each root, nesting, list indexing and misses."""
+    context = render_context()
+    paths = [
+        "item.route", "config.output_dir", "data.pages", "data.pages.7.name",
+        "variables.build.command", "project_name", "TASK_ID", "item.missing",
+    ] * scale
+    resolve = context.resolve
+
+    def run() -> None:
+        for path in paths:
+            resolve(path)
+    return run
+
+
+@benchmark("state_to_json")
+def bench_state_to_json(scale: int, workdir: Path) -> Callable[[], Any]:
+    """ExecutionState.to_json with 10000 tasks, half of them completed."""
+    return execution_state(10_000 * scale).to_json
+
+
+@benchmark("state_from_json")
+def bench_state_from_json(scale: int, workdir: Path) -> Callable[[], Any]:
+    """ExecutionState.from_json with 10000 tasks, half of them completed."""
+    serialized = execution_state(10_000 * scale).to_json()
+    return lambda: ExecutionState.from_json(serialized)
+
+
+@benchmark("state_save")
+def bench_state_save(scale: int, workdir: Path) -> Callable[[], Any]:
+    """StateManager.save of 10000 tasks, half of them completed, to the JSON backend."""
+    task_count = 10_000 * scale
+    plan = Plan(name="bench", config=PlanConfig(name="bench"), phases=[Phase(name="bench")])
+    tasks = [Task(task_id=f"task-{i:07d}", phase_name="bench", prompt="") for i in range(task_count)]
+    manager = StateManager(workdir / "state.json", flush_interval=0)
+    manager.initialize(plan, tasks)
+    for i in range(0, task_count, 2):
+        manager.state.mark_started(tasks[i].task_id)
+        manager.state.mark_completed(tasks[i].task_id, {"report": f"reports/{i}.md"})
+    return manager.save
+
+
+@benchmark("generate_tasks")
+def bench_generate_tasks(scale: int, workdir: Path) -> Callable[[], Any]:
+    """PlanExecutor._generate_all_tasks for a foreach template over 10000 items."""
+    plan = build_plan(10_000 * scale, 1024, str(workdir / "output"))
+    context = TemplateContext.from_plan(plan)
+    context.data = {name: source.items for name, source in plan.data_sources.items()}
+
+    def run() -> None:
+        PlanExecutor(plan, dry_run=True)._generate_all_tasks(context)
+    return run
+
+
+def measure(function: Callable[[], Any], repeat: int) -> float:
+    """Best seconds per call over ``repeat`` auto-ranged rounds."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def environment() -> dict:
+    """Identify the code and machine a run was measured on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "host": platform.node(),
+    }
+
+
+def load_history(path: Path) -> list[dict]:
+    """Read previous runs, oldest first (unreadable lines are skipped)."""
+    if not path.exists():
+        return []
+    runs = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            runs.append(json.loads(line))
+        except ValueError:
+            continue
+    return runs
+
+
+def baselines(history: list[dict], run: dict, window: int) -> dict[str, float]:
+    """Median seconds per benchmark over the last ``window`` comparable runs."""
+    samples: dict[str, list[float]] = {}
+    for previous in reversed(history):
+        if any(previous.get(key) != run[key] for key in ("python", "host", "scale")):
+            continue
+        for name, seconds in previous.get("results", {}).items():
+            if len(samples.setdefault(name, [])) < window:
+                samples[name].append(seconds)
+    return {name: statistics.median(values) for name, values in samples.items()}
+
+
+def format_seconds(seconds: Optional[float]) -> str:
+    """Format a duration with a unit that keeps three significant digits."""
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * scale >= 1:
+            return f"{seconds * scale:.3g} {unit}"
+    return f"{seconds * 1e9:.3g} ns"
+
+
+def main(args: list[str] = None) -> int:
+    """Run the benchmarks, compare with history and print a table."""
+    parser = argparse.ArgumentParser(prog="plan_runner.bench.micro")
+    parser.add_argument("--filter", nargs="+", default=[], help="Run benchmarks whose name contains any of these")
+    parser.add_argument("--scale", type=int, default=1, help="Multiply the input sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds per benchmark (the best is kept)")
+    parser.add_argument("--history", default="bench-history.jsonl", help="JSON lines file of past runs ('' to disable)")
+    parser.add_argument("--window", type=int, default=5, help="Past runs the baseline is the median of")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Slowdown over the baseline flagged as a regression")
+    parser.add_argument("--no-save", action="store_true", help="Compare with history without recording this run")
+    parsed = parser.parse_args(args)
+
+    selected = [
+        name for name in BENCHMARKS
+        if not parsed.filter or any(pattern in name for pattern in parsed.filter)
+    ]
+    if not selected:
+        parser.error(f"no benchmark matches {parsed.filter}; available: {', '.join(BENCHMARKS)}")
+
+    run = {"timestamp": time.time(), **environment(), "scale": parsed.scale, "results": {}}
+    history_path = Path(parsed.history) if parsed.history else None
+    reference = baselines(load_history(history_path), run, parsed.window) if history_path else {}
+
+    regressions = []
+    print(f"{'benchmark':<16} {'per call':>10} {'baseline':>10} {'change':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in selected:
+            workdir = Path(tmp) / name
+            workdir.mkdir()
+            seconds = measure(BENCHMARKS[name](parsed.scale, workdir), parsed.repeat)
+            run["results"][name] = seconds
+
+            baseline = reference.get(name)
+            change = ""
+            if baseline:
+                ratio = seconds / baseline - 1
+                change = f"{ratio:+.1%}"
+                if ratio > parsed.threshold:
+                    change += " !"
+                    regressions.append(name)
+            print(f"{name:<16} {format_seconds(seconds):>10} {format_seconds(baseline):>10} {change:>8}")
+
+    if history_path and not parsed.no_save:
+        with open(history_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run) + "\n")
+
+    if regressions:
+        print(f"Regressions beyond {parsed.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
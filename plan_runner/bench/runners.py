@@ -0,0 +1,131 @@
+"""Compare the CLI runner and the HTTP runner on short prompt-only tasks.
+
+Usage:
+    python -m plan_runner.bench.runners [--tasks 200] [--workers 20] [--latency 0.05]
+
+The CLI runner starts the bundled fake CLI for every task; the HTTP runner
+talks to a local stub of the Messages API (see ``stub_api``), so no network
+or API key is needed. Both see the same response latency, so the
+difference in throughput is the per-task cost of each backend.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from ..models.config import PlanConfig
+from ..models.plan import Plan, Phase, Task
+from ..state.state_manager import StateManager
+from ..executor.scheduler import TaskScheduler, ENGINES
+from ..executor.async_engine import AsyncTaskScheduler
+from .engines import FAKE_CLAUDE
+from .stub_api import StubApiServer
+
+API_KEY_ENV = "PLAN_RUNNER_BENCH_API_KEY"
+
+
+def run_runner(
+    runner: str,
+    engine: str,
+    task_count: int,
+    workers: int,
+    latency: float,
+    output_format: str,
+    workdir: Path,
+) -> dict:
+    """Run a single-phase synthetic plan with one runner.
+
+    Args:
+        runner: "cli" or "http"
+        engine: One of ENGINES
+        task_count: Number of tasks
+        workers: Concurrent tasks
+        latency: Seconds each response takes
+        output_format: "json" or "stream-json"
+        workdir: Scratch directory
+
+    Returns:
+        Dict with wall time, throughput, overhead per task and connections used
+    """
+    with StubApiServer(latency=latency) as server:
+        config = PlanConfig(
+            name="bench",
+            workers=workers,
+            retries=1,
+            working_dir=str(workdir),
+            output_dir=str(workdir / "output"),
+            runner=runner,
+            output_format=output_format,
+            claude_command=f"{sys.executable} {FAKE_CLAUDE} --latency {latency}",
+            api_url=server.url,
+            api_key_env=API_KEY_ENV,
+            http_pool_size=workers,
+        )
+        phase = Phase(name="bench")
+        plan = Plan(name="bench", config=config, phases=[phase])
+        tasks = [
+            Task(task_id=f"task-{i:06d}", phase_name="bench", prompt="x" * 400)
+            for i in range(task_count)
+        ]
+
+        manager = StateManager(workdir / f"state-{runner}-{engine}.json", durability="none")
+        manager.initialize(plan, tasks)
+        scheduler_class = AsyncTaskScheduler if engine == "asyncio" else TaskScheduler
+        scheduler = scheduler_class(config=config, state_manager=manager)
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            _success, completed, failed = scheduler.execute([phase], {"bench": tasks})
+        elapsed = time.perf_counter() - start
+        manager.close()
+
+    ideal = -(-task_count // workers) * latency
+    return {
+        "runner": runner,
+        "engine": engine,
+        "completed": completed,
+        "failed": failed,
+        "wall_s": elapsed,
+        "tasks_per_s": task_count / elapsed,
+        "overhead_ms_per_task": (elapsed - ideal) / task_count * 1000,
+        "connections": server.connections if runner == "http" else None,
+    }
+
+
+def main(args: list[str] = None) -> int:
+    """Run each runner on each engine and print a table."""
+    parser = argparse.ArgumentParser(prog="plan_runner.bench.runners")
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--stream", action="store_true", help="Use stream-json output")
+    parsed = parser.parse_args(args)
+
+    os.environ.setdefault(API_KEY_ENV, "bench")
+    output_format = "stream-json" if parsed.stream else "json"
+    print(
+        f"{'runner':>7} {'engine':>8} {'done':>6} {'wall s':>8} {'tasks/s':>9} "
+        f"{'overhead ms/task':>17} {'conns':>6}"
+    )
+    for engine in parsed.engines:
+        for runner in ("cli", "http"):
+            with tempfile.TemporaryDirectory() as tmp:
+                result = run_runner(
+                    runner, engine, parsed.tasks, parsed.workers, parsed.latency, output_format, Path(tmp)
+                )
+            connections = "-" if result["connections"] is None else result["connections"]
+            print(
+                f"{runner:>7} {engine:>8} {result['completed']:>6} {result['wall_s']:>8.2f} "
+                f"{result['tasks_per_s']:>9.1f} {result['overhead_ms_per_task']:>17.2f} {connections:>6}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
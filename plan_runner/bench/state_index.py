@@ -0,0 +1,115 @@
+"""Micro-benchmark for ExecutionState status queries.
+
+Usage:
+    python -m plan_runner.bench.state_index [--tasks 1000000] [--phases 10]
+
+Compares the indexed ExecutionState queries against the linear scans they
+replaced, on a state holding synthetic TaskResults.
+"""
+
+import argparse
+import time
+
+from ..models.state import ExecutionState, TaskStatus
+
+
+def build_state(task_count: int, phase_count: int) -> ExecutionState:
+    """Build a state with tasks spread evenly across phases.
+
+    Args:
+        task_count: Number of tasks
+        phase_count: Number of phases
+
+    Returns:
+        ExecutionState with every task pending
+    """
+    state = ExecutionState(plan_name="bench", plan_file="bench.md")
+    for i in range(task_count):
+        state.add_pending_task(f"task-{i:07d}", f"phase-{i % phase_count}")
+    return state
+
+
+def scan_is_phase_complete(state: ExecutionState, phase_name: str) -> bool:
+    """Linear-scan completion check (previous implementation)."""
+    phase_tasks = [r for r in state.tasks.values() if r.phase_name == phase_name]
+    return all(t.status == TaskStatus.COMPLETED for t in phase_tasks)
+
+
+def scan_get_pending_tasks(state: ExecutionState, phase_name: str) -> list[str]:
+    """Linear-scan pending list (previous implementation)."""
+    return [
+        task_id for task_id, r in state.tasks.items()
+        if r.phase_name == phase_name and r.status in (TaskStatus.PENDING, TaskStatus.FAILED)
+    ]
+
+
+def scan_get_stats(state: ExecutionState) -> dict:
+    """Five-pass stats (previous implementation)."""
+    tasks = state.tasks.values()
+    return {
+        "total": len(state.tasks),
+        "completed": sum(1 for t in tasks if t.status == TaskStatus.COMPLETED),
+        "failed": sum(1 for t in tasks if t.status == TaskStatus.FAILED),
+        "pending": sum(1 for t in tasks if t.status == TaskStatus.PENDING),
+        "running": sum(1 for t in tasks if t.status == TaskStatus.RUNNING),
+    }
+
+
+def timed(func, *args, repeat: int = 3) -> float:
+    """Return the best wall time of ``repeat`` calls in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(args: list[str] = None) -> int:
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(prog="plan_runner.bench.state_index")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--phases", type=int, default=10)
+    parsed = parser.parse_args(args)
+
+    print(f"Building state with {parsed.tasks:,} tasks in {parsed.phases} phases...")
+    start = time.perf_counter()
+    state = build_state(parsed.tasks, parsed.phases)
+    print(f"  built in {time.perf_counter() - start:.2f}s")
+
+    # Complete the first phase and a slice of the second so queries have mixed statuses
+    for task_id in state.get_task_ids("phase-0", TaskStatus.PENDING):
+        state.mark_started(task_id)
+        state.mark_completed(task_id, {})
+    for task_id in state.get_task_ids("phase-1", TaskStatus.PENDING)[:1000]:
+        state.mark_started(task_id)
+        state.mark_failed(task_id, "bench")
+
+    transitions = min(parsed.tasks // parsed.phases, 100_000)
+    ids = state.get_task_ids("phase-2", TaskStatus.PENDING)[:transitions]
+    start = time.perf_counter()
+    for task_id in ids:
+        state.mark_started(task_id)
+        state.mark_completed(task_id, {})
+    per_transition = (time.perf_counter() - start) / (2 * len(ids)) if ids else 0.0
+
+    rows = [
+        ("is_phase_complete", timed(state.is_phase_complete, "phase-0"),
+         timed(scan_is_phase_complete, state, "phase-0")),
+        ("get_pending_tasks", timed(state.get_pending_tasks, "phase-1"),
+         timed(scan_get_pending_tasks, state, "phase-1")),
+        ("get_stats", timed(state.get_stats), timed(scan_get_stats, state)),
+    ]
+
+    print(f"\n{'query':<20} {'indexed us':>12} {'scan us':>14} {'speedup':>10}")
+    for name, indexed, scan in rows:
+        print(f"{name:<20} {indexed * 1e6:>12.1f} {scan * 1e6:>14.1f} {scan / max(indexed, 1e-9):>9.0f}x")
+    print(f"\nmark_started/completed: {per_transition * 1e6:.2f} us per transition")
+
+    assert state.get_stats() == scan_get_stats(state)
+    assert state.is_phase_complete("phase-0") == scan_is_phase_complete(state, "phase-0")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+"""Memory benchmark for task state representations.
+
+Usage:
+    python -m plan_runner.bench.state_memory [--sizes 100000 1000000]
+
+Compares the compact, sparse ExecutionState against the previous layout
+(one TaskResult dataclass with ISO timestamp strings and an outputs dict per
+task, held in a plain dict), for freshly initialized and fully completed
+plans.
+"""
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Optional
+
+from ..models.state import ExecutionState, TaskStatus
+
+
+@dataclass
+class LegacyTaskResult:
+    """The TaskResult layout before compaction."""
+
+    task_id: str
+    phase_name: str
+    status: TaskStatus = TaskStatus.PENDING
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    attempts: int = 0
+    error_message: Optional[str] = None
+    outputs: dict[str, str] = field(default_factory=dict)
+
+
+def task_ids(count: int) -> list[str]:
+    """Generate task IDs (allocated outside the measured region)."""
+    return [f"task-{i:07d}" for i in range(count)]
+
+
+def phase_name(i: int) -> str:
+    """Build a phase name per task, as a parser/template would."""
+    return "Phase " + str(i % 10)
+
+
+def legacy_state(ids: list[str], complete: bool) -> dict:
+    """Build the previous representation."""
+    tasks = {}
+    for i, task_id in enumerate(ids):
+        result = LegacyTaskResult(task_id=task_id, phase_name=phase_name(i))
+        if complete:
+            result.status = TaskStatus.COMPLETED
+            result.started_at = datetime.now().isoformat()
+            result.completed_at = datetime.now().isoformat()
+            result.attempts = 1
+        tasks[task_id] = result
+    return tasks
+
+
+def compact_state(ids: list[str], complete: bool) -> ExecutionState:
+    """Build the compact representation."""
+    state = ExecutionState(plan_name="bench", plan_file="bench.md")
+    for i, task_id in enumerate(ids):
+        state.add_pending_task(task_id, phase_name(i))
+        if complete:
+            state.mark_started(task_id)
+            state.mark_completed(task_id, {})
+    return state
+
+
+def measure(build: Callable[[list[str], bool], object], ids: list[str], complete: bool) -> int:
+    """Return bytes still allocated by ``build`` once it has returned."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build(ids, complete)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current
+
+
+def main(args: list[str] = None) -> int:
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(prog="plan_runner.bench.state_memory")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parsed = parser.parse_args(args)
+
+    print(f"{'tasks':>10} {'state':>10} {'legacy MB':>10} {'compact MB':>11} {'B/task old':>11} {'B/task new':>11}")
+    for size in parsed.sizes:
+        ids = task_ids(size)
+        for complete in (False, True):
+            legacy = measure(legacy_state, ids, complete)
+            compact = measure(compact_state, ids, complete)
+            label = "completed" if complete else "fresh"
+            print(
+                f"{size:>10} {label:>10} {legacy / 2**20:>10.1f} {compact / 2**20:>11.1f} "
+                f"{legacy / size:>11.0f} {compact / size:>11.0f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+"""Benchmark per-event state write cost as the task count grows.
+
+Usage:
+    python -m plan_runner.bench.state_writes [--sizes 1000 5000 20000]
+
+Compares the StateManager backends against rewriting the full JSON
+snapshot on every event (the previous behaviour).
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from ..models.config import PlanConfig
+from ..models.plan import Plan, Phase, Task
+from ..state.state_manager import StateManager
+from ..state.backend import STATE_BACKENDS
+
+
+def make_plan(task_count: int) -> tuple[Plan, list[Task]]:
+    """Build a single-phase synthetic plan.
+
+    Args:
+        task_count: Number of tasks to generate
+
+    Returns:
+        Tuple of (plan, tasks)
+    """
+    plan = Plan(name="bench", config=PlanConfig(name="bench"), phases=[Phase(name="bench")])
+    tasks = [
+        Task(task_id=f"task-{i:07d}", phase_name="bench", prompt="", outputs={"out": f"out/{i}.md"})
+        for i in range(task_count)
+    ]
+    return plan, tasks
+
+
+def bench_journal(
+    task_count: int,
+    workdir: Path,
+    durability: str = "flush",
+    backend: str = "json",
+) -> dict:
+    """Time started+completed events for every task through StateManager.
+
+    The reported cost includes draining the background flusher.
+
+    Args:
+        task_count: Number of tasks
+        workdir: Scratch directory
+        durability: State durability level
+        backend: State backend name
+
+    Returns:
+        Dict with per-event cost and total time
+    """
+    plan, tasks = make_plan(task_count)
+    manager = StateManager(
+        workdir / f"journal-{task_count}.{backend}",
+        durability=durability,
+        backend=backend,
+    )
+    manager.initialize(plan, tasks)
+
+    start = time.perf_counter()
+    for task in tasks:
+        manager.task_started(task.task_id)
+        manager.task_completed(task.task_id, task.outputs)
+    manager.close()
+    elapsed = time.perf_counter() - start
+
+    events = task_count * 2
+    return {
+        "us_per_event": elapsed / events * 1e6,
+        "total_s": elapsed,
+    }
+
+
+def bench_rewrite(task_count: int, workdir: Path, sample: int = 200) -> dict:
+    """Time the legacy full-snapshot rewrite for a sample of events.
+
+    Args:
+        task_count: Number of tasks
+        workdir: Scratch directory
+        sample: Number of events to time (full runs are quadratic)
+
+    Returns:
+        Dict with per-event cost and projected total
+    """
+    plan, tasks = make_plan(task_count)
+    manager = StateManager(workdir / f"rewrite-{task_count}.json")
+    manager.initialize(plan, tasks)
+
+    sample = min(sample, task_count)
+    start = time.perf_counter()
+    for task in tasks[:sample]:
+        manager.state.mark_started(task.task_id)
+        manager.state_file.write_text(manager.state.to_json(), encoding="utf-8")
+    elapsed = time.perf_counter() - start
+    manager.close()
+
+    per_event = elapsed / sample
+    return {
+        "us_per_event": per_event * 1e6,
+        "total_s": per_event * task_count * 2,
+    }
+
+
+def main(args: list[str] = None) -> int:
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(prog="plan_runner.bench.state_writes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--durability", choices=StateManager.DURABILITY_LEVELS, default="flush")
+    parser.add_argument("--backend", choices=STATE_BACKENDS, default="json")
+    parsed = parser.parse_args(args)
+
+    print(f"{'tasks':>8} {'state us/event':>18} {'rewrite us/event':>18} {'rewrite total s (proj.)':>24}")
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for size in parsed.sizes:
+            journal = bench_journal(size, workdir, parsed.durability, parsed.backend)
+            rewrite = bench_rewrite(size, workdir)
+            print(
+                f"{size:>8} {journal['us_per_event']:>18.1f} "
+                f"{rewrite['us_per_event']:>18.1f} {rewrite['total_s']:>24.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
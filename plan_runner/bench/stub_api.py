@@ -0,0 +1,214 @@
+"""Local stand-in for the Messages API, for exercising the http runner offline.
+
+Usage:
+    python -m plan_runner.bench.stub_api [--port 8787] [--latency 0.1] [--fail-rate 0.1]
+
+Then run a plan with ``runner: http`` and ``api_url: http://127.0.0.1:8787``
+(any non-empty API key is accepted). In-process, use ``StubApiServer`` as a
+context manager.
+
+Responses echo nothing of the prompt: the text is ``ok`` and usage is
+estimated from the request size. Streaming requests get server-sent events
+in the shape of the real API over chunked transfer encoding.
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class StubApiServer(ThreadingHTTPServer):
+    """HTTP/1.1 keep-alive server answering ``/v1/messages`` and ``/v1/models``."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency: float = 0.0,
+        fail_rate: float = 0.0,
+        fail_status: int = 529,
+        retry_after: Optional[float] = None,
+        output_tokens: int = 16,
+    ):
+        """Initialize server (bound to 127.0.0.1, not yet serving).
+
+        Args:
+            port: Port to listen on (0: any free port)
+            latency: Seconds each response takes
+            fail_rate: Share of requests answered with ``fail_status``
+            fail_status: Status of failed requests (429, 500, 529...)
+            retry_after: Retry-After header of failed requests, if any
+            output_tokens: Output tokens reported per response
+        """
+        super().__init__(("127.0.0.1", port), StubApiHandler)
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.output_tokens = output_tokens
+        self.connections = 0  # TCP connections accepted
+        self.requests = 0  # requests answered
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as ``api_url``."""
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def handle_error(self, request, client_address) -> None:
+        """Ignore clients that hung up, e.g. on a timeout or cancellation."""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def count(self, connection: bool = False) -> None:
+        """Count a request (or an accepted connection)."""
+        with self._lock:
+            if connection:
+                self.connections += 1
+            else:
+                self.requests += 1
+
+    def __enter__(self) -> "StubApiServer":
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+
+
+class StubApiHandler(BaseHTTPRequestHandler):
+    """Answer requests like the Messages API."""
+
+    protocol_version = "HTTP/1.1"
+    server: StubApiServer
+
+    def setup(self) -> None:
+        """Count the accepted connection."""
+        super().setup()
+        self.server.count(connection=True)
+
+    def log_message(self, format: str, *args) -> None:
+        """Keep benchmark output clean."""
+
+    def do_GET(self) -> None:
+        """List models."""
+        if self.path.endswith("/v1/models"):
+            self._send_json(200, {"data": [{"id": "claude-sonnet-4-5", "type": "model"}], "has_more": False})
+        else:
+            self._send_error(404, "not_found_error", f"Unknown path {self.path}")
+
+    def do_POST(self) -> None:
+        """Create a message."""
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.count()
+        if not self.path.endswith("/v1/messages"):
+            self._send_error(404, "not_found_error", f"Unknown path {self.path}")
+            return
+        if not self.headers.get("X-Api-Key"):
+            self._send_error(401, "authentication_error", "invalid x-api-key")
+            return
+        try:
+            request = json.loads(body)
+        except ValueError:
+            self._send_error(400, "invalid_request_error", "Body is not JSON")
+            return
+
+        time.sleep(self.server.latency)
+        if random.random() < self.server.fail_rate:
+            kinds = {429: "rate_limit_error", 529: "overloaded_error"}
+            self._send_error(self.server.fail_status, kinds.get(self.server.fail_status, "api_error"), "Stub failure")
+            return
+
+        usage = {"input_tokens": len(body) // 4, "output_tokens": self.server.output_tokens}
+        message = {
+            "id": "msg_stub",
+            "type": "message",
+            "role": "assistant",
+            "model": request.get("model"),
+            "content": [{"type": "text", "text": "ok"}],
+            "stop_reason": "end_turn",
+            "usage": usage,
+        }
+        if request.get("stream"):
+            self._send_stream(message)
+        else:
+            self._send_json(200, message)
+
+    def _send_stream(self, message: dict) -> None:
+        """Send a message as server-sent events."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        start = {**message, "content": [], "stop_reason": None,
+                 "usage": {"input_tokens": message["usage"]["input_tokens"], "output_tokens": 1}}
+        events = [
+            ("message_start", {"type": "message_start", "message": start}),
+            ("content_block_start", {"type": "content_block_start", "index": 0,
+                                     "content_block": {"type": "text", "text": ""}}),
+            ("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                     "delta": {"type": "text_delta", "text": "ok"}}),
+            ("content_block_stop", {"type": "content_block_stop", "index": 0}),
+            ("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn"},
+                               "usage": {"output_tokens": message["usage"]["output_tokens"]}}),
+            ("message_stop", {"type": "message_stop"}),
+        ]
+        for name, data in events:
+            chunk = f"event: {name}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _send_error(self, status: int, kind: str, message: str) -> None:
+        """Send an error in the API's format."""
+        headers = {}
+        if self.server.retry_after is not None and status in (429, 529):
+            headers["Retry-After"] = str(self.server.retry_after)
+        self._send_json(status, {"type": "error", "error": {"type": kind, "message": message}}, headers)
+
+    def _send_json(self, status: int, data: dict, headers: Optional[dict] = None) -> None:
+        """Send a JSON response."""
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main(args: list[str] = None) -> int:
+    """Serve until interrupted."""
+    parser = argparse.ArgumentParser(prog="plan_runner.bench.stub_api")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--fail-status", type=int, default=529)
+    parser.add_argument("--retry-after", type=float)
+    parsed = parser.parse_args(args)
+
+    server = StubApiServer(parsed.port, parsed.latency, parsed.fail_rate, parsed.fail_status, parsed.retry_after)
+    print(f"Stub Messages API on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"{server.requests} requests over {server.connections} connections")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
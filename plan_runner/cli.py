@@ -18,9 +18,15 @@ def main(args: list[str] = None) -> int:
     Returns:
         Exit code (0 for success, non-zero for failure)
     """
+    argv = sys.argv[1:] if args is None else args
+    if argv[:1] == ["bench"]:
+        from .bench.load import main as bench_main
+        return bench_main(argv[1:])
+
     parser = argparse.ArgumentParser(
         prog="plan_runner",
         description="Execute plans defined in Markdown files via Claude CLI",
+        epilog="Run 'plan_runner bench --help' to load-test the runner against a fake CLI",
     )
 
     parser.add_argument(
@@ -35,6 +41,12 @@ def main(args: list[str] = None) -> int:
         help="Resume from previous state (skip completed tasks)",
     )
 
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Resume, re-running completed tasks whose inputs changed or outputs are missing",
+    )
+
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -47,6 +59,30 @@ def main(args: list[str] = None) -> int:
         help="Override number of parallel workers",
     )
 
+    parser.add_argument(
+        "--adaptive-workers",
+        action="store_true",
+        help="Adjust the number of parallel workers at runtime within min/max_workers",
+    )
+
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Start a second attempt of straggling tasks in a copied workspace (templates with hedge: true)",
+    )
+
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop the run at the first task that fails (same as --max-failures 1)",
+    )
+
+    parser.add_argument(
+        "--max-failures",
+        type=int,
+        help="Stop the run once this many tasks of one phase have failed",
+    )
+
     parser.add_argument(
         "--phase",
         type=str,
@@ -59,6 +95,72 @@ def main(args: list[str] = None) -> int:
         help="Custom path for state file",
     )
 
+    parser.add_argument(
+        "--state-backend",
+        choices=["json", "sqlite"],
+        help="Override the state storage backend",
+    )
+
+    parser.add_argument(
+        "--state-durability",
+        choices=["none", "flush", "fsync"],
+        help="Override how state writes are flushed to disk",
+    )
+
+    parser.add_argument(
+        "--execution",
+        choices=["pipeline", "barrier"],
+        help="Override scheduling: per task across phases, or phase by phase",
+    )
+
+    parser.add_argument(
+        "--engine",
+        choices=["threads", "asyncio"],
+        help="Override how CLI sessions are supervised",
+    )
+
+    parser.add_argument(
+        "--runner",
+        choices=["cli", "http"],
+        help="Override how prompts are executed (Claude CLI or Messages API over HTTP)",
+    )
+
+    parser.add_argument(
+        "--stream-output",
+        action="store_true",
+        help="Read CLI output as stream-json and keep per-task transcripts in output_dir",
+    )
+
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse the outputs of identical earlier tasks instead of running them",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Run every task even if the plan enables the result cache",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Directory of the result cache (default: output_dir/cache)",
+    )
+
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve live OpenMetrics on this local port while the plan runs",
+    )
+
+    parser.add_argument(
+        "--metrics-textfile",
+        type=Path,
+        help="Periodically rewrite metrics to this file (e.g. for the node exporter's textfile collector)",
+    )
+
     parser.add_argument(
         "--check-cli",
         action="store_true",
@@ -94,6 +196,37 @@ def main(args: list[str] = None) -> int:
         parser_obj = PlanParser(parsed.plan_file)
         plan = parser_obj.parse()
 
+        if parsed.state_backend:
+            plan.config.state_backend = parsed.state_backend
+        if parsed.state_durability:
+            plan.config.state_durability = parsed.state_durability
+        if parsed.execution:
+            plan.config.execution = parsed.execution
+        if parsed.adaptive_workers:
+            plan.config.adaptive_workers = True
+        if parsed.hedge:
+            plan.config.hedge = True
+        if parsed.max_failures is not None or parsed.fail_fast:
+            plan.config.max_failures = 1 if parsed.fail_fast else parsed.max_failures
+            for phase in plan.phases:
+                phase.max_failures = None  # the command line wins over per-phase limits
+        if parsed.engine:
+            plan.config.engine = parsed.engine
+        if parsed.runner:
+            plan.config.runner = parsed.runner
+        if parsed.stream_output:
+            plan.config.output_format = "stream-json"
+        if parsed.cache:
+            plan.config.cache = True
+        if parsed.no_cache:
+            plan.config.cache = False
+        if parsed.cache_dir:
+            plan.config.cache_dir = str(parsed.cache_dir.resolve())
+        if parsed.metrics_port:
+            plan.config.metrics_port = parsed.metrics_port
+        if parsed.metrics_textfile:
+            plan.config.metrics_textfile = str(parsed.metrics_textfile.resolve())
+
         # Create executor
         executor = PlanExecutor(
             plan=plan,
@@ -106,6 +239,7 @@ def main(args: list[str] = None) -> int:
             resume=parsed.resume,
             phase_filter=parsed.phase,
             workers_override=parsed.workers,
+            incremental=parsed.incremental,
         )
 
         return 0 if success else 1
@@ -114,7 +248,7 @@ def main(args: list[str] = None) -> int:
         print(f"Error parsing plan: {e}")
         return 1
     except KeyboardInterrupt:
-        print("\nExecution interrupted by user")
+        print("\nExecution interrupted by user; run with --resume to continue")
         return 130
     except Exception as e:
         print(f"Unexpected error: {e}")
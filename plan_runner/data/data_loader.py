@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Any
 
 from ..models.plan import DataSource
+from ..state.codec import json_loads
 
 
 class DataLoader:
@@ -60,13 +61,13 @@ class DataLoader:
         suffix = path.suffix.lower()
 
         if suffix in (".json",):
-            data = json.loads(content)
+            data = json_loads(content)
         elif suffix in (".yaml", ".yml"):
             data = yaml.safe_load(content)
         else:
             # Try JSON first, then YAML
             try:
-                data = json.loads(content)
+                data = json_loads(content)
             except json.JSONDecodeError:
                 data = yaml.safe_load(content)
 
@@ -1,8 +1,28 @@
 """Executor modules for running plans."""
 
+from .runner import TaskRunner, create_runner
 from .claude_runner import ClaudeRunner
+from .http_runner import HttpRunner
 from .task_executor import TaskExecutor
-from .phase_executor import PhaseExecutor
+from .concurrency import ConcurrencyController
+from .rate_limit import RateLimiter
+from .scheduler import TaskGraph, TaskScheduler
+from .async_engine import AsyncTaskExecutor, AsyncTaskScheduler
+from .telemetry import RunMetrics
 from .plan_executor import PlanExecutor
 
-__all__ = ["ClaudeRunner", "TaskExecutor", "PhaseExecutor", "PlanExecutor"]
+__all__ = [
+    "TaskRunner",
+    "create_runner",
+    "ClaudeRunner",
+    "HttpRunner",
+    "TaskExecutor",
+    "ConcurrencyController",
+    "RateLimiter",
+    "TaskGraph",
+    "TaskScheduler",
+    "AsyncTaskExecutor",
+    "AsyncTaskScheduler",
+    "RunMetrics",
+    "PlanExecutor",
+]
@@ -0,0 +1,233 @@
+"""asyncio execution engine: many CLI sessions supervised by one thread."""
+
+import asyncio
+import inspect
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from ..models.plan import Task
+from ..models.config import PlanConfig
+from ..state.result_cache import ResultCache
+from .failures import policy_for, retry_policies
+from .hedging import create_workspace
+from .runner import ClaudeResult, create_runner
+from .scheduler import TaskScheduler
+from .task_executor import fingerprint_completed, log_usage, restore_cached, save_response, store_cached
+
+
+class AsyncTaskExecutor:
+    """Execute single attempts of a task on the event loop.
+
+    Same behaviour as TaskExecutor, but waiting on the CLI suspends a
+    coroutine instead of blocking a thread.
+    Callbacks may be plain functions or coroutine functions.
+    """
+
+    def __init__(
+        self,
+        config: PlanConfig,
+        on_start: Optional[Callable[[str], Any]] = None,
+        on_complete: Optional[Callable[[str, dict, Optional[str], Optional[dict]], Any]] = None,
+        on_fail: Optional[Callable[[str, str, Optional[str], Optional[str]], Any]] = None,
+        on_usage: Optional[Callable[[str, int, int], None]] = None,
+        cache: Optional[ResultCache] = None,
+    ):
+        """Initialize async task executor.
+
+        Args:
+            config: Plan configuration
+            on_start: Callback when task starts (task_id)
+            on_complete: Callback when task completes
+                (task_id, outputs, transcript, fingerprint)
+            on_fail: Callback when task fails
+                (task_id, error, transcript, error_class)
+            on_usage: Callback with running token usage while streaming
+                (task_id, input_tokens, output_tokens)
+            cache: Result cache to restore from and store into
+        """
+        self.config = config
+        self.on_start = on_start
+        self.on_complete = on_complete
+        self.on_fail = on_fail
+        self.on_usage = on_usage
+        self.cache = cache
+        self.policies = retry_policies(config)
+        self._failure_classes: dict[str, Optional[str]] = {}
+        self._digests: dict[str, list] = {}
+
+        self.runner = create_runner(config)
+
+    def close(self) -> None:
+        """Release the runner's pooled resources."""
+        self.runner.close()
+
+    async def run_once(self, task: Task, attempt: int) -> ClaudeResult:
+        """Run a single attempt of a task.
+
+        Args:
+            task: Task to execute
+            attempt: Attempt number within this run (1-based, for logging)
+
+        Returns:
+            ClaudeResult of the attempt
+        """
+        await _notify(self.on_start, task.task_id)
+
+        prompt = task.get_prompt()
+        key, cached = None, None
+        if self.cache is not None:
+            # Hashing and copying files would block the loop
+            key, cached = await asyncio.to_thread(restore_cached, self.cache, self.config, task, prompt)
+        if cached is not None:
+            await self._complete(task, prompt, None)
+            return cached
+
+        limit = policy_for(self.policies, self._failure_classes.pop(task.task_id, None)).max_attempts(self.config)
+        print(f"  [{task.task_id}] Attempt {attempt}/{limit}")
+
+        # Cancelling the coroutine kills the CLI and raises CancelledError
+        result = await self.runner.run_async(prompt, task.task_id, self._usage_callback(task))
+        result = save_response(self.runner, task, result)
+
+        if result.success:
+            if key is not None:
+                await asyncio.to_thread(store_cached, self.cache, self.config, task, prompt, key, result)
+            await self._complete(task, prompt, result.transcript_path)
+            print(f"  [{task.task_id}] Completed successfully")
+            log_usage(task, result)
+            return result
+
+        error_msg = result.error_message or f"Exit code: {result.exit_code}"
+        print(f"  [{task.task_id}] Failed ({result.error_class}): {error_msg}")
+        self._failure_classes[task.task_id] = result.error_class
+        await _notify(self.on_fail, task.task_id, error_msg, result.transcript_path, result.error_class)
+        return result
+
+    async def run_hedge(self, task: Task, workspace: Path) -> ClaudeResult:
+        """Run an extra attempt of a task in a copy of the working directory.
+
+        See TaskExecutor.run_hedge.
+        """
+        try:
+            await asyncio.to_thread(create_workspace, self.config, task, workspace)
+        except OSError as e:
+            return self.runner.error_result(f"Could not create hedge workspace: {e}")
+        print(f"  [{task.task_id}] Hedge attempt in {workspace}")
+        runner = self.runner.in_directory(workspace)
+        return save_response(runner, task, await runner.run_async(task.get_prompt(), f"{task.task_id}.hedge"))
+
+    async def _complete(self, task: Task, prompt: str, transcript: Optional[str]) -> None:
+        """Report a completed task with its fingerprint."""
+        if self.on_complete is None:
+            return
+        # Hashing files would block the loop
+        fingerprint = await asyncio.to_thread(fingerprint_completed, self.config, task, prompt, self._digests)
+        await _notify(self.on_complete, task.task_id, task.outputs.copy(), transcript, fingerprint)
+
+    def _usage_callback(self, task: Task) -> Optional[Callable[[int, int], None]]:
+        """Bind the usage callback to a task."""
+        if self.on_usage is None:
+            return None
+        return lambda input_tokens, output_tokens: self.on_usage(task.task_id, input_tokens, output_tokens)
+
+
+async def _notify(callback: Optional[Callable[..., Any]], *args: Any) -> None:
+    """Invoke a callback, awaiting it if it is a coroutine function."""
+    if callback is None:
+        return
+    result = callback(*args)
+    if inspect.isawaitable(result):
+        await result
+
+
+def _install_child_watcher() -> None:
+    """Reap children via pidfd instead of one waiter thread per child.
+
+    Before Python 3.12 the default child watcher starts a thread for every
+    subprocess, which would defeat the point of the asyncio engine.
+    """
+    if sys.version_info >= (3, 12) or not hasattr(asyncio, "PidfdChildWatcher"):
+        return
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except (AttributeError, OSError):
+        return
+    watcher = asyncio.PidfdChildWatcher()
+    watcher.attach_loop(asyncio.get_running_loop())
+    asyncio.set_child_watcher(watcher)
+
+
+class AsyncTaskScheduler(TaskScheduler):
+    """TaskScheduler that runs tasks as coroutines on a single event loop.
+
+    At most ``worker_limit`` CLI sessions are in flight; since each one
+    is a coroutine rather than a thread, several hundred can be supervised
+    by one process.
+    """
+
+    engine = "asyncio"
+
+    def _run(self) -> None:
+        """Drain the graph on a fresh event loop."""
+        asyncio.run(self._run_async())
+
+    async def _run_async(self) -> None:
+        """Dispatch ready tasks as coroutines until the graph is drained."""
+        _install_child_watcher()
+
+        task_executor = AsyncTaskExecutor(
+            config=self.config,
+            on_start=self.state_manager.task_started,
+            on_complete=self.state_manager.task_completed,
+            on_fail=self.state_manager.task_failed,
+            cache=self.cache,
+        )
+        running: dict[asyncio.Task, tuple[str, bool]] = {}  # -> (task_id, is_hedge)
+
+        try:
+            while self.ready or self.retries or running:
+                while len(running) < self.worker_limit:
+                    task = self._next_ready()
+                    if task is None:
+                        break
+                    future = asyncio.create_task(task_executor.run_once(task, self.attempts[task.task_id]))
+                    running[future] = (task.task_id, False)
+                    self._cancel[(task.task_id, False)] = future.cancel
+
+                while len(running) < self.worker_limit:
+                    hedge = self._next_hedge()
+                    if hedge is None:
+                        break
+                    task, workspace = hedge
+                    future = asyncio.create_task(task_executor.run_hedge(task, workspace))
+                    running[future] = (task.task_id, True)
+                    self._cancel[(task.task_id, True)] = future.cancel
+
+                if not running:
+                    # Only backoff or rate limit timers left
+                    await asyncio.sleep(self._next_wakeup() or 0)
+                    continue
+
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=self._next_wakeup(),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for future in done:
+                    task_id, is_hedge = running.pop(future)
+                    result, error = None, None
+                    if not future.cancelled():  # cancelled attempts lost a race
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            error = str(e)
+                    self._attempt_ended(task_id, is_hedge, result, error)
+        finally:
+            # Kill in-flight CLI sessions, e.g. on Ctrl-C
+            for future in running:
+                future.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            task_executor.close()
@@ -0,0 +1,148 @@
+"""Run-wide circuit breaker that pauses dispatch while the CLI keeps failing."""
+
+import re
+import time
+from typing import Optional
+
+from .claude_runner import ClaudeResult
+from .failures import TASK
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# Characters of an error message kept in a failure signature
+SIGNATURE_LENGTH = 80
+
+_NUMBERS = re.compile(r"\d+")
+
+
+def failure_signature(result: Optional[ClaudeResult]) -> str:
+    """Reduce a failed attempt to a key shared by failures with the same cause.
+
+    Failures outside the CLI's control (permanent, rate limit, transient,
+    timeout) share one key per error class. Task failures are keyed by
+    the first line of their error message with numbers masked, so only
+    tasks failing the same way in a row open the breaker.
+
+    Args:
+        result: Result of the failed attempt (None if it raised)
+
+    Returns:
+        Failure signature
+    """
+    if result is None:
+        return "exception"
+    if result.error_class is not None and result.error_class != TASK:
+        return result.error_class
+    message = (result.error_message or "").strip()
+    first_line = message.splitlines()[0] if message else f"exit code {result.exit_code}"
+    return _NUMBERS.sub("#", first_line)[:SIGNATURE_LENGTH]
+
+
+class CircuitBreaker:
+    """Stop dispatching after a burst of failures with the same cause.
+
+    - closed: attempts are dispatched normally; ``threshold`` consecutive
+      failures with the same signature open the breaker
+    - open: nothing is dispatched for ``cooldown`` seconds
+    - half-open: a single probe attempt is dispatched; its success closes
+      the breaker, its failure opens it again
+
+    Any success closes the breaker, including attempts that were already
+    in flight when it opened. Their failures are ignored while the breaker
+    is open or half-open: only the probe's failure counts as a failed probe.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        """Initialize breaker.
+
+        Args:
+            threshold: Consecutive same-signature failures that open it
+            cooldown: Seconds to hold dispatch before probing
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.signature: Optional[str] = None  # cause of the current failure streak
+        self.failed_probes = 0  # probes that failed since the breaker opened
+        self._streak = 0
+        self._opened_at = 0.0
+        self._probe: Optional[str] = None  # task ID of the probe in flight
+
+    def allows_dispatch(self) -> bool:
+        """Check whether an attempt may be dispatched now."""
+        if self.state == OPEN and time.monotonic() >= self._opened_at + self.cooldown:
+            self.state = HALF_OPEN
+            self._probe = None
+        if self.state == HALF_OPEN:
+            return self._probe is None
+        return self.state == CLOSED
+
+    def dispatched(self, task_id: str) -> bool:
+        """Note a dispatched attempt.
+
+        Args:
+            task_id: Task of the attempt
+
+        Returns:
+            True if the attempt is the probe of a half-open breaker
+        """
+        if self.state == HALF_OPEN and self._probe is None:
+            self._probe = task_id
+            return True
+        return False
+
+    def probe_skipped(self, task_id: str) -> None:
+        """Let another attempt probe, e.g. after the probe hit the cache."""
+        if task_id == self._probe:
+            self._probe = None
+
+    def opens_in(self) -> Optional[float]:
+        """Seconds until an open breaker admits a probe (None unless open)."""
+        if self.state != OPEN:
+            return None
+        return max(self._opened_at + self.cooldown - time.monotonic(), 0.0)
+
+    def record(self, success: bool, signature: Optional[str] = None, task_id: Optional[str] = None) -> Optional[str]:
+        """Feed the outcome of an attempt into the breaker.
+
+        Args:
+            success: Whether the attempt succeeded
+            signature: Failure signature of a failed attempt
+            task_id: Task of the attempt (tells the probe from late attempts)
+
+        Returns:
+            The new state if the breaker changed state, else None
+        """
+        if success:
+            self._streak = 0
+            self.signature = None
+            if self.state == CLOSED:
+                return None
+            self.state = CLOSED
+            self.failed_probes = 0
+            return CLOSED
+
+        if self.state != CLOSED and (task_id is None or task_id != self._probe):
+            return None  # attempts that were in flight when it opened
+        if self.state == HALF_OPEN:
+            self.failed_probes += 1
+            self._open()
+            return OPEN
+
+        if signature == self.signature:
+            self._streak += 1
+        else:
+            self.signature = signature
+            self._streak = 1
+        if self._streak >= self.threshold:
+            self._open()
+            return OPEN
+        return None
+
+    def _open(self) -> None:
+        """Start (another) cooldown."""
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._probe = None
@@ -0,0 +1,84 @@
+"""Cancellation of running CLI sessions."""
+
+import os
+import signal
+import subprocess
+import threading
+from typing import Any, Callable, Optional
+
+# Popen/create_subprocess_exec arguments that give the CLI its own process
+# group, so that tools it spawns are killed along with it
+if os.name == "posix":
+    SESSION_ARGS: dict[str, Any] = {"start_new_session": True}
+else:
+    SESSION_ARGS = {}
+
+
+def kill_process_group(process: Any) -> None:
+    """Kill a CLI process and every process in its group.
+
+    Works for ``subprocess.Popen`` and asyncio processes started with
+    ``SESSION_ARGS``; elsewhere only the process itself is killed.
+
+    Args:
+        process: Process to kill
+    """
+    if SESSION_ARGS:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+            return
+        except (ProcessLookupError, PermissionError):
+            pass  # group already gone; make sure the leader is too
+    try:
+        process.kill()
+    except ProcessLookupError:
+        pass
+
+
+class CancelToken:
+    """Let another thread kill the CLI session of one attempt.
+
+    The runner attaches its child process once started; ``cancel`` kills
+    its process group, and a process attached after cancellation is
+    killed right away. Runners without a child process attach an abort
+    function instead (e.g. one that shuts down an HTTP connection).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+        self._abort: Optional[Callable[[], None]] = None
+        self._event = threading.Event()
+        self.cancelled = False
+
+    def attach(self, process: subprocess.Popen) -> None:
+        """Register the child process of the attempt."""
+        with self._lock:
+            self._process = process
+            if self.cancelled:
+                kill_process_group(process)
+
+    def attach_abort(self, abort: Optional[Callable[[], None]]) -> None:
+        """Register the function that interrupts the attempt (None to detach)."""
+        with self._lock:
+            self._abort = abort
+            if self.cancelled and abort is not None:
+                abort()
+
+    def cancel(self) -> None:
+        """Kill the attached process (or the next one attached)."""
+        with self._lock:
+            self.cancelled = True
+            if self._process is not None and self._process.poll() is None:
+                kill_process_group(self._process)
+            if self._abort is not None:
+                self._abort()
+        self._event.set()
+
+    def wait(self, seconds: float) -> bool:
+        """Sleep, waking up early on cancellation.
+
+        Returns:
+            True if the token was cancelled
+        """
+        return self._event.wait(seconds)
@@ -1,34 +1,47 @@
 """Claude CLI wrapper for executing tasks."""
 
+import asyncio
 import json
+import shlex
 import subprocess
+import threading
 import os
 from pathlib import Path
-from typing import Optional
-from dataclasses import dataclass
+from typing import Callable, Optional
 
+from ..models.config import PlanConfig
+from .cancellation import SESSION_ARGS, CancelToken, kill_process_group
+from .runner import READ_CHUNK, ClaudeResult, TaskRunner
+from .stream import OutputTail, StreamCollector, transcript_path
 
-@dataclass
-class ClaudeResult:
-    """Result from a Claude CLI execution."""
 
-    success: bool
-    exit_code: int
-    stdout: str
-    stderr: str
-    error_message: Optional[str] = None
-    input_tokens: Optional[int] = None
-    output_tokens: Optional[int] = None
+class ClaudeRunner(TaskRunner):
+    """Execute prompts via Claude CLI.
 
+    ``run`` blocks the calling thread until the CLI exits; ``run_async`` is
+    the asyncio equivalent used by the asyncio engine, which lets a single
+    thread supervise many concurrent CLI sessions.
 
-class ClaudeRunner:
-    """Execute prompts via Claude CLI."""
+    With ``output_format="stream-json"`` output is parsed incrementally:
+    raw output goes to a per-task transcript file and only a bounded tail
+    is kept in memory.
+
+    Each CLI session runs in its own process group, which is killed as a
+    whole on timeout or cancellation so that tools the CLI started do not
+    outlive it.
+    """
+
+    name = "cli"
 
     def __init__(
         self,
         working_dir: str = "./",
         model: str = "sonnet",
         timeout: int = 3600,
+        command: str = "claude",
+        output_format: str = "json",
+        transcript_dir: Optional[Path] = None,
+        tail_bytes: int = 65536,
     ):
         """Initialize Claude runner.
 
@@ -36,97 +49,368 @@ class ClaudeRunner:
             working_dir: Working directory for Claude execution
             model: Model to use (sonnet, opus, haiku)
             timeout: Timeout in seconds
+            command: Claude CLI executable, optionally with leading arguments
+            output_format: "json" or "stream-json"
+            transcript_dir: Directory for stream-json transcripts (none if unset)
+            tail_bytes: Bytes of stdout/stderr kept in memory when streaming
         """
-        self.working_dir = Path(working_dir)
-        self.model = model
-        self.timeout = timeout
+        super().__init__(working_dir, model, timeout, output_format, transcript_dir, tail_bytes)
+        self.command = shlex.split(command)
 
-    def run(self, prompt: str, task_id: str = "") -> ClaudeResult:
-        """Execute a prompt via Claude CLI.
+    @classmethod
+    def from_config(cls, config: PlanConfig) -> "ClaudeRunner":
+        """Create a runner from a PlanConfig.
 
         Args:
-            prompt: The prompt to execute
-            task_id: Optional task ID for logging
+            config: Plan configuration
 
         Returns:
-            ClaudeResult with execution outcome
+            Configured runner
         """
-        # Build the Claude CLI command
+        return cls(
+            working_dir=config.working_dir,
+            model=config.model,
+            timeout=config.timeout,
+            command=config.claude_command,
+            output_format=config.output_format,
+            transcript_dir=Path(config.output_dir) / "transcripts",
+            tail_bytes=config.output_tail_bytes,
+        )
+
+    def build_command(self) -> list[str]:
+        """Build the Claude CLI command line."""
         cmd = [
-            "claude",
+            *self.command,
             "--print",  # Print response to stdout
             "--model", self.model,
             "--dangerously-skip-permissions",  # Skip permission prompts for automation
-            "--output-format", "json",  # JSON output for usage metrics
+            "--output-format", self.output_format,  # JSON output for usage metrics
         ]
+        if self.streaming:
+            cmd.append("--verbose")  # Required by --print with stream-json
+        return cmd
+
+    def build_env(self) -> dict[str, str]:
+        """Build the environment for the CLI process."""
+        return {**os.environ, "CLAUDE_CODE_ENTRYPOINT": "plan-runner"}
+
+    def parse_result(self, returncode: int, stdout: str, stderr: str) -> ClaudeResult:
+        """Build a result from the CLI exit code and output.
+
+        Args:
+            returncode: Process exit code
+            stdout: Captured standard output
+            stderr: Captured standard error
 
+        Returns:
+            ClaudeResult with usage extracted from the JSON response
+        """
+        success = returncode == 0
+
+        # Parse JSON response to extract usage and content
+        input_tokens = None
+        output_tokens = None
+        content = stdout
+
+        if returncode == 0:
+            try:
+                data = json.loads(stdout)
+                input_tokens = data.get("usage", {}).get("input_tokens")
+                output_tokens = data.get("usage", {}).get("output_tokens")
+                content = data.get("result", stdout)
+            except json.JSONDecodeError:
+                pass
+
+        return self._classified(ClaudeResult(
+            success=success,
+            exit_code=returncode,
+            stdout=content,
+            stderr=stderr,
+            error_message=stderr if not success else None,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+        ))
+
+    def _new_collector(
+        self,
+        task_id: str,
+        on_usage: Optional[Callable[[int, int], None]],
+    ) -> StreamCollector:
+        """Create a stream collector writing to the task's transcript."""
+        transcript = None
+        if self.transcript_dir is not None and task_id:
+            transcript = transcript_path(self.transcript_dir, task_id)
+        return StreamCollector(transcript, self.tail_bytes, on_usage)
+
+    def stream_result(
+        self,
+        returncode: int,
+        collector: StreamCollector,
+        stderr_tail: OutputTail,
+    ) -> ClaudeResult:
+        """Build a result from a finished streaming session."""
+        success = returncode == 0
+        stderr = stderr_tail.text()
+        content = collector.result_text
+        if content is None:
+            content = collector.tail.text()
+        return self._classified(ClaudeResult(
+            success=success,
+            exit_code=returncode,
+            stdout=content,
+            stderr=stderr,
+            error_message=stderr if not success else None,
+            input_tokens=collector.input_tokens,
+            output_tokens=collector.output_tokens,
+            transcript_path=str(collector.transcript) if collector.transcript else None,
+        ))
+
+    def _stream_timeout_result(self, collector: StreamCollector) -> ClaudeResult:
+        """Build a timeout result that still points at the partial transcript."""
+        result = self.timeout_result()
+        result.transcript_path = str(collector.transcript) if collector.transcript else None
+        return result
+
+    def run(
+        self,
+        prompt: str,
+        task_id: str = "",
+        on_usage: Optional[Callable[[int, int], None]] = None,
+        cancel: Optional[CancelToken] = None,
+    ) -> ClaudeResult:
+        """Execute a prompt via Claude CLI.
+
+        Args:
+            prompt: The prompt to execute
+            task_id: Optional task ID for logging and the transcript name
+            on_usage: Called with running token totals (streaming mode only)
+            cancel: Token through which another thread may kill the CLI
+
+        Returns:
+            ClaudeResult with execution outcome
+        """
         try:
             # Ensure working directory exists
             self.working_dir.mkdir(parents=True, exist_ok=True)
 
-            # Run Claude CLI
-            result = subprocess.run(
-                cmd,
-                input=prompt,
-                capture_output=True,
+            if self.streaming:
+                return self._run_streaming(prompt, task_id, on_usage, cancel)
+
+            # Run Claude CLI (like subprocess.run, but killable through the token)
+            with subprocess.Popen(
+                self.build_command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
                 cwd=str(self.working_dir),
-                timeout=self.timeout,
-                env={**os.environ, "CLAUDE_CODE_ENTRYPOINT": "plan-runner"},
-            )
+                env=self.build_env(),
+                **SESSION_ARGS,
+            ) as process:
+                if cancel is not None:
+                    cancel.attach(process)
+                try:
+                    stdout, stderr = process.communicate(prompt, timeout=self.timeout)
+                except BaseException:
+                    kill_process_group(process)
+                    process.communicate()
+                    raise
+            if cancel is not None and cancel.cancelled:
+                return self.cancelled_result()
+            return self.parse_result(process.returncode, stdout, stderr)
+
+        except subprocess.TimeoutExpired:
+            return self.timeout_result()
 
-            success = result.returncode == 0
+        except FileNotFoundError:
+            return self.error_result("Claude CLI not found. Ensure 'claude' is in PATH.")
 
-            # Parse JSON response to extract usage and content
-            input_tokens = None
-            output_tokens = None
-            content = result.stdout
+        except Exception as e:
+            return self.error_result(f"Unexpected error: {str(e)}")
 
-            if result.returncode == 0:
-                try:
-                    data = json.loads(result.stdout)
-                    input_tokens = data.get("usage", {}).get("input_tokens")
-                    output_tokens = data.get("usage", {}).get("output_tokens")
-                    content = data.get("result", result.stdout)
-                except json.JSONDecodeError:
-                    pass
-
-            return ClaudeResult(
-                success=success,
-                exit_code=result.returncode,
-                stdout=content,
-                stderr=result.stderr,
-                error_message=result.stderr if not success else None,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
+    def _run_streaming(
+        self,
+        prompt: str,
+        task_id: str,
+        on_usage: Optional[Callable[[int, int], None]],
+        cancel: Optional[CancelToken] = None,
+    ) -> ClaudeResult:
+        """Run the CLI and consume stream-json output as it is produced."""
+        process = subprocess.Popen(
+            self.build_command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=str(self.working_dir),
+            env=self.build_env(),
+            **SESSION_ARGS,
+        )
+        if cancel is not None:
+            cancel.attach(process)
+        collector = self._new_collector(task_id, on_usage)
+        stderr_tail = OutputTail(self.tail_bytes)
+        timed_out = threading.Event()
+
+        def feed_stdin() -> None:
+            try:
+                process.stdin.write(prompt.encode("utf-8"))
+                process.stdin.close()
+            except OSError:
+                pass  # CLI exited early; its exit code tells the story
+
+        def drain_stderr() -> None:
+            for chunk in iter(lambda: process.stderr.read1(READ_CHUNK), b""):
+                stderr_tail.append(chunk)
+
+        def kill_on_timeout() -> None:
+            timed_out.set()
+            kill_process_group(process)
+
+        helpers = [
+            threading.Thread(target=feed_stdin, daemon=True),
+            threading.Thread(target=drain_stderr, daemon=True),
+        ]
+        timer = threading.Timer(self.timeout, kill_on_timeout)
+        for helper in helpers:
+            helper.start()
+        timer.start()
+        try:
+            for chunk in iter(lambda: process.stdout.read1(READ_CHUNK), b""):
+                collector.feed(chunk)
+            process.wait()
+            for helper in helpers:
+                helper.join()
+        finally:
+            timer.cancel()
+            collector.close()
+            if process.poll() is None:
+                kill_process_group(process)
+                process.wait()
+
+        if timed_out.is_set():
+            return self._stream_timeout_result(collector)
+        if cancel is not None and cancel.cancelled:
+            return self.cancelled_result()
+        return self.stream_result(process.returncode, collector, stderr_tail)
+
+    async def run_async(
+        self,
+        prompt: str,
+        task_id: str = "",
+        on_usage: Optional[Callable[[int, int], None]] = None,
+    ) -> ClaudeResult:
+        """Execute a prompt via Claude CLI without blocking the event loop.
+
+        The child's process group is killed if it exceeds the timeout or
+        the coroutine is cancelled.
+
+        Args:
+            prompt: The prompt to execute
+            task_id: Optional task ID for logging and the transcript name
+            on_usage: Called with running token totals (streaming mode only)
+
+        Returns:
+            ClaudeResult with execution outcome
+        """
+        try:
+            self.working_dir.mkdir(parents=True, exist_ok=True)
+
+            if self.streaming:
+                return await self._run_streaming_async(prompt, task_id, on_usage)
+
+            process = await asyncio.create_subprocess_exec(
+                *self.build_command(),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=str(self.working_dir),
+                env=self.build_env(),
+                **SESSION_ARGS,
             )
 
-        except subprocess.TimeoutExpired:
-            return ClaudeResult(
-                success=False,
-                exit_code=-1,
-                stdout="",
-                stderr="",
-                error_message=f"Task timed out after {self.timeout} seconds",
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(prompt.encode("utf-8")),
+                    timeout=self.timeout,
+                )
+            except asyncio.TimeoutError:
+                kill_process_group(process)
+                await process.wait()
+                return self.timeout_result()
+            except asyncio.CancelledError:
+                kill_process_group(process)
+                await process.wait()
+                raise
+
+            return self.parse_result(
+                process.returncode,
+                stdout.decode("utf-8", errors="replace"),
+                stderr.decode("utf-8", errors="replace"),
             )
 
         except FileNotFoundError:
-            return ClaudeResult(
-                success=False,
-                exit_code=-1,
-                stdout="",
-                stderr="",
-                error_message="Claude CLI not found. Ensure 'claude' is in PATH.",
-            )
+            return self.error_result("Claude CLI not found. Ensure 'claude' is in PATH.")
 
         except Exception as e:
-            return ClaudeResult(
-                success=False,
-                exit_code=-1,
-                stdout="",
-                stderr="",
-                error_message=f"Unexpected error: {str(e)}",
-            )
+            return self.error_result(f"Unexpected error: {str(e)}")
+
+    async def _run_streaming_async(
+        self,
+        prompt: str,
+        task_id: str,
+        on_usage: Optional[Callable[[int, int], None]],
+    ) -> ClaudeResult:
+        """asyncio variant of ``_run_streaming``."""
+        process = await asyncio.create_subprocess_exec(
+            *self.build_command(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=str(self.working_dir),
+            env=self.build_env(),
+            **SESSION_ARGS,
+        )
+        collector = self._new_collector(task_id, on_usage)
+        stderr_tail = OutputTail(self.tail_bytes)
+
+        async def feed_stdin() -> None:
+            try:
+                process.stdin.write(prompt.encode("utf-8"))
+                await process.stdin.drain()
+                process.stdin.close()
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # CLI exited early; its exit code tells the story
+
+        async def pump(stream: asyncio.StreamReader, sink: Callable[[bytes], None]) -> None:
+            while True:
+                chunk = await stream.read(READ_CHUNK)
+                if not chunk:
+                    return
+                sink(chunk)
+
+        session = asyncio.gather(
+            feed_stdin(),
+            pump(process.stdout, collector.feed),
+            pump(process.stderr, stderr_tail.append),
+            process.wait(),
+        )
+        # A cancelled session ends with CancelledError nobody awaits; consume it
+        session.add_done_callback(lambda future: future.cancelled() or future.exception())
+        try:
+            await asyncio.wait_for(session, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            kill_process_group(process)
+            await process.wait()
+            collector.close()
+            return self._stream_timeout_result(collector)
+        except asyncio.CancelledError:
+            kill_process_group(process)
+            await process.wait()
+            raise
+        finally:
+            collector.close()
+
+        return self.stream_result(process.returncode, collector, stderr_tail)
 
     def check_available(self) -> bool:
         """Check if Claude CLI is available.
@@ -136,7 +420,7 @@ class ClaudeRunner:
         """
         try:
             result = subprocess.run(
-                ["claude", "--version"],
+                [*self.command, "--version"],
                 capture_output=True,
                 text=True,
                 timeout=10,
@@ -0,0 +1,129 @@
+"""Adaptive (AIMD) control of the number of in-flight tasks."""
+
+from collections import deque
+from typing import Optional
+
+from .claude_runner import ClaudeResult
+from .failures import RATE_LIMIT, TIMEOUT
+
+
+def congestion_signal(result: ClaudeResult) -> Optional[str]:
+    """Check whether a failed attempt indicates the provider is saturated.
+
+    Derived from the attempt's error class (see ``failures.classify``), so
+    the controller and the rate limiter agree with the retry policies.
+
+    Args:
+        result: Result of a finished attempt
+
+    Returns:
+        "rate limited" or "timeout", or None for other outcomes
+    """
+    if result.success:
+        return None
+    if result.error_class == RATE_LIMIT:
+        return "rate limited"
+    if result.error_class == TIMEOUT:
+        return "timeout"
+    return None
+
+
+class ConcurrencyController:
+    """Additive-increase / multiplicative-decrease limit on in-flight tasks.
+
+    - Increase by one after a full round of successes (as many as the
+      current limit) while latency stays within ``latency_tolerance`` of the
+      best smoothed latency seen so far.
+    - Multiply by ``decrease_factor`` on a rate-limit or timeout signal, or
+      when at least ``failure_threshold`` of the last ``window`` attempts
+      failed. After a decrease, further decreases wait until the attempts
+      already in flight have drained.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        failure_threshold: float = 0.5,
+        window: int = 20,
+    ):
+        """Initialize controller.
+
+        Args:
+            initial: Starting limit
+            min_limit: Lowest allowed limit
+            max_limit: Highest allowed limit
+            decrease_factor: Multiplier applied on congestion
+            latency_tolerance: Smoothed latency / best latency above which
+                the limit stops growing
+            failure_threshold: Failure fraction that triggers a decrease
+            window: Number of recent attempts for the failure fraction
+        """
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError(f"Invalid concurrency bounds: {min_limit}..{max_limit}")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = min(max(initial, min_limit), max_limit)
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.failure_threshold = failure_threshold
+        self._recent: deque[bool] = deque(maxlen=window)
+        self._round_successes = 0
+        self._observed = 0
+        self._hold_decrease_until = 0
+        self._latency: Optional[float] = None
+        self._best_latency: Optional[float] = None
+
+    def observe(self, latency: float, success: bool, signal: Optional[str] = None) -> Optional[str]:
+        """Feed one finished attempt into the controller.
+
+        Args:
+            latency: Seconds the attempt took
+            success: Whether it succeeded
+            signal: Congestion signal from ``congestion_signal``
+
+        Returns:
+            Reason for the adjustment if the limit changed, else None
+        """
+        self._observed += 1
+        self._recent.append(success)
+        self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+        if self._best_latency is None or self._latency < self._best_latency:
+            self._best_latency = self._latency
+
+        can_decrease = self._observed >= self._hold_decrease_until
+        if signal and can_decrease:
+            return self._decrease(signal)
+
+        failures = self._recent.count(False)
+        if (
+            can_decrease
+            and len(self._recent) == self._recent.maxlen
+            and failures / len(self._recent) >= self.failure_threshold
+        ):
+            return self._decrease(f"{failures}/{len(self._recent)} attempts failed")
+
+        if success:
+            self._round_successes += 1
+            latency_ok = self._latency <= self._best_latency * self.latency_tolerance
+            if self._round_successes >= self.limit and latency_ok and self.limit < self.max_limit:
+                self.limit += 1
+                self._round_successes = 0
+                return "additive increase"
+        return None
+
+    def _decrease(self, reason: str) -> Optional[str]:
+        """Apply a multiplicative decrease."""
+        new_limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        self._round_successes = 0
+        self._recent.clear()
+        # Let the attempts already in flight report before reacting again
+        self._hold_decrease_until = self._observed + self.limit
+        if new_limit == self.limit:
+            return None
+        self.limit = new_limit
+        return reason
@@ -0,0 +1,236 @@
+"""Classify failed attempts and decide whether and when to retry them."""
+
+import json
+import random
+import re
+import time
+from dataclasses import dataclass, fields, replace
+from typing import Optional
+
+from ..models.config import PlanConfig
+from .retry import backoff_delay
+
+# Error classes, from most to least specific
+PERMANENT = "permanent"  # retrying cannot help: CLI missing, not authenticated, invalid request
+RATE_LIMIT = "rate_limit"  # the provider refused for quota; wait as long as it says
+TRANSIENT = "transient"  # overload or network trouble; back off with jitter
+TIMEOUT = "timeout"  # the attempt ran past config.timeout
+TASK = "task"  # the CLI ran and the task itself failed
+
+ERROR_CLASSES = (PERMANENT, RATE_LIMIT, TRANSIENT, TIMEOUT, TASK)
+
+# Messages API error types, as reported in JSON output or echoed on stderr
+API_ERROR_CLASSES = {
+    "rate_limit_error": RATE_LIMIT,
+    "overloaded_error": TRANSIENT,
+    "api_error": TRANSIENT,
+    "authentication_error": PERMANENT,
+    "permission_error": PERMANENT,
+    "billing_error": PERMANENT,
+    "invalid_request_error": PERMANENT,
+    "not_found_error": PERMANENT,
+    "request_too_large": PERMANENT,
+}
+
+# Shell exit codes for a command that cannot be executed or found
+NOT_EXECUTABLE_CODES = (126, 127)
+
+API_ERROR_PATTERN = re.compile(r"\b(" + "|".join(API_ERROR_CLASSES) + r")\b")
+RATE_LIMIT_PATTERN = re.compile(
+    r"rate.?limit|too many requests|\b429\b|usage limit|quota exceeded",
+    re.IGNORECASE,
+)
+TRANSIENT_PATTERN = re.compile(
+    r"overloaded|\b5(?:00|02|03|04|29)\b|internal server error|bad gateway|service unavailable"
+    r"|gateway timeout|ECONNRESET|ECONNREFUSED|ETIMEDOUT|EAI_AGAIN|ENOTFOUND|socket hang up"
+    r"|network error|fetch failed|connection (?:reset|refused|error|closed)",
+    re.IGNORECASE,
+)
+PERMANENT_PATTERN = re.compile(
+    r"invalid api key|\b40[13]\b|unauthori[sz]ed|forbidden|not logged in|please run /login"
+    r"|credit balance is too low|invalid model|unknown option|command not found",
+    re.IGNORECASE,
+)
+
+RETRY_AFTER_PATTERN = re.compile(r"retry[-_ ]after[\"']?\s*[:=]?\s*(\d+(?:\.\d+)?)", re.IGNORECASE)
+TRY_AGAIN_PATTERN = re.compile(
+    r"try again in (\d+(?:\.\d+)?)\s*(s|sec|secs|seconds?|m|min|mins|minutes?)\b",
+    re.IGNORECASE,
+)
+# Subscription limits name the epoch second at which they reset
+USAGE_RESET_PATTERN = re.compile(r"usage limit reached\|(\d{10})", re.IGNORECASE)
+
+
+def classify(
+    exit_code: int,
+    stdout: str,
+    stderr: str,
+    error_message: Optional[str] = None,
+) -> tuple[str, Optional[float]]:
+    """Classify a failed CLI run.
+
+    Checked in order: the CLI could not be started, the attempt timed
+    out, a Messages API error type in JSON output or on stderr, then
+    rate limit, transient and permanent message patterns. Anything else
+    is a failure of the task itself.
+
+    Args:
+        exit_code: Exit code of the CLI (-1 if it did not exit normally)
+        stdout: Output or result text of the run
+        stderr: Error output of the run
+        error_message: Error message of the result, if any
+
+    Returns:
+        Tuple of (error class, seconds to wait as advertised by the
+        provider or None)
+    """
+    message = error_message or ""
+    if message.startswith("Claude CLI not found") or exit_code in NOT_EXECUTABLE_CODES:
+        return PERMANENT, None
+    if message.startswith("Task timed out"):
+        return TIMEOUT, None
+
+    data = _json_error(stdout)
+    text = "\n".join(filter(None, (message, stderr, stdout)))
+    retry_after = _retry_after(text, data)
+
+    api_error = None
+    if data is not None:
+        error = data.get("error")
+        if isinstance(error, dict):
+            api_error = error.get("type")
+    if api_error not in API_ERROR_CLASSES:
+        match = API_ERROR_PATTERN.search(text)
+        api_error = match.group(1) if match else None
+    if api_error is not None:
+        return API_ERROR_CLASSES[api_error], retry_after
+
+    if RATE_LIMIT_PATTERN.search(text):
+        return RATE_LIMIT, retry_after
+    if TRANSIENT_PATTERN.search(text):
+        return TRANSIENT, retry_after
+    if PERMANENT_PATTERN.search(text):
+        return PERMANENT, None
+    return TASK, None
+
+
+def _json_error(stdout: str) -> Optional[dict]:
+    """Parse the JSON object the CLI printed, or the last line of a stream."""
+    text = stdout.strip()
+    if not text:
+        return None
+    for candidate in (text, text.rsplit("\n", 1)[-1]):
+        if candidate.startswith("{"):
+            try:
+                data = json.loads(candidate)
+            except ValueError:
+                continue
+            if isinstance(data, dict):
+                return data
+    return None
+
+
+def _retry_after(text: str, data: Optional[dict]) -> Optional[float]:
+    """Find how long the provider asked to wait before retrying."""
+    if data is not None:
+        for source in (data, data.get("error")):
+            if isinstance(source, dict):
+                value = source.get("retry_after", source.get("retry-after"))
+                if isinstance(value, (int, float)):
+                    return max(float(value), 0.0)
+
+    match = USAGE_RESET_PATTERN.search(text)
+    if match:
+        return max(int(match.group(1)) - time.time(), 0.0)
+    match = RETRY_AFTER_PATTERN.search(text)
+    if match:
+        return float(match.group(1))
+    match = TRY_AGAIN_PATTERN.search(text)
+    if match:
+        seconds = float(match.group(1))
+        return seconds * 60 if match.group(2).lower().startswith("m") else seconds
+    return None
+
+
+@dataclass
+class RetryPolicy:
+    """How to retry one class of failures.
+
+    Unset fields fall back to the plan's ``retries``, ``retry_delay`` and
+    ``retry_jitter``.
+    """
+
+    retry: bool = True  # False: the first failure of this class is final
+    retries: Optional[int] = None  # attempts in total
+    delay: Optional[float] = None  # base delay of the exponential backoff
+    jitter: Optional[float] = None  # +/- fraction of random spread
+    max_delay: Optional[float] = None  # cap on any single wait
+    retry_after: bool = False  # wait as long as the provider advertises, if it does
+
+    def max_attempts(self, config: PlanConfig) -> int:
+        """Attempts a task may make while it fails with this class (0: none after it)."""
+        if not self.retry:
+            return 0
+        return self.retries if self.retries is not None else config.retries
+
+    def wait(self, config: PlanConfig, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before the next attempt.
+
+        Args:
+            config: Plan configuration supplying unset fields
+            attempt: Number of the attempt that just failed (1-based)
+            retry_after: Wait advertised by the provider, if any
+
+        Returns:
+            Delay in seconds
+        """
+        jitter = self.jitter if self.jitter is not None else config.retry_jitter
+        if self.retry_after and retry_after is not None:
+            # Spread waiting tasks out, but never retry before the advertised time
+            delay = retry_after * (1 + random.uniform(0, jitter))
+        else:
+            base = self.delay if self.delay is not None else config.retry_delay
+            delay = backoff_delay(base, attempt, jitter)
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+        return delay
+
+
+DEFAULT_POLICIES = {
+    PERMANENT: RetryPolicy(retry=False),
+    RATE_LIMIT: RetryPolicy(retry_after=True),
+    TRANSIENT: RetryPolicy(jitter=0.5),
+    TIMEOUT: RetryPolicy(),
+    TASK: RetryPolicy(),
+}
+
+
+def retry_policies(config: PlanConfig) -> dict[str, RetryPolicy]:
+    """Build the retry policy of every error class.
+
+    ``config.retry_policies`` maps error classes to overrides of the
+    defaults, e.g. ``{"rate_limit": {"retries": 6, "max_delay": 600}}``.
+
+    Args:
+        config: Plan configuration
+
+    Returns:
+        Error class -> policy
+    """
+    known = {f.name for f in fields(RetryPolicy)}
+    policies = dict(DEFAULT_POLICIES)
+    for error_class, overrides in config.retry_policies.items():
+        if error_class not in policies:
+            raise ValueError(
+                f"Unknown error class in retry_policies: {error_class} (expected one of {', '.join(ERROR_CLASSES)})"
+            )
+        unknown = set(overrides) - known
+        if unknown:
+            raise ValueError(f"Unknown retry policy settings for {error_class}: {', '.join(sorted(unknown))}")
+        policies[error_class] = replace(policies[error_class], **overrides)
+    return policies
+
+
+def policy_for(policies: dict[str, RetryPolicy], error_class: Optional[str]) -> RetryPolicy:
+    """Look up the policy of an error class (TASK for unclassified failures)."""
+    return policies.get(error_class) or policies[TASK]
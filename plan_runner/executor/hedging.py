@@ -0,0 +1,134 @@
+"""Hedged execution: race straggling tasks against a second attempt."""
+
+import os
+import shutil
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+from ..models.config import PlanConfig
+from ..models.plan import Task
+from ..state.history import SAMPLES_PER_TEMPLATE, percentile
+from ..state.result_cache import resolve_path
+
+# Hedge workspaces, relative to output_dir
+HEDGE_DIR = "hedges"
+
+
+class StragglerDetector:
+    """Duration thresholds per template beyond which an attempt is a straggler.
+
+    The threshold is a percentile of the template's recent successful
+    durations, from history and from this run. Templates with fewer than
+    ``min_samples`` durations have no threshold.
+    """
+
+    def __init__(self, fraction: float = 0.95, min_samples: int = 20, window: int = SAMPLES_PER_TEMPLATE):
+        """Initialize detector.
+
+        Args:
+            fraction: Percentile of durations, as a fraction in (0, 1)
+            min_samples: Durations needed before a template gets a threshold
+            window: Most recent durations kept per template
+        """
+        if not 0 < fraction < 1:
+            raise ValueError(f"hedge_percentile must be between 0 and 1, got {fraction}")
+        self.fraction = fraction
+        self.min_samples = min_samples
+        self.window = window
+        self._durations: dict[str, deque] = {}
+        self._thresholds: dict[str, Optional[float]] = {}
+
+    def observe(self, template: str, duration: float) -> None:
+        """Add the duration of a successful attempt."""
+        durations = self._durations.get(template)
+        if durations is None:
+            durations = self._durations[template] = deque(maxlen=self.window)
+        durations.append(duration)
+        self._thresholds.pop(template, None)
+
+    def threshold(self, template: str) -> Optional[float]:
+        """Seconds after which an attempt of a template is a straggler."""
+        if template not in self._thresholds:
+            durations = self._durations.get(template, ())
+            self._thresholds[template] = (
+                percentile(list(durations), self.fraction) if len(durations) >= self.min_samples else None
+            )
+        return self._thresholds[template]
+
+
+def hedgeable(task: Task) -> bool:
+    """Check whether a task's effect can be taken over from a workspace copy.
+
+    Only declared outputs are copied back from the winning hedge, so its
+    template has to opt in with ``hedge: true`` (its only effect is its
+    outputs, not e.g. edits to source files), and the outputs must be
+    relative to the working directory, so that the hedge writes them
+    inside its copy.
+    """
+    return (
+        task.hedge
+        and bool(task.outputs)
+        and not any(Path(path).is_absolute() for path in task.outputs.values())
+    )
+
+
+def create_workspace(config: PlanConfig, task: Task, workspace: Path) -> None:
+    """Copy the working directory into a fresh workspace for a hedge of a task.
+
+    Entries named in ``hedge_link`` at the top level are symlinked instead
+    of copied. Hedge workspaces, the result cache and transcripts are left
+    out when they live inside the working directory. The task's declared
+    outputs are removed from the copy, so only files the hedge writes
+    itself can be adopted.
+
+    Args:
+        config: Plan configuration
+        task: Task to be hedged
+        workspace: Directory to create (replaced if it exists)
+    """
+    source = Path(config.working_dir).resolve()
+    output_dir = Path(config.output_dir)
+    excluded = {
+        str((output_dir / HEDGE_DIR).resolve()),
+        str((output_dir / config.cache_dir).resolve()),
+        str((output_dir / "transcripts").resolve()),
+    }
+
+    # copytree walks real directories below the resolved source, so plain
+    # path joins compare equal to resolved paths
+    def ignore(directory: str, names: list[str]) -> list[str]:
+        ignored = [name for name in names if os.path.join(directory, name) in excluded]
+        if directory == str(source):
+            ignored.extend(name for name in names if name in config.hedge_link)
+        return ignored
+
+    remove_workspace(workspace)
+    workspace.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copytree(source, workspace, symlinks=True, ignore=ignore)
+    for name in config.hedge_link:
+        if (source / name).exists():
+            os.symlink(source / name, workspace / name)
+    for path in task.outputs.values():
+        resolve_path(path, str(workspace)).unlink(missing_ok=True)
+
+
+def adopt_outputs(task: Task, workspace: Path, working_dir: str) -> bool:
+    """Copy a hedge's declared outputs into the working directory.
+
+    Returns:
+        False (copying nothing) if any declared output is missing
+    """
+    sources = {path: resolve_path(path, str(workspace)) for path in task.outputs.values()}
+    if not all(source.is_file() for source in sources.values()):
+        return False
+    for path, source in sources.items():
+        target = resolve_path(path, working_dir)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(source, target)
+    return True
+
+
+def remove_workspace(workspace: Path) -> None:
+    """Delete a hedge workspace."""
+    shutil.rmtree(workspace, ignore_errors=True)
@@ -0,0 +1,801 @@
+"""Run prompts through the Messages API over pooled keep-alive connections."""
+
+import asyncio
+import http.client
+import json
+import os
+import socket
+import ssl
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import AsyncIterator, Callable, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+from ..models.config import PlanConfig
+from .cancellation import CancelToken
+from .failures import PERMANENT
+from .runner import READ_CHUNK, ClaudeResult, TaskRunner
+from .stream import transcript_path
+
+API_VERSION = "2023-06-01"
+MESSAGES_PATH = "/v1/messages"
+MODELS_PATH = "/v1/models"
+
+# CLI model aliases and the API models they stand for; other names are sent as given
+MODEL_ALIASES = {
+    "sonnet": "claude-sonnet-4-5",
+    "opus": "claude-opus-4-1",
+    "haiku": "claude-haiku-4-5",
+}
+
+# Bytes of an error response kept for the error message
+ERROR_BODY_BYTES = 65536
+
+# Errors of a reused connection the server closed while it sat idle
+STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError, ConnectionAbortedError)
+
+
+class Origin(NamedTuple):
+    """Scheme, host and port of a server."""
+
+    scheme: str
+    host: str
+    port: int
+
+    @classmethod
+    def from_url(cls, url: str) -> "Origin":
+        """Get the origin of a URL."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Invalid API URL: {url}")
+        return cls(parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+
+    @property
+    def host_header(self) -> str:
+        """Value of the Host header for this origin."""
+        default = 443 if self.scheme == "https" else 80
+        return self.host if self.port == default else f"{self.host}:{self.port}"
+
+
+class _Stale(Exception):
+    """A reused connection turned out to be closed; retry on another one."""
+
+
+class ConnectionPool:
+    """Keep-alive HTTP connections shared by worker threads.
+
+    At most ``max_per_host`` connections to one host are in use at a time
+    (0: no limit); callers beyond that wait for one to be released. Up to
+    ``max_idle`` released connections stay open for the next request, so
+    a run pays for TCP and TLS handshakes once per connection rather than
+    once per task.
+    """
+
+    def __init__(self, max_idle: int = 10, max_per_host: int = 0, ssl_context: Optional[ssl.SSLContext] = None):
+        """Initialize pool.
+
+        Args:
+            max_idle: Released connections kept open
+            max_per_host: Connections in use per host at a time (0: no limit)
+            ssl_context: TLS settings for https origins
+        """
+        self.max_idle = max_idle
+        self.max_per_host = max_per_host
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.opened = 0  # connections created
+        self.reused = 0  # requests sent on an idle connection
+        self._lock = threading.Lock()
+        self._idle: dict[Origin, list[http.client.HTTPConnection]] = defaultdict(list)
+        self._slots: dict[Origin, threading.BoundedSemaphore] = {}
+
+    def acquire(self, origin: Origin, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        """Take an idle connection to a host, or open a new one.
+
+        Args:
+            origin: Server to connect to
+            timeout: Seconds to wait for a free slot and to connect
+
+        Returns:
+            Tuple of (connected connection, whether it was reused)
+
+        Raises:
+            TimeoutError: No slot became free in time
+            OSError: The connection could not be opened
+        """
+        deadline = time.monotonic() + timeout
+        slot = self._slot(origin)
+        if slot is not None and not slot.acquire(timeout=max(timeout, 0)):
+            raise TimeoutError(f"No connection to {origin.host} became free")
+        try:
+            with self._lock:
+                idle = self._idle[origin]
+                if idle:
+                    self.reused += 1
+                    return idle.pop(), True  # most recently used: least likely to have timed out
+                self.opened += 1
+            if origin.scheme == "https":
+                connection = http.client.HTTPSConnection(origin.host, origin.port, context=self.ssl_context)
+            else:
+                connection = http.client.HTTPConnection(origin.host, origin.port)
+            connection.timeout = max(deadline - time.monotonic(), 0.001)
+            connection.connect()
+            connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return connection, False
+        except BaseException:
+            if slot is not None:
+                slot.release()
+            raise
+
+    def release(self, origin: Origin, connection: http.client.HTTPConnection, reusable: bool) -> None:
+        """Return a connection taken with ``acquire``.
+
+        Args:
+            origin: Server the connection belongs to
+            connection: The connection
+            reusable: False if the response was not read completely or the
+                server asked to close the connection
+        """
+        with self._lock:
+            keep = reusable and sum(len(idle) for idle in self._idle.values()) < self.max_idle
+            if keep:
+                self._idle[origin].append(connection)
+        if not keep:
+            connection.close()
+        slot = self._slot(origin)
+        if slot is not None:
+            slot.release()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            connections = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for connection in connections:
+            connection.close()
+
+    def _slot(self, origin: Origin) -> Optional[threading.BoundedSemaphore]:
+        """Get the semaphore limiting connections to a host (None: unlimited)."""
+        if not self.max_per_host:
+            return None
+        with self._lock:
+            if origin not in self._slots:
+                self._slots[origin] = threading.BoundedSemaphore(self.max_per_host)
+            return self._slots[origin]
+
+
+class AsyncConnectionPool:
+    """asyncio variant of ConnectionPool, bound to one event loop."""
+
+    def __init__(self, max_idle: int = 10, max_per_host: int = 0, ssl_context: Optional[ssl.SSLContext] = None):
+        """Initialize pool.
+
+        Args:
+            max_idle: Released connections kept open
+            max_per_host: Connections in use per host at a time (0: no limit)
+            ssl_context: TLS settings for https origins
+        """
+        self.max_idle = max_idle
+        self.max_per_host = max_per_host
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.opened = 0
+        self.reused = 0
+        self._idle: dict[Origin, list[tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = defaultdict(list)
+        self._slots: dict[Origin, asyncio.Semaphore] = {}
+
+    async def acquire(self, origin: Origin) -> tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        """Take an idle connection to a host, or open a new one.
+
+        Returns:
+            Tuple of (reader, writer, whether the connection was reused)
+        """
+        slot = self._slot(origin)
+        if slot is not None:
+            await slot.acquire()
+        try:
+            idle = self._idle[origin]
+            while idle:
+                reader, writer = idle.pop()
+                if not reader.at_eof() and not writer.is_closing():
+                    self.reused += 1
+                    return reader, writer, True
+                writer.close()
+            reader, writer = await asyncio.open_connection(
+                origin.host,
+                origin.port,
+                ssl=self.ssl_context if origin.scheme == "https" else None,
+            )
+            self.opened += 1
+            return reader, writer, False
+        except BaseException:
+            if slot is not None:
+                slot.release()
+            raise
+
+    def release(
+        self,
+        origin: Origin,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        reusable: bool,
+    ) -> None:
+        """Return a connection taken with ``acquire`` (see ConnectionPool.release)."""
+        if reusable and sum(len(idle) for idle in self._idle.values()) < self.max_idle:
+            self._idle[origin].append((reader, writer))
+        else:
+            writer.close()
+        slot = self._slot(origin)
+        if slot is not None:
+            slot.release()
+
+    def close(self) -> None:
+        """Close all idle connections, also after their event loop has closed."""
+        for idle in self._idle.values():
+            for _reader, writer in idle:
+                try:
+                    writer.close()
+                except RuntimeError:
+                    # The loop is closed: end the connection without it; the
+                    # descriptor goes with the transport
+                    _shutdown(writer.get_extra_info("socket"))
+        self._idle.clear()
+
+    def _slot(self, origin: Origin) -> Optional[asyncio.Semaphore]:
+        """Get the semaphore limiting connections to a host (None: unlimited)."""
+        if not self.max_per_host:
+            return None
+        if origin not in self._slots:
+            self._slots[origin] = asyncio.Semaphore(self.max_per_host)
+        return self._slots[origin]
+
+
+class ResponseCollector:
+    """Build a ClaudeResult from the body of a Messages API response.
+
+    Streamed responses (server-sent events) are parsed as they arrive:
+    every event is appended to the transcript as one JSON line, and token
+    usage is reported while the response is still being generated.
+    """
+
+    def __init__(
+        self,
+        status: int,
+        headers: dict[str, str],
+        transcript: Optional[Path] = None,
+        on_usage: Optional[Callable[[int, int], None]] = None,
+    ):
+        """Initialize collector.
+
+        Args:
+            status: HTTP status of the response
+            headers: Response headers with lower-case names
+            transcript: File to append streamed events to
+            on_usage: Called with (input_tokens, output_tokens) whenever usage changes
+        """
+        self.status = status
+        self.headers = headers
+        self.streaming = status == 200 and headers.get("content-type", "").startswith("text/event-stream")
+        self.transcript = transcript if self.streaming else None
+        self.on_usage = on_usage
+        self.input_tokens: Optional[int] = None
+        self.output_tokens: Optional[int] = None
+        self._body = bytearray()
+        self._line = bytearray()
+        self._text: list[str] = []
+        self._error: Optional[dict] = None
+        self._stopped = False
+        self._file = None
+        if self.transcript is not None:
+            self.transcript.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.transcript.open("ab")
+
+    def feed(self, chunk: bytes) -> None:
+        """Consume a chunk of the response body."""
+        if not self.streaming:
+            if self.status == 200 or len(self._body) < ERROR_BODY_BYTES:
+                self._body += chunk
+            return
+        self._line += chunk
+        while True:
+            newline = self._line.find(b"\n")
+            if newline < 0:
+                return
+            line = bytes(self._line[:newline]).strip()
+            del self._line[:newline + 1]
+            if line.startswith(b"data:"):
+                self._event(line[5:].strip())
+
+    def close(self) -> None:
+        """Close the transcript."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def result(self) -> ClaudeResult:
+        """Build the result once the body has been read completely."""
+        if self.status != 200:
+            return self._http_error()
+        if self.streaming:
+            return self._stream_result()
+
+        try:
+            data = json.loads(self._body)
+        except ValueError:
+            return self._failure(1, self._body.decode("utf-8", errors="replace"), "Invalid response from the API")
+        usage = data.get("usage") or {}
+        self.input_tokens = usage.get("input_tokens")
+        self.output_tokens = usage.get("output_tokens")
+        return ClaudeResult(
+            success=True,
+            exit_code=0,
+            stdout=_text_of(data.get("content") or []),
+            stderr="",
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+        )
+
+    def _event(self, data: bytes) -> None:
+        """Handle the data of one server-sent event."""
+        if self._file is not None:
+            self._file.write(data + b"\n")
+        try:
+            event = json.loads(data)
+        except ValueError:
+            return
+        kind = event.get("type")
+
+        if kind == "message_start":
+            usage = (event.get("message") or {}).get("usage") or {}
+            self._set_usage(usage.get("input_tokens"), usage.get("output_tokens"))
+        elif kind == "content_block_delta":
+            delta = event.get("delta") or {}
+            if delta.get("type") == "text_delta":
+                self._text.append(delta.get("text", ""))
+        elif kind == "message_delta":
+            usage = event.get("usage") or {}
+            self._set_usage(usage.get("input_tokens", self.input_tokens), usage.get("output_tokens"))
+        elif kind == "message_stop":
+            self._stopped = True
+        elif kind == "error":
+            self._error = event
+
+    def _set_usage(self, input_tokens: Optional[int], output_tokens: Optional[int]) -> None:
+        """Store usage and notify the listener."""
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        if self.on_usage:
+            self.on_usage(input_tokens or 0, output_tokens or 0)
+
+    def _stream_result(self) -> ClaudeResult:
+        """Build the result of a streamed response."""
+        transcript = str(self.transcript) if self.transcript else None
+        if self._error is not None or not self._stopped:
+            if self._error is not None:
+                error = self._error.get("error") or {}
+                message = f"{error.get('type', 'error')}: {error.get('message', '')}"
+                stdout = json.dumps(self._error)
+            else:
+                message = "Connection closed before the response was complete"
+                stdout = "".join(self._text)
+            result = self._failure(1, stdout, message)
+            result.transcript_path = transcript
+            return result
+        return ClaudeResult(
+            success=True,
+            exit_code=0,
+            stdout="".join(self._text),
+            stderr="",
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+            transcript_path=transcript,
+        )
+
+    def _http_error(self) -> ClaudeResult:
+        """Build the result of an error status."""
+        body = self._body.decode("utf-8", errors="replace")
+        message = body.strip()
+        try:
+            error = json.loads(body).get("error") or {}
+            message = f"{error.get('type', 'error')}: {error.get('message', '')}"
+        except (ValueError, AttributeError):
+            pass
+        result = self._failure(self.status, body, f"HTTP {self.status}: {message}")
+        retry_after = self.headers.get("retry-after")
+        if retry_after:
+            try:
+                result.retry_after = max(float(retry_after), 0.0)
+            except ValueError:
+                pass  # an HTTP date; the classifier's estimate stands
+        return result
+
+    def _failure(self, exit_code: int, stdout: str, message: str) -> ClaudeResult:
+        """Build a classified failed result."""
+        return TaskRunner._classified(ClaudeResult(
+            success=False,
+            exit_code=exit_code,
+            stdout=stdout,
+            stderr="",
+            error_message=message,
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+        ))
+
+
+def _text_of(content: list) -> str:
+    """Join the text blocks of a message."""
+    return "".join(block.get("text", "") for block in content if block.get("type") == "text")
+
+
+def _shutdown(sock: Optional[socket.socket]) -> None:
+    """Interrupt a blocking read or write on a socket from another thread."""
+    if sock is None:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+class HttpRunner(TaskRunner):
+    """Execute prompts by calling the Messages API directly.
+
+    Skips the CLI process (Node startup, auth, config loading) for tasks
+    that only need a model response: the prompt is sent as a single user
+    message and the response text is saved to the task's first output.
+    The model gets no tools, so prompts cannot read or write files.
+
+    Requests go over keep-alive connections from a pool shared by all
+    workers. With ``output_format="stream-json"`` the response is streamed,
+    usage is reported while it is generated and the events are written to
+    the task's transcript. Failed requests carry the HTTP status as their
+    exit code and honour the server's Retry-After header.
+    """
+
+    name = "http"
+    writes_outputs = False
+
+    def __init__(
+        self,
+        working_dir: str = "./",
+        model: str = "sonnet",
+        timeout: int = 3600,
+        output_format: str = "json",
+        transcript_dir: Optional[Path] = None,
+        tail_bytes: int = 65536,
+        api_url: str = "https://api.anthropic.com",
+        api_key: Optional[str] = None,
+        max_tokens: int = 8192,
+        pool_size: int = 10,
+        max_per_host: int = 0,
+    ):
+        """Initialize HTTP runner.
+
+        Args:
+            working_dir: Working directory of the task
+            model: Model to use (an alias in MODEL_ALIASES or an API model name)
+            timeout: Timeout in seconds, including waiting for a connection
+            output_format: "json" or "stream-json"
+            transcript_dir: Directory for streamed transcripts (none if unset)
+            tail_bytes: Unused; kept for a uniform constructor
+            api_url: Base URL of the API
+            api_key: API key (requests fail as permanent errors without one)
+            max_tokens: max_tokens of each request
+            pool_size: Idle keep-alive connections kept open
+            max_per_host: Connections in use per host at a time (0: no limit)
+        """
+        super().__init__(working_dir, model, timeout, output_format, transcript_dir, tail_bytes)
+        self.origin = Origin.from_url(api_url)
+        self.base_path = urlsplit(api_url).path.rstrip("/")
+        self.api_key = api_key
+        self.max_tokens = max_tokens
+        self.pool = ConnectionPool(pool_size, max_per_host)
+        # One asyncio pool per event loop, shared with in_directory copies
+        self._async_pools: dict[asyncio.AbstractEventLoop, AsyncConnectionPool] = {}
+
+    @classmethod
+    def from_config(cls, config: PlanConfig) -> "HttpRunner":
+        """Create a runner from a PlanConfig.
+
+        Args:
+            config: Plan configuration
+
+        Returns:
+            Configured runner
+        """
+        return cls(
+            working_dir=config.working_dir,
+            model=config.model,
+            timeout=config.timeout,
+            output_format=config.output_format,
+            transcript_dir=Path(config.output_dir) / "transcripts",
+            tail_bytes=config.output_tail_bytes,
+            api_url=config.api_url,
+            api_key=os.environ.get(config.api_key_env),
+            max_tokens=config.api_max_tokens,
+            pool_size=config.http_pool_size,
+            max_per_host=config.http_max_per_host,
+        )
+
+    def build_body(self, prompt: str) -> bytes:
+        """Build the Messages API request body for a prompt."""
+        body = {
+            "model": MODEL_ALIASES.get(self.model, self.model),
+            "max_tokens": self.max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if self.streaming:
+            body["stream"] = True
+        return json.dumps(body).encode("utf-8")
+
+    def build_headers(self, length: int) -> dict[str, str]:
+        """Build the request headers."""
+        return {
+            "Content-Type": "application/json",
+            "Content-Length": str(length),
+            "X-Api-Key": self.api_key or "",
+            "Anthropic-Version": API_VERSION,
+            "User-Agent": "plan-runner",
+        }
+
+    def run(
+        self,
+        prompt: str,
+        task_id: str = "",
+        on_usage: Optional[Callable[[int, int], None]] = None,
+        cancel: Optional[CancelToken] = None,
+    ) -> ClaudeResult:
+        """Send a prompt to the API and wait for the response.
+
+        Args:
+            prompt: The prompt to execute
+            task_id: Optional task ID for the transcript name
+            on_usage: Called with running token totals (streaming mode only)
+            cancel: Token through which another thread may abort the request
+
+        Returns:
+            ClaudeResult with execution outcome
+        """
+        if not self.api_key:
+            return self._missing_key_result()
+        body = self.build_body(prompt)
+        deadline = time.monotonic() + self.timeout
+        try:
+            while True:
+                try:
+                    connection, reused = self.pool.acquire(self.origin, deadline - time.monotonic())
+                except TimeoutError:
+                    return self.timeout_result()
+                try:
+                    return self._exchange(connection, reused, body, deadline, task_id, on_usage, cancel)
+                except _Stale:
+                    continue
+        except OSError as e:
+            if cancel is not None and cancel.cancelled:
+                return self.cancelled_result()
+            if time.monotonic() >= deadline:
+                return self.timeout_result()
+            return self.error_result(f"Connection error: {e}")
+
+    def _exchange(
+        self,
+        connection: http.client.HTTPConnection,
+        reused: bool,
+        body: bytes,
+        deadline: float,
+        task_id: str,
+        on_usage: Optional[Callable[[int, int], None]],
+        cancel: Optional[CancelToken],
+    ) -> ClaudeResult:
+        """Send one request on a pooled connection and read the response."""
+        interrupted = threading.Event()
+
+        def abort() -> None:
+            interrupted.set()
+            _shutdown(connection.sock)
+
+        timer = threading.Timer(max(deadline - time.monotonic(), 0), abort)
+        timer.start()
+        if cancel is not None:
+            cancel.attach_abort(abort)
+        reusable = False
+        collector = None
+        try:
+            connection.sock.settimeout(max(deadline - time.monotonic(), 0.001))
+            try:
+                connection.request("POST", self.base_path + MESSAGES_PATH, body, self.build_headers(len(body)))
+                response = connection.getresponse()
+            except STALE_ERRORS:
+                if reused and not interrupted.is_set():
+                    raise _Stale()
+                raise
+            headers = {name.lower(): value for name, value in response.getheaders()}
+            collector = ResponseCollector(response.status, headers, self._transcript(task_id), on_usage)
+            for chunk in iter(lambda: response.read1(READ_CHUNK), b""):
+                collector.feed(chunk)
+            reusable = not response.will_close
+            response.close()  # read1 leaves a drained response open, which blocks the next request
+        except (OSError, http.client.HTTPException) as e:
+            if cancel is not None and cancel.cancelled:
+                return self.cancelled_result()
+            if interrupted.is_set() or isinstance(e, socket.timeout):
+                result = self.timeout_result()
+                if collector is not None and collector.transcript is not None:
+                    result.transcript_path = str(collector.transcript)
+                return result
+            if isinstance(e, OSError):
+                raise
+            return self.error_result(f"Connection error: {e}")
+        finally:
+            timer.cancel()
+            if cancel is not None:
+                cancel.attach_abort(None)
+            if collector is not None:
+                collector.close()
+            self.pool.release(self.origin, connection, reusable and not interrupted.is_set())
+        if cancel is not None and cancel.cancelled:
+            return self.cancelled_result()
+        return collector.result()
+
+    async def run_async(
+        self,
+        prompt: str,
+        task_id: str = "",
+        on_usage: Optional[Callable[[int, int], None]] = None,
+    ) -> ClaudeResult:
+        """Send a prompt to the API without blocking the event loop.
+
+        Cancelling the coroutine closes the connection.
+
+        Args:
+            prompt: The prompt to execute
+            task_id: Optional task ID for the transcript name
+            on_usage: Called with running token totals (streaming mode only)
+
+        Returns:
+            ClaudeResult with execution outcome
+        """
+        if not self.api_key:
+            return self._missing_key_result()
+        body = self.build_body(prompt)
+        try:
+            return await asyncio.wait_for(self._request_async(body, task_id, on_usage), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return self.timeout_result()
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            return self.error_result(f"Connection error: {e}")
+
+    async def _request_async(
+        self,
+        body: bytes,
+        task_id: str,
+        on_usage: Optional[Callable[[int, int], None]],
+    ) -> ClaudeResult:
+        """Send one request, retrying on a fresh connection if a pooled one was closed."""
+        pool = self._pool_for_loop()
+        head = (
+            f"POST {self.base_path}{MESSAGES_PATH} HTTP/1.1\r\n"
+            f"Host: {self.origin.host_header}\r\n"
+            + "".join(f"{name}: {value}\r\n" for name, value in self.build_headers(len(body)).items())
+            + "\r\n"
+        ).encode("latin-1")
+        while True:
+            reader, writer, reused = await pool.acquire(self.origin)
+            reusable = False
+            collector = None
+            try:
+                try:
+                    writer.write(head + body)
+                    await writer.drain()
+                    status, headers = await _read_head(reader)
+                except STALE_ERRORS:
+                    if reused:
+                        continue
+                    raise
+                collector = ResponseCollector(status, headers, self._transcript(task_id), on_usage)
+                async for chunk in _read_body(reader, headers):
+                    collector.feed(chunk)
+                reusable = headers.get("connection", "").lower() != "close" and (
+                    "content-length" in headers or "chunked" in headers.get("transfer-encoding", "")
+                )
+            finally:
+                if collector is not None:
+                    collector.close()
+                pool.release(self.origin, reader, writer, reusable)
+            return collector.result()
+
+    def _pool_for_loop(self) -> AsyncConnectionPool:
+        """Get the connection pool of the running event loop."""
+        loop = asyncio.get_running_loop()
+        if loop not in self._async_pools:
+            for old in [old for old in self._async_pools if old.is_closed()]:
+                del self._async_pools[old]
+            self._async_pools[loop] = AsyncConnectionPool(
+                self.pool.max_idle, self.pool.max_per_host, self.pool.ssl_context
+            )
+        return self._async_pools[loop]
+
+    def _transcript(self, task_id: str) -> Optional[Path]:
+        """Get the transcript file of a streamed task."""
+        if self.transcript_dir is None or not task_id or not self.streaming:
+            return None
+        return transcript_path(self.transcript_dir, task_id)
+
+    def _missing_key_result(self) -> ClaudeResult:
+        """Build the result of a run without an API key."""
+        result = self.error_result("No API key: set the environment variable named by api_key_env")
+        result.error_class = PERMANENT
+        return result
+
+    def check_available(self) -> bool:
+        """Check that the API accepts the key.
+
+        Returns:
+            True if listing models succeeds
+        """
+        if not self.api_key:
+            return False
+        try:
+            connection, _reused = self.pool.acquire(self.origin, 10)
+        except (OSError, TimeoutError):
+            return False
+        reusable = False
+        try:
+            connection.request("GET", self.base_path + MODELS_PATH, headers=self.build_headers(0))
+            response = connection.getresponse()
+            response.read()
+            reusable = not response.will_close
+            return response.status == 200
+        except (OSError, http.client.HTTPException):
+            return False
+        finally:
+            self.pool.release(self.origin, connection, reusable)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.pool.close()
+        for pool in self._async_pools.values():
+            pool.close()
+        self._async_pools.clear()
+
+
+async def _read_head(reader: asyncio.StreamReader) -> tuple[int, dict[str, str]]:
+    """Read the status line and headers of an HTTP/1.1 response."""
+    line = await reader.readline()
+    if not line:
+        raise http.client.RemoteDisconnected("Remote end closed connection without response")
+    parts = line.decode("latin-1").split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        raise ValueError(f"Invalid status line: {line[:100]!r}")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return int(parts[1]), headers
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: dict[str, str]) -> AsyncIterator[bytes]:
+    """Yield the body of an HTTP/1.1 response as it arrives."""
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass  # trailers
+                return
+            yield await reader.readexactly(size)
+            await reader.readexactly(2)
+    elif "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining > 0:
+            chunk = await reader.read(min(READ_CHUNK, remaining))
+            if not chunk:
+                raise asyncio.IncompleteReadError(b"", remaining)
+            remaining -= len(chunk)
+            yield chunk
+    else:
+        while chunk := await reader.read(READ_CHUNK):
+            yield chunk
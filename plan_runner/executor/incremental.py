@@ -0,0 +1,39 @@
+"""Select the tasks an incremental run has to execute again."""
+
+from ..models.state import ExecutionState, TaskStatus
+from ..state.fingerprint import stale_reason
+from .scheduler import TaskGraph
+
+
+def find_stale(graph: TaskGraph, state: ExecutionState, working_dir: str) -> tuple[dict[str, str], set[str]]:
+    """Compare completed tasks against their recorded fingerprints.
+
+    A completed task is stale if its prompt or required files changed or
+    one of its outputs is missing. Every task downstream of a stale task,
+    or of a task that has not completed and will run anyway, is stale too.
+
+    Args:
+        graph: Graph of all tasks in the plan
+        state: Loaded execution state
+        working_dir: Directory relative paths are resolved against
+
+    Returns:
+        Tuple of (task ID -> reason for tasks that changed themselves,
+        completed task IDs invalidated downstream of those or of tasks
+        that will run anyway)
+    """
+    changed: dict[str, str] = {}
+    will_run: list[str] = []
+    for task_id, task in graph.tasks.items():
+        if task_id not in state.tasks or state.tasks.status_of(task_id) != TaskStatus.COMPLETED:
+            will_run.append(task_id)
+            continue
+        reason = stale_reason(task, task.get_prompt(), state.tasks[task_id].fingerprint, working_dir)
+        if reason is not None:
+            changed[task_id] = reason
+
+    invalidated = {
+        task_id for task_id in graph.downstream([*changed, *will_run])
+        if task_id not in changed and state.tasks.status_of(task_id) == TaskStatus.COMPLETED
+    }
+    return changed, invalidated
@@ -1,15 +1,29 @@
 """Main orchestrator for plan execution."""
 
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 from ..models.plan import Plan, Phase, Task, TaskTemplate
 from ..models.config import PlanConfig
 from ..state.state_manager import StateManager
+from ..state.backend import default_state_path
+from ..state.history import HistoryStore, DurationPredictor
+from ..state.result_cache import ResultCache
 from ..template.engine import TemplateEngine
 from ..template.context import TemplateContext
 from ..data.data_loader import DataLoader
-from .phase_executor import PhaseExecutor
+from ..metrics.exporter import start_exporters
+from .scheduler import TaskGraph, TaskScheduler, EXECUTION_MODES, ENGINES
+from .async_engine import AsyncTaskScheduler
+from .hedging import hedgeable
+from .incremental import find_stale
+from .rate_limit import RateLimiter
+from .runner import RUNNERS
+from .telemetry import RunMetrics
+from .progress import format_duration
+
+# Changed tasks listed individually by an incremental run
+MAX_LISTED_CHANGES = 20
 
 
 class PlanExecutor:
@@ -17,8 +31,10 @@ class PlanExecutor:
 
     Provides:
     - Task generation from templates
-    - Phase dependency ordering
+    - Pipelined task-level scheduling (or phase-by-phase in barrier mode)
     - Resume capability
+    - Incremental runs that only redo tasks whose inputs changed
+    - Live metrics on an OpenMetrics endpoint and/or textfile
     - Dry run mode
     """
 
@@ -35,6 +51,15 @@ class PlanExecutor:
             state_file: Path to state file (default: output_dir/state.json)
             dry_run: If True, only parse and validate without executing
         """
+        if plan.config.execution not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode: {plan.config.execution}")
+        if plan.config.engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {plan.config.engine}")
+        if plan.config.runner not in RUNNERS:
+            raise ValueError(f"Unknown runner: {plan.config.runner}")
+        if plan.config.max_failures < 0:
+            raise ValueError(f"max_failures must not be negative, got {plan.config.max_failures}")
+
         self.plan = plan
         self.dry_run = dry_run
 
@@ -42,12 +67,42 @@ class PlanExecutor:
         if state_file:
             self.state_file = Path(state_file)
         else:
-            self.state_file = Path(plan.config.output_dir) / plan.config.state_file
+            self.state_file = default_state_path(
+                Path(plan.config.output_dir) / plan.config.state_file,
+                plan.config.state_backend,
+            )
+
+        # Live telemetry for scrapers or the node exporter's textfile collector
+        self.metrics: Optional[RunMetrics] = None
+        if plan.config.metrics_port or plan.config.metrics_textfile:
+            self.metrics = RunMetrics(plan.config)
 
         # Initialize components
         self.template_engine = TemplateEngine()
         self.data_loader = DataLoader(Path(plan.config.working_dir))
-        self.state_manager = StateManager(self.state_file)
+        self.state_manager = StateManager(
+            self.state_file,
+            snapshot_interval=plan.config.state_snapshot_interval,
+            flush_interval=plan.config.state_flush_interval,
+            flush_events=plan.config.state_flush_events,
+            durability=plan.config.state_durability,
+            backend=plan.config.state_backend,
+            on_flush=self.metrics.state_flushed if self.metrics is not None else None,
+        )
+
+        # Durations of earlier runs, for priorities and ETA
+        self.history: Optional[HistoryStore] = None
+        if plan.config.history_file:
+            self.history = HistoryStore(Path(plan.config.output_dir) / plan.config.history_file)
+
+        # Outputs of identical earlier tasks
+        self.cache: Optional[ResultCache] = None
+        if plan.config.cache:
+            self.cache = ResultCache(
+                Path(plan.config.output_dir) / plan.config.cache_dir,
+                max_bytes=plan.config.cache_max_mb * 1024 * 1024,
+                max_age=plan.config.cache_max_age_days * 86400,
+            )
 
         # Generate all tasks from templates
         self.tasks: dict[str, Task] = {}
@@ -58,6 +113,7 @@ class PlanExecutor:
         resume: bool = False,
         phase_filter: Optional[str] = None,
         workers_override: Optional[int] = None,
+        incremental: bool = False,
     ) -> bool:
         """Execute the plan.
 
@@ -65,6 +121,9 @@ class PlanExecutor:
             resume: Whether to resume from previous state
             phase_filter: If set, only execute this phase
             workers_override: Override worker count from config
+            incremental: Resume, but first reset completed tasks whose
+                prompt or required files changed or whose outputs are
+                missing, along with everything downstream of them
 
         Returns:
             True if all tasks succeeded
@@ -73,6 +132,8 @@ class PlanExecutor:
         print(f"# Plan: {self.plan.name}")
         print(f"# Dry run: {self.dry_run}")
         print(f"# Resume: {resume}")
+        if incremental:
+            print("# Incremental: True")
         print(f"{'#'*60}")
 
         # Apply workers override
@@ -96,36 +157,89 @@ class PlanExecutor:
 
         total_tasks = sum(len(tasks) for tasks in self.phase_tasks.values())
         print(f"Total tasks generated: {total_tasks}")
+        if self.plan.config.hedge and not any(hedgeable(task) for task in self.tasks.values()):
+            print(
+                "Warning: hedging is on, but no task can be hedged: a template needs "
+                "'hedge: true' and outputs relative to the working directory"
+            )
 
         if self.dry_run:
             self._print_dry_run_summary()
             return True
 
         # Load or initialize state
-        if resume and self.state_file.exists():
+        if (resume or incremental) and self.state_manager.has_saved_state():
             print("\nResuming from previous state...")
             self.state_manager.load()
+            if incremental:
+                self._invalidate_stale()
+            resume = True
         else:
             print("\nInitializing fresh state...")
             all_tasks = [task for tasks in self.phase_tasks.values() for task in tasks]
             self.state_manager.initialize(self.plan, all_tasks)
 
-        # Get phase execution order
-        ordered_phases = self.plan.get_phase_order()
+        exporters = start_exporters(self.plan.config, self.metrics.registry) if self.metrics is not None else []
+        try:
+            # Get phase execution order
+            ordered_phases = self.plan.get_phase_order()
+
+            # Filter to single phase if requested
+            if phase_filter:
+                ordered_phases = [p for p in ordered_phases if p.name == phase_filter]
+                if not ordered_phases:
+                    print(f"Error: Phase '{phase_filter}' not found")
+                    return False
+
+            # A single phase has no cross-phase work to overlap
+            if self.plan.config.execution == "pipeline" and not phase_filter:
+                scheduler = self._create_scheduler()
+                all_succeeded, total_completed, total_failed = scheduler.execute(
+                    ordered_phases, self.phase_tasks, resume
+                )
+            else:
+                all_succeeded, total_completed, total_failed = self._execute_phases(
+                    ordered_phases, resume
+                )
 
-        # Filter to single phase if requested
-        if phase_filter:
-            ordered_phases = [p for p in ordered_phases if p.name == phase_filter]
-            if not ordered_phases:
-                print(f"Error: Phase '{phase_filter}' not found")
-                return False
+            # Mark execution completed
+            self.state_manager.execution_completed()
+        finally:
+            # Drain queued state writes, also on Ctrl-C
+            self.state_manager.close()
+            for exporter in exporters:
+                exporter.stop()
+            if self.history is not None:
+                self.history.close()
+            if self.cache is not None:
+                removed, freed = self.cache.prune()
+                if removed:
+                    print(f"\nCache: evicted {removed} results ({freed / 2**20:.1f} MB)")
 
-        # Create phase executor
-        phase_executor = PhaseExecutor(
-            config=self.plan.config,
-            state_manager=self.state_manager,
-        )
+        # Print final summary
+        print(f"\n{'='*60}")
+        print("EXECUTION SUMMARY")
+        print(f"{'='*60}")
+        print(f"Total tasks: {total_tasks}")
+        print(f"Completed: {total_completed}")
+        print(f"Failed: {total_failed}")
+        print(f"Success: {all_succeeded}")
+
+        if total_failed > 0:
+            print(f"\nTo retry failed tasks, run with --resume")
+
+        return all_succeeded
+
+    def _execute_phases(self, ordered_phases: list[Phase], resume: bool) -> tuple[bool, int, int]:
+        """Execute phases one after another (barrier mode).
+
+        Args:
+            ordered_phases: Phases to execute, already ordered
+            resume: Whether to skip completed tasks
 
+        Returns:
+            Tuple of (all_succeeded, completed_count, failed_count)
+        """
         # Execute phases in order
         all_succeeded = True
         total_completed = 0
@@ -141,41 +255,56 @@ class PlanExecutor:
             # Get tasks for this phase
             tasks = self.phase_tasks.get(phase.name, [])
 
-            # Execute phase
-            success, completed, failed = phase_executor.execute(
-                phase=phase,
-                tasks=tasks,
-                resume=resume,
-            )
+            # Execute phase as a single-phase graph
+            scheduler = self._create_scheduler()
+            success, completed, failed = scheduler.execute([phase], {phase.name: tasks}, resume)
 
             total_completed += completed
             total_failed += failed
 
             if not success:
                 all_succeeded = False
-                # Continue with other phases or stop?
-                # For now, continue to allow partial progress
-
-        # Mark execution completed
-        self.state_manager.execution_completed()
-
-        # Print final summary
-        print(f"\n{'='*60}")
-        print("EXECUTION SUMMARY")
-        print(f"{'='*60}")
-        print(f"Total tasks: {total_tasks}")
-        print(f"Completed: {total_completed}")
-        print(f"Failed: {total_failed}")
-        print(f"Success: {all_succeeded}")
-
-        if total_failed > 0:
-            print(f"\nTo retry failed tasks, run with --resume")
-
-        return all_succeeded
+                if scheduler.aborted is not None:
+                    break  # max_failures reached: later phases do not run either
+                # Otherwise continue with other phases to allow partial progress
+
+        return all_succeeded, total_completed, total_failed
+
+    def _invalidate_stale(self) -> None:
+        """Reset completed tasks that an incremental run has to redo."""
+        graph = TaskGraph(self.plan.get_phase_order(), self.phase_tasks)
+        changed, invalidated = find_stale(graph, self.state_manager.state, self.plan.config.working_dir)
+
+        print(f"\nIncremental: {len(changed)} tasks changed, {len(invalidated)} dependents invalidated")
+        for task_id, reason in list(changed.items())[:MAX_LISTED_CHANGES]:
+            print(f"  [{task_id}] {reason}")
+        if len(changed) > MAX_LISTED_CHANGES:
+            print(f"  ... and {len(changed) - MAX_LISTED_CHANGES} more")
+
+        for task_id in [*changed, *invalidated]:
+            self.state_manager.task_reset(task_id)
+        self.state_manager.record_event("incremental", changed=len(changed), invalidated=len(invalidated))
+
+    def _create_scheduler(self) -> TaskScheduler:
+        """Create a task scheduler for the configured engine."""
+        scheduler_class = AsyncTaskScheduler if self.plan.config.engine == "asyncio" else TaskScheduler
+        return scheduler_class(
+            config=self.plan.config,
+            state_manager=self.state_manager,
+            history=self.history,
+            cache=self.cache,
+            metrics=self.metrics,
+        )
 
     def _generate_all_tasks(self, context: TemplateContext) -> None:
         """Generate all tasks from templates.
 
+        Tasks are expanded one data item at a time and their prompts are
+        rendered only when the task is dispatched, so memory grows with the
+        number of tasks but not with the size of their prompts. Every task
+        is generated before the first dispatch: the task graph, critical-path
+        ranks and resume state need all task IDs and dependencies.
+
         Args:
             context: Template context for variable substitution
         """
@@ -183,34 +312,30 @@ class PlanExecutor:
             self.phase_tasks[phase.name] = []
 
             for template in phase.task_templates:
-                tasks = self._generate_tasks_from_template(
+                for task in self._iter_tasks_from_template(
                     template=template,
                     phase_name=phase.name,
                     context=context,
-                )
-                self.phase_tasks[phase.name].extend(tasks)
-
-                for task in tasks:
+                ):
+                    self.phase_tasks[phase.name].append(task)
                     self.tasks[task.task_id] = task
 
-    def _generate_tasks_from_template(
+    def _iter_tasks_from_template(
         self,
         template: TaskTemplate,
         phase_name: str,
         context: TemplateContext,
-    ) -> list[Task]:
-        """Generate tasks from a template.
+    ) -> Iterator[Task]:
+        """Generate tasks from a template, one data item at a time.
 
         Args:
             template: Task template definition
             phase_name: Name of the phase
             context: Template context
 
-        Returns:
-            List of generated tasks
+        Yields:
+            Generated tasks
         """
-        tasks = []
-
         if template.foreach:
             # Extract data source reference from ${data.sourcename}
             data_ref = template.foreach
@@ -223,24 +348,20 @@ class PlanExecutor:
                 items = [items] if items else []
 
             for item in items:
-                task = self._create_task(
+                yield self._create_task(
                     template=template,
                     phase_name=phase_name,
                     context=context.with_item(item),
                     item=item,
                 )
-                tasks.append(task)
         else:
             # Single task, no iteration
-            task = self._create_task(
+            yield self._create_task(
                 template=template,
                 phase_name=phase_name,
                 context=context,
                 item=None,
             )
-            tasks.append(task)
-
-        return tasks
 
     def _create_task(
         self,
@@ -272,10 +393,14 @@ class PlanExecutor:
 
         # Resolve requirements (dependencies on other tasks)
         requirements = {}
+        dependencies = []
         for req in template.requirements:
             dep_task_id = self.template_engine.render(req.task_id_template, context)
-            # Get output path from the dependency
+            dependencies.append(dep_task_id)
+            # Get output path from the dependency, or the path it will write to
             dep_outputs = self.state_manager.get_completed_task_outputs(dep_task_id)
+            if not dep_outputs and dep_task_id in self.tasks:
+                dep_outputs = self.tasks[dep_task_id].outputs
             if dep_outputs and req.output_name in dep_outputs:
                 requirements[req.alias] = dep_outputs[req.output_name]
             else:
@@ -286,16 +411,24 @@ class PlanExecutor:
         # Update context with requirements
         context = context.with_requires(requirements)
 
-        # Render prompt
-        prompt = self.template_engine.render(template.prompt_template, context)
+        # Render the prompt at dispatch; until then its length is estimated
+        # as the template plus the item it is filled with
+        def render() -> str:
+            return self.template_engine.render(template.prompt_template, context)
 
         return Task(
             task_id=task_id,
             phase_name=phase_name,
-            prompt=prompt,
+            prompt="",
+            render=render,
+            prompt_chars=len(template.prompt_template) + (len(str(item)) if item else 0),
             outputs=outputs,
             requirements=requirements,
             item_data=item,
+            dependencies=dependencies,
+            priority=template.priority,
+            template_name=template.name,
+            hedge=template.hedge,
         )
 
     def _print_dry_run_summary(self) -> None:
@@ -303,6 +436,43 @@ class PlanExecutor:
         print(f"\n{'='*60}")
         print("DRY RUN SUMMARY")
         print(f"{'='*60}")
+        print(f"Scheduling: {self.plan.config.execution} ({self.plan.config.engine} engine)")
+
+        # Render every prompt once to validate the templates, keeping only the size
+        prompt_chars = 0
+        for tasks in self.phase_tasks.values():
+            for task in tasks:
+                prompt_chars += len(task.get_prompt())
+        print(f"Prompts: {prompt_chars:,} characters")
+
+        limiter = RateLimiter.from_config(self.plan.config)
+        if limiter is not None:
+            model = self.plan.config.model
+            budget = limiter.budget(model)
+            limits = [
+                f"{int(bucket.capacity):,} {unit}/min"
+                for bucket, unit in ((budget.requests, "requests"), (budget.tokens, "tokens"))
+                if bucket is not None
+            ]
+            prompt_tokens = sum(
+                limiter.prompt_tokens(task.prompt_length())
+                for tasks in self.phase_tasks.values()
+                for task in tasks
+            )
+            print(f"Rate limits ({model}): {', '.join(limits) or 'none'}")
+            print(f"Estimated prompt tokens: {prompt_tokens:,}")
+
+        if self.history is not None and self.history.path.exists():
+            predictor = DurationPredictor(self.history.samples(self.plan.config.name))
+            self.history.close()
+            if predictor:
+                predicted = [predictor.predict(task) for tasks in self.phase_tasks.values() for task in tasks]
+                work = sum(value for value in predicted if value is not None)
+                print(
+                    f"Expected task time: {format_duration(work)} total, "
+                    f"~{format_duration(work / max(1, self.plan.config.workers))} on "
+                    f"{self.plan.config.workers} workers ({predictor.count} past samples)"
+                )
 
         for phase in self.plan.get_phase_order():
             tasks = self.phase_tasks.get(phase.name, [])
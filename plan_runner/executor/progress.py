@@ -0,0 +1,114 @@
+"""Live progress, throughput and ETA reporting."""
+
+import time
+from typing import Optional
+
+
+def format_duration(seconds: float) -> str:
+    """Format seconds as e.g. ``1h05m``, ``4m30s`` or ``12s``."""
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class ProgressTracker:
+    """Track settled tasks and estimate the remaining time.
+
+    With expected durations (from history) the ETA is the remaining
+    expected work spread over the workers, corrected by how actual
+    durations in this run compare to the expected ones. Without them it is
+    the remaining task count divided by the observed throughput.
+    """
+
+    def __init__(self, expected: dict[str, Optional[float]], interval: float = 10.0):
+        """Initialize tracker.
+
+        Args:
+            expected: Task ID -> expected seconds (None if unknown)
+            interval: Minimum seconds between progress lines
+        """
+        self.expected = expected
+        self.interval = interval
+        self.total = len(expected)
+        self.settled = 0
+        self._remaining_expected = sum(value or 0.0 for value in expected.values())
+        self._remaining_unknown = sum(1 for value in expected.values() if value is None)
+        self._known = self._remaining_unknown < self.total
+        self._actual_sum = 0.0
+        self._expected_sum = 0.0
+        self._durations_sum = 0.0
+        self._durations_count = 0
+        self._started = time.monotonic()
+        self._last_report = self._started
+
+    def task_settled(self, task_id: str, duration: Optional[float] = None) -> None:
+        """Record a settled task.
+
+        Args:
+            task_id: Task that settled
+            duration: Seconds its final attempt took (None if it did not run)
+        """
+        self.settled += 1
+        expected = self.expected.get(task_id)
+        if expected is not None:
+            self._remaining_expected -= expected
+        elif task_id in self.expected:
+            self._remaining_unknown -= 1
+        if duration is not None:
+            self._durations_sum += duration
+            self._durations_count += 1
+            if expected:
+                self._actual_sum += duration
+                self._expected_sum += expected
+
+    def eta(self, workers: int) -> Optional[float]:
+        """Estimated seconds until all tasks have settled.
+
+        Args:
+            workers: Current number of parallel workers
+
+        Returns:
+            Seconds, or None before there is anything to estimate from
+        """
+        remaining = self.total - self.settled
+        if remaining <= 0:
+            return 0.0
+        parallel = max(1, min(workers, remaining))
+        if self._known:
+            correction = self._actual_sum / self._expected_sum if self._expected_sum else 1.0
+            mean = self._durations_sum / self._durations_count if self._durations_count else 0.0
+            work = max(self._remaining_expected, 0.0) * correction + self._remaining_unknown * mean
+            return work / parallel
+        elapsed = time.monotonic() - self._started
+        if not self.settled or not elapsed:
+            return None
+        return remaining / (self.settled / elapsed)
+
+    def throughput(self) -> float:
+        """Settled tasks per minute so far."""
+        elapsed = time.monotonic() - self._started
+        return self.settled / elapsed * 60 if elapsed else 0.0
+
+    def report(self, workers: int, force: bool = False) -> Optional[str]:
+        """Get a progress line if the reporting interval has passed.
+
+        Args:
+            workers: Current number of parallel workers
+            force: Report regardless of the interval
+
+        Returns:
+            Progress line, or None if it is not time to report yet
+        """
+        now = time.monotonic()
+        if not force and now - self._last_report < self.interval:
+            return None
+        self._last_report = now
+        eta = self.eta(workers)
+        eta_text = format_duration(eta) if eta is not None else "unknown"
+        return (
+            f"Progress: {self.settled}/{self.total} tasks, "
+            f"{self.throughput():.1f} tasks/min, ETA {eta_text}"
+        )
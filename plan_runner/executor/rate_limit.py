@@ -0,0 +1,197 @@
+"""Client-side request and token budgets per model."""
+
+import time
+from typing import Optional
+
+from ..models.config import PlanConfig
+
+
+class TokenBucket:
+    """Bucket refilled continuously at ``per_minute / 60`` units per second.
+
+    The level may go negative when actual usage exceeds what was reserved;
+    dispatch then waits until the debt has been refilled.
+    """
+
+    def __init__(self, per_minute: float):
+        """Initialize a full bucket.
+
+        Args:
+            per_minute: Units available per minute, also the burst capacity
+        """
+        if per_minute <= 0:
+            raise ValueError(f"Rate limit must be positive, got {per_minute}")
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, cost: float) -> float:
+        """Seconds until ``cost`` units can be taken (0 if available now).
+
+        Costs above the capacity only need a full bucket, so an oversized
+        request is delayed rather than blocked forever.
+        """
+        self._refill()
+        needed = min(cost, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        """Remove ``amount`` units (a negative amount returns units)."""
+        self._refill()
+        self.level = min(self.capacity, self.level - amount)
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the provider reported a rate limit."""
+        self._refill()
+        self.level = min(self.level, 0.0)
+
+
+class ModelBudget:
+    """Request and token buckets for one model."""
+
+    def __init__(self, requests_per_minute: Optional[int], tokens_per_minute: Optional[int]):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        # Actual tokens per estimated prompt token, learned from reported usage
+        self.scale = 1.0
+        self.observed = 0
+
+
+class RateLimiter:
+    """Hold dispatch before provider rate limits would be hit.
+
+    Each dispatch reserves one request and an estimate of its tokens. The
+    estimate starts from the rendered prompt length and is calibrated with
+    the usage reported by finished attempts, which also replaces the
+    reservation in the token bucket.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, tuple[Optional[int], Optional[int]]],
+        default: tuple[Optional[int], Optional[int]] = (None, None),
+        chars_per_token: float = 4.0,
+    ):
+        """Initialize rate limiter.
+
+        Args:
+            limits: Model name -> (requests_per_minute, tokens_per_minute)
+            default: Limits for models not listed in ``limits``
+            chars_per_token: Prompt characters per token for estimates
+        """
+        self.limits = limits
+        self.default = default
+        self.chars_per_token = chars_per_token
+        self._budgets: dict[str, ModelBudget] = {}
+
+    @classmethod
+    def from_config(cls, config: PlanConfig) -> Optional["RateLimiter"]:
+        """Create a limiter from config, or None if no limits are configured."""
+        # Per-model entries override the plan-wide limits key by key
+        default = (config.requests_per_minute, config.tokens_per_minute)
+        limits = {
+            model: (
+                values.get("requests_per_minute", default[0]),
+                values.get("tokens_per_minute", default[1]),
+            )
+            for model, values in config.rate_limits.items()
+        }
+        if not any(default) and not any(any(values) for values in limits.values()):
+            return None
+        return cls(limits, default, config.chars_per_token)
+
+    def budget(self, model: str) -> ModelBudget:
+        """Get (creating on first use) the budget of a model."""
+        budget = self._budgets.get(model)
+        if budget is None:
+            budget = ModelBudget(*self.limits.get(model, self.default))
+            self._budgets[model] = budget
+        return budget
+
+    def prompt_tokens(self, prompt_chars: int) -> int:
+        """Estimate the tokens of a prompt from its length in characters."""
+        return max(1, round(prompt_chars / self.chars_per_token))
+
+    def estimate(self, model: str, prompt_chars: int) -> int:
+        """Estimate total tokens (input and output) of a task attempt."""
+        return round(self.prompt_tokens(prompt_chars) * self.budget(model).scale)
+
+    def delay(self, model: str, tokens: int) -> tuple[float, Optional[str]]:
+        """Time until an attempt of ``tokens`` estimated tokens may start.
+
+        Returns:
+            Tuple of (seconds, name of the limiting budget or None)
+        """
+        budget = self.budget(model)
+        if budget.requests is not None:
+            wait = budget.requests.wait_time(1)
+            if wait > 0:
+                return wait, "requests"
+        if budget.tokens is not None:
+            wait = budget.tokens.wait_time(tokens)
+            if wait > 0:
+                return wait, "tokens"
+        return 0.0, None
+
+    def acquire(self, model: str, tokens: int) -> None:
+        """Reserve one request and ``tokens`` estimated tokens."""
+        budget = self.budget(model)
+        if budget.requests is not None:
+            budget.requests.take(1)
+        if budget.tokens is not None:
+            budget.tokens.take(tokens)
+
+    def refund(self, model: str, tokens: int) -> None:
+        """Return a reservation for an attempt that made no request."""
+        budget = self.budget(model)
+        if budget.requests is not None:
+            budget.requests.take(-1)
+        if budget.tokens is not None:
+            budget.tokens.take(-tokens)
+
+    def record_usage(
+        self,
+        model: str,
+        prompt_chars: int,
+        reserved: int,
+        input_tokens: Optional[int],
+        output_tokens: Optional[int],
+    ) -> None:
+        """Replace a reservation with the usage an attempt reported.
+
+        Attempts that report no usage keep their reservation.
+
+        Args:
+            model: Model the attempt ran on
+            prompt_chars: Prompt length of the task in characters
+            reserved: Tokens reserved at dispatch
+            input_tokens: Reported input tokens
+            output_tokens: Reported output tokens
+        """
+        if input_tokens is None and output_tokens is None:
+            return
+        actual = (input_tokens or 0) + (output_tokens or 0)
+        budget = self.budget(model)
+        if budget.tokens is not None:
+            budget.tokens.take(actual - reserved)
+
+        ratio = actual / self.prompt_tokens(prompt_chars)
+        budget.observed += 1
+        # Plain mean for the first few attempts, then a moving average
+        weight = max(1 / budget.observed, 0.2)
+        budget.scale += weight * (ratio - budget.scale)
+
+    def penalize(self, model: str) -> None:
+        """Empty a model's buckets after the provider rejected a request."""
+        budget = self.budget(model)
+        for bucket in (budget.requests, budget.tokens):
+            if bucket is not None:
+                bucket.drain()
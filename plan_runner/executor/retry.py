@@ -0,0 +1,94 @@
+"""Retry backoff and the delay queue used by the schedulers."""
+
+import heapq
+import itertools
+import random
+import time
+from typing import Optional
+
+
+def backoff_delay(base_delay: float, attempt: int, jitter: float = 0.0) -> float:
+    """Exponential backoff with multiplicative jitter.
+
+    Args:
+        base_delay: Delay after the first failed attempt, in seconds
+        attempt: Number of the attempt that just failed (1-based)
+        jitter: Spread as a fraction of the delay (0.5 means +/-50%)
+
+    Returns:
+        Seconds to wait before the next attempt
+    """
+    delay = base_delay * (2 ** (attempt - 1))
+    if jitter:
+        delay *= 1 + random.uniform(-jitter, jitter)
+    return max(delay, 0.0)
+
+
+class RetryQueue:
+    """Min-heap of task retries ordered by the time they become due.
+
+    Failed attempts are parked here instead of sleeping in a worker, so the
+    worker slot goes straight to the next ready task.
+    """
+
+    def __init__(self):
+        """Initialize an empty queue."""
+        self._heap: list[tuple[float, int, str]] = []
+        self._order = itertools.count()
+
+    def push(self, task_id: str, delay: float) -> None:
+        """Schedule a task to become ready after ``delay`` seconds."""
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._order), task_id))
+
+    def pop_due(self) -> list[str]:
+        """Remove and return tasks whose delay has elapsed, earliest first."""
+        now = time.monotonic()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[2])
+        return due
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the next retry is due (None if the queue is empty)."""
+        if not self._heap:
+            return None
+        return max(self._heap[0][0] - time.monotonic(), 0.0)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class RetryBudget:
+    """Run-wide cap on retries as a share of all attempts.
+
+    Per-task retry limits multiply when many tasks fail at once; the budget
+    grants a retry only while retries stay below ``minimum`` plus ``ratio``
+    of all attempts dispatched so far.
+    """
+
+    def __init__(self, ratio: float, minimum: int = 0):
+        """Initialize budget.
+
+        Args:
+            ratio: Largest share of attempts that may be retries, in [0, 1)
+            minimum: Retries granted regardless of the ratio
+        """
+        if not 0 <= ratio < 1:
+            raise ValueError(f"retry_budget must be at least 0 and below 1, got {ratio}")
+        self.ratio = ratio
+        self.minimum = minimum
+        self.first_attempts = 0
+        self.retries = 0
+        self.denied = 0
+
+    def attempted(self) -> None:
+        """Count a first attempt of a task."""
+        self.first_attempts += 1
+
+    def acquire(self) -> bool:
+        """Grant a retry if the budget allows it, counting it as an attempt."""
+        if self.retries >= self.minimum + self.ratio * (self.first_attempts + self.retries):
+            self.denied += 1
+            return False
+        self.retries += 1
+        return True
@@ -0,0 +1,186 @@
+"""Common interface of the backends that execute task prompts."""
+
+import copy
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from ..models.config import PlanConfig
+from .cancellation import CancelToken
+from .failures import classify
+
+OUTPUT_FORMATS = ("json", "stream-json")
+
+RUNNERS = ("cli", "http", "fake")  # fake: in-process fake CLI for load tests
+
+# Bytes read from a pipe or socket per call when streaming
+READ_CHUNK = 65536
+
+
+@dataclass
+class ClaudeResult:
+    """Result from a Claude CLI execution."""
+
+    success: bool
+    exit_code: int
+    stdout: str
+    stderr: str
+    error_message: Optional[str] = None
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    transcript_path: Optional[str] = None  # raw stream-json output, if captured
+    cached: bool = False  # restored from the result cache instead of running
+    cancelled: bool = False  # killed through a CancelToken
+    error_class: Optional[str] = None  # kind of failure (see failures.classify)
+    retry_after: Optional[float] = None  # seconds the provider asked to wait, if it did
+
+
+class TaskRunner:
+    """Base class for task runners.
+
+    A runner executes one prompt per call and reports the outcome as a
+    ClaudeResult. ``run`` blocks the calling thread (threads engine) and
+    may be interrupted through a CancelToken; ``run_async`` suspends a
+    coroutine (asyncio engine) and is interrupted by cancelling it. Both
+    give up after ``timeout`` seconds and report token usage, as running
+    totals through ``on_usage`` when streaming.
+    """
+
+    name = ""
+    writes_outputs = True  # False: the response text is saved to the task's output
+
+    def __init__(
+        self,
+        working_dir: str = "./",
+        model: str = "sonnet",
+        timeout: int = 3600,
+        output_format: str = "json",
+        transcript_dir: Optional[Path] = None,
+        tail_bytes: int = 65536,
+    ):
+        """Initialize runner.
+
+        Args:
+            working_dir: Working directory of the task
+            model: Model to use (sonnet, opus, haiku)
+            timeout: Timeout in seconds
+            output_format: "json" or "stream-json"
+            transcript_dir: Directory for stream-json transcripts (none if unset)
+            tail_bytes: Bytes of output kept in memory when streaming
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+
+        self.working_dir = Path(working_dir)
+        self.model = model
+        self.timeout = timeout
+        self.output_format = output_format
+        self.transcript_dir = Path(transcript_dir) if transcript_dir else None
+        self.tail_bytes = tail_bytes
+
+    def in_directory(self, working_dir: Path) -> "TaskRunner":
+        """Get a copy of this runner that runs tasks in another directory."""
+        runner = copy.copy(self)
+        runner.working_dir = Path(working_dir)
+        return runner
+
+    @property
+    def streaming(self) -> bool:
+        """Whether output is parsed incrementally."""
+        return self.output_format == "stream-json"
+
+    def run(
+        self,
+        prompt: str,
+        task_id: str = "",
+        on_usage: Optional[Callable[[int, int], None]] = None,
+        cancel: Optional[CancelToken] = None,
+    ) -> ClaudeResult:
+        """Execute a prompt, blocking until it finishes.
+
+        Args:
+            prompt: The prompt to execute
+            task_id: Optional task ID for logging and the transcript name
+            on_usage: Called with running token totals (streaming mode only)
+            cancel: Token through which another thread may interrupt the run
+
+        Returns:
+            ClaudeResult with execution outcome
+        """
+        raise NotImplementedError
+
+    async def run_async(
+        self,
+        prompt: str,
+        task_id: str = "",
+        on_usage: Optional[Callable[[int, int], None]] = None,
+    ) -> ClaudeResult:
+        """Execute a prompt without blocking the event loop.
+
+        Args:
+            prompt: The prompt to execute
+            task_id: Optional task ID for logging and the transcript name
+            on_usage: Called with running token totals (streaming mode only)
+
+        Returns:
+            ClaudeResult with execution outcome
+        """
+        raise NotImplementedError
+
+    def check_available(self) -> bool:
+        """Check whether the backend can run tasks."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release resources kept between runs, e.g. pooled connections."""
+
+    def error_result(self, message: str) -> ClaudeResult:
+        """Build a result for a run that did not produce an exit code."""
+        return self._classified(ClaudeResult(
+            success=False,
+            exit_code=-1,
+            stdout="",
+            stderr="",
+            error_message=message,
+        ))
+
+    def timeout_result(self) -> ClaudeResult:
+        """Build a result for a run that exceeded the timeout."""
+        return self.error_result(f"Task timed out after {self.timeout} seconds")
+
+    def cancelled_result(self) -> ClaudeResult:
+        """Build a result for a run that was cancelled."""
+        result = self.error_result("Cancelled")
+        result.cancelled = True
+        result.error_class = None
+        return result
+
+    @staticmethod
+    def _classified(result: ClaudeResult) -> ClaudeResult:
+        """Fill in the error class and advertised retry delay of a failed result."""
+        if not result.success:
+            result.error_class, result.retry_after = classify(
+                result.exit_code, result.stdout, result.stderr, result.error_message
+            )
+        return result
+
+
+def create_runner(config: PlanConfig) -> TaskRunner:
+    """Create the task runner selected by ``config.runner``.
+
+    Args:
+        config: Plan configuration
+
+    Returns:
+        TaskRunner instance
+    """
+    if config.runner == "cli":
+        from .claude_runner import ClaudeRunner
+        return ClaudeRunner.from_config(config)
+    if config.runner == "http":
+        from .http_runner import HttpRunner
+        return HttpRunner.from_config(config)
+    if config.runner == "fake":
+        from ..bench.fake_runner import FakeRunner
+        return FakeRunner.from_config(config)
+    raise ValueError(f"Unknown runner: {config.runner}")
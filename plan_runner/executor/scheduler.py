@@ -0,0 +1,1101 @@
+"""Task-level dependency scheduling across phases."""
+
+import heapq
+import itertools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from ..models.plan import Phase, Task, ExecutionMode
+from ..models.config import PlanConfig
+from ..state.state_manager import StateManager
+from ..state.history import HistoryStore, DurationPredictor, TaskSample
+from ..state.result_cache import ResultCache
+from .breaker import CLOSED, OPEN, CircuitBreaker, failure_signature
+from .cancellation import CancelToken
+from .claude_runner import ClaudeResult
+from .concurrency import ConcurrencyController, congestion_signal
+from .failures import policy_for, retry_policies
+from .hedging import HEDGE_DIR, StragglerDetector, adopt_outputs, hedgeable, remove_workspace
+from .progress import ProgressTracker
+from .rate_limit import RateLimiter
+from .task_executor import TaskExecutor, fingerprint_completed
+from .telemetry import RunMetrics
+from .retry import RetryBudget, RetryQueue
+
+
+EXECUTION_MODES = ("pipeline", "barrier")
+ENGINES = ("threads", "asyncio")
+
+
+class TaskGraph:
+    """Dependency graph between individual tasks.
+
+    Edges come from three places:
+    - ``requires``: a task waits for each task it takes outputs from
+    - phase ``depends_on``: a task without ``requires`` waits for every task
+      of the phases its phase depends on
+    - sequential phases: each task waits for the previous task in the phase
+
+    Whole-phase dependencies are tracked with one counter per phase instead
+    of an edge per task pair, so building the graph is linear in the number
+    of tasks.
+
+    A task becomes ready once all of its dependencies have settled. If one
+    of its data dependencies (a required task or a depended-on phase) failed,
+    the task is skipped instead. Ordering edges within a sequential phase
+    only serialize execution and do not propagate failures, matching the
+    phase-barrier behaviour.
+
+    Each task also gets a critical-path rank: its expected duration plus the
+    largest rank among the tasks waiting on it, i.e. the longest chain of
+    expected work it gates.
+    """
+
+    def __init__(
+        self,
+        phases: list[Phase],
+        phase_tasks: dict[str, list[Task]],
+        duration: Optional[Callable[[Task], float]] = None,
+    ):
+        """Build the graph.
+
+        Args:
+            phases: Phases to schedule
+            phase_tasks: Generated tasks per phase name
+            duration: Expected duration of a task (default: estimate_duration)
+        """
+        self.tasks: dict[str, Task] = {}
+        self._waiting: dict[str, int] = {}
+        self._dependents: dict[str, list[str]] = {}
+        self._successor: dict[str, str] = {}
+        self._phase_dependents: dict[str, list[str]] = {}
+        self._phase_remaining: dict[str, int] = {}
+        self._phase_ok: dict[str, bool] = {}
+        self._doomed: set[str] = set()
+        self._settled: set[str] = set()
+
+        phases_by_name = {phase.name: phase for phase in phases}
+        for phase in phases:
+            tasks = phase_tasks.get(phase.name, [])
+            self._phase_remaining[phase.name] = len(tasks)
+            self._phase_ok[phase.name] = True
+            self._phase_dependents[phase.name] = []
+            for task in tasks:
+                self.tasks[task.task_id] = task
+                self._waiting[task.task_id] = 0
+
+        for phase in phases:
+            tasks = phase_tasks.get(phase.name, [])
+            upstream_phases = self._effective_dependencies(phase, phases_by_name, phase_tasks)
+
+            previous: Optional[Task] = None
+            for task in tasks:
+                dependencies = [d for d in task.dependencies if d in self.tasks and d != task.task_id]
+                if dependencies:
+                    for dep_id in dict.fromkeys(dependencies):
+                        self._dependents.setdefault(dep_id, []).append(task.task_id)
+                        self._waiting[task.task_id] += 1
+                else:
+                    for upstream in upstream_phases:
+                        self._phase_dependents[upstream].append(task.task_id)
+                        self._waiting[task.task_id] += 1
+
+                if phase.execution == ExecutionMode.SEQUENTIAL and previous is not None:
+                    self._successor[previous.task_id] = task.task_id
+                    self._waiting[task.task_id] += 1
+                previous = task
+
+        self.durations = {task_id: (duration or estimate_duration)(task) for task_id, task in self.tasks.items()}
+        self.ranks = self._critical_path_ranks()
+
+    def _critical_path_ranks(self) -> dict[str, float]:
+        """Compute the critical-path rank of every task.
+
+        Whole-phase edges go through one node per phase, so the pass stays
+        linear in the number of tasks and edges. Edges that close a cycle
+        (circular requirements) are ignored.
+
+        Returns:
+            Task ID -> expected duration of the longest chain it starts
+        """
+        task_ranks: dict[str, float] = {}
+        phase_ranks: dict[str, float] = {}
+        ranks = {"task": task_ranks, "phase": phase_ranks}
+        visiting: set[tuple[str, str]] = set()
+
+        def successors(node: tuple[str, str]) -> list[tuple[str, str]]:
+            kind, name = node
+            if kind == "phase":
+                return [("task", task_id) for task_id in self._phase_dependents[name]]
+            following = [("task", task_id) for task_id in self._dependents.get(name, ())]
+            if name in self._successor:
+                following.append(("task", self._successor[name]))
+            following.append(("phase", self.tasks[name].phase_name))
+            return following
+
+        for root in self.tasks:
+            if root in task_ranks:
+                continue
+            stack = [(("task", root), False)]
+            while stack:
+                node, expanded = stack.pop()
+                kind, name = node
+                if name in ranks[kind]:
+                    continue
+                if not expanded:
+                    visiting.add(node)
+                    stack.append((node, True))
+                    for child in successors(node):
+                        if child not in visiting and child[1] not in ranks[child[0]]:
+                            stack.append((child, False))
+                    continue
+                visiting.discard(node)
+                downstream = max(
+                    (ranks[child[0]].get(child[1], 0.0) for child in successors(node)),
+                    default=0.0,
+                )
+                ranks[kind][name] = downstream + (self.durations[name] if kind == "task" else 0.0)
+        return task_ranks
+
+    def priority(self, task_id: str) -> tuple[int, float, float]:
+        """Sort key for dispatch: template priority, critical-path rank,
+        then expected duration (longest processing time first), all
+        descending.
+        """
+        return (-self.tasks[task_id].priority, -self.ranks[task_id], -self.durations[task_id])
+
+    @staticmethod
+    def _effective_dependencies(
+        phase: Phase,
+        phases_by_name: dict[str, Phase],
+        phase_tasks: dict[str, list[Task]],
+    ) -> list[str]:
+        """Resolve phase dependencies, looking through phases without tasks.
+
+        Args:
+            phase: Phase whose dependencies to resolve
+            phases_by_name: Scheduled phases by name
+            phase_tasks: Generated tasks per phase name
+
+        Returns:
+            Names of depended-on phases that have tasks
+        """
+        resolved: list[str] = []
+        stack = list(reversed(phase.depends_on))
+        seen: set[str] = set()
+        while stack:
+            name = stack.pop()
+            if name in seen or name not in phases_by_name:
+                continue
+            seen.add(name)
+            if phase_tasks.get(name):
+                resolved.append(name)
+            else:
+                stack.extend(reversed(phases_by_name[name].depends_on))
+        return resolved
+
+    def initial_ready(self) -> list[str]:
+        """Get tasks with no dependencies, in generation order."""
+        return [task_id for task_id, count in self._waiting.items() if count == 0]
+
+    def empty_phases(self) -> list[str]:
+        """Get phases that have no tasks at all."""
+        return [name for name, count in self._phase_remaining.items() if count == 0]
+
+    def downstream(self, task_ids: Iterable[str]) -> set[str]:
+        """Get every task that transitively takes data from the given tasks.
+
+        Follows ``requires`` and phase ``depends_on`` edges; ordering edges
+        of sequential phases are not followed, as they carry no data.
+
+        Args:
+            task_ids: Tasks to start from
+
+        Returns:
+            Dependent task IDs (the given tasks only if reachable from others)
+        """
+        found: set[str] = set()
+        visited_phases: set[str] = set()
+        stack = [task_id for task_id in task_ids if task_id in self.tasks]
+        while stack:
+            task_id = stack.pop()
+            dependents = list(self._dependents.get(task_id, ()))
+            phase_name = self.tasks[task_id].phase_name
+            if phase_name not in visited_phases:
+                visited_phases.add(phase_name)
+                dependents.extend(self._phase_dependents.get(phase_name, ()))
+            for dependent in dependents:
+                if dependent not in found:
+                    found.add(dependent)
+                    stack.append(dependent)
+        return found
+
+    def is_settled(self, task_id: str) -> bool:
+        """Check whether a task has finished, failed or been skipped."""
+        return task_id in self._settled
+
+    def settle(self, task_id: str, ok: bool) -> tuple[list[str], list[str], list[tuple[str, bool]]]:
+        """Record that a task finished and release its dependents.
+
+        Args:
+            task_id: Task that finished
+            ok: Whether it completed successfully
+
+        Returns:
+            Tuple of (newly ready task IDs, newly skipped task IDs,
+            finished phases as (phase_name, succeeded) pairs)
+        """
+        ready: list[str] = []
+        skipped: list[str] = []
+        finished: list[tuple[str, bool]] = []
+        work = [(task_id, ok)]
+
+        while work:
+            current, current_ok = work.pop()
+            if current in self._settled:
+                continue
+            self._settled.add(current)
+
+            released: list[str] = []
+            for dependent in self._dependents.get(current, ()):
+                if not current_ok:
+                    self._doomed.add(dependent)
+                released.append(dependent)
+            if current in self._successor:
+                released.append(self._successor[current])
+
+            phase_name = self.tasks[current].phase_name
+            if not current_ok:
+                self._phase_ok[phase_name] = False
+            self._phase_remaining[phase_name] -= 1
+            if self._phase_remaining[phase_name] == 0:
+                phase_ok = self._phase_ok[phase_name]
+                finished.append((phase_name, phase_ok))
+                for dependent in self._phase_dependents[phase_name]:
+                    if not phase_ok:
+                        self._doomed.add(dependent)
+                    released.append(dependent)
+
+            for dependent in released:
+                self._waiting[dependent] -= 1
+                if self._waiting[dependent] == 0 and dependent not in self._settled:
+                    if dependent in self._doomed:
+                        skipped.append(dependent)
+                        work.append((dependent, False))
+                    else:
+                        ready.append(dependent)
+
+        return ready, skipped, finished
+
+
+def estimate_duration(task: Task) -> float:
+    """Expected duration of a task when no better estimate is available.
+
+    The rendered prompt length stands in for the work a task asks for; only
+    the relative order of the estimates matters for scheduling.
+    """
+    return 1.0 + task.prompt_length() / 1000
+
+
+class ReadyQueue:
+    """Tasks that may be dispatched, highest priority first.
+
+    Tasks pushed with ``first`` (due retries) go ahead of all others.
+    """
+
+    def __init__(self, graph: TaskGraph, task_ids: Iterable[str] = ()):
+        """Initialize queue.
+
+        Args:
+            graph: Graph providing the priority of each task
+            task_ids: Initially ready tasks
+        """
+        self.graph = graph
+        self._heap: list[tuple] = []
+        self._order = itertools.count()
+        self.extend(task_ids)
+
+    def push(self, task_id: str, first: bool = False) -> None:
+        """Add a ready task."""
+        entry = (0 if first else 1, *self.graph.priority(task_id), next(self._order), task_id)
+        heapq.heappush(self._heap, entry)
+
+    def extend(self, task_ids: Iterable[str]) -> None:
+        """Add several ready tasks."""
+        for task_id in task_ids:
+            self.push(task_id)
+
+    def peek(self) -> str:
+        """Get the highest priority task without removing it."""
+        return self._heap[0][-1]
+
+    def pop(self) -> str:
+        """Remove and return the highest priority task."""
+        return heapq.heappop(self._heap)[-1]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+@dataclass
+class HedgeRun:
+    """A second attempt racing a straggling task."""
+
+    workspace: Path
+    reserved: int = 0  # tokens reserved at launch
+    primary_failed: bool = False  # the original attempt failed while the hedge ran
+    primary_result: Optional[ClaudeResult] = None
+
+
+class TaskScheduler:
+    """Run tasks from all phases on one persistent worker pool.
+
+    Each task is dispatched as soon as the specific tasks it depends on have
+    completed (see TaskGraph), so a slow task in one phase no longer idles
+    workers that could already start work in the next phase.
+
+    Ready tasks are dispatched by template ``priority``, then critical-path
+    rank, then expected duration (see TaskGraph.priority).
+
+    Failed attempts with retries left are parked in a RetryQueue for their
+    backoff delay rather than sleeping in a worker, so the slot goes
+    straight to the next ready task. How often and how long to wait is
+    decided by the RetryPolicy of the failure's error class: permanent
+    errors are not retried and rate limits wait as long as advertised.
+
+    With ``adaptive_workers`` the number of in-flight tasks follows a
+    ConcurrencyController between ``min_workers`` and ``max_workers``;
+    every adjustment is recorded as a state event.
+
+    With request or token budgets configured, a RateLimiter holds dispatch
+    until the model's budget can cover the next task's estimated usage.
+
+    With ``hedge`` enabled, an attempt running longer than
+    ``hedge_percentile`` of its template's durations gets a second attempt
+    in a copy of the working directory once a slot is free and no ready
+    task is waiting. Whichever finishes successfully first wins: the other
+    one is killed, and a winning hedge's declared outputs are copied back.
+    Hedges take worker slots and rate limit budget like any attempt and
+    are recorded as state events.
+
+    Once ``max_failures`` tasks of one phase (``config.max_failures``
+    unless the phase sets its own) have failed, the run stops: queued
+    tasks are dropped and attempts in flight are killed. Tasks whose
+    attempt was cut short, by this or by Ctrl-C, are reset to pending so
+    that ``--resume`` runs them again.
+
+    A CircuitBreaker pauses dispatch after ``breaker_threshold``
+    consecutive failures with the same cause and probes with a single
+    attempt after ``breaker_cooldown``; ``breaker_probes`` failed probes in
+    a row stop the run. A RetryBudget keeps retries below
+    ``retry_budget`` of all attempts, so a burst of failures cannot
+    multiply into a retry storm. Both are off unless the plan sets them.
+
+    A progress line with throughput and ETA is printed as tasks settle.
+    With a HistoryStore, expected durations for priorities and the ETA come
+    from earlier runs. With RunMetrics, attempts, retries, settled tasks and
+    the queues are exposed as live metrics.
+
+    Subclasses provide other engines by overriding ``_run``; graph, retry
+    and state bookkeeping is shared.
+    """
+
+    engine = "threads"
+
+    def __init__(
+        self,
+        config: PlanConfig,
+        state_manager: StateManager,
+        history: Optional[HistoryStore] = None,
+        cache: Optional[ResultCache] = None,
+        metrics: Optional[RunMetrics] = None,
+    ):
+        """Initialize scheduler.
+
+        Args:
+            config: Plan configuration
+            state_manager: State manager for persistence
+            history: Store of task durations across runs; when given, it
+                supplies expected durations and records this run's tasks
+            cache: Result cache consulted before running a task
+            metrics: Live metrics to record the run in
+        """
+        self.config = config
+        self.state_manager = state_manager
+        self.history = history
+        self.cache = cache
+        self.metrics = metrics
+        self.predictor: Optional[DurationPredictor] = None
+        self.progress: Optional[ProgressTracker] = None
+        self.graph: Optional[TaskGraph] = None
+        self.ready: Optional[ReadyQueue] = None
+        self.retries = RetryQueue()
+        self.attempts: dict[str, int] = {}  # attempts started in this run
+        self.retry_policies = retry_policies(config)
+        self.controller: Optional[ConcurrencyController] = None
+        if config.adaptive_workers:
+            self.controller = ConcurrencyController(
+                initial=config.workers,
+                min_limit=config.min_workers,
+                max_limit=config.max_workers or config.workers * 2,
+            )
+        self._dispatched_at: dict[str, float] = {}
+        self.rate_limiter = RateLimiter.from_config(config)
+        self._reserved: dict[str, int] = {}  # task_id -> tokens reserved at dispatch
+        self._throttled_for = 0.0  # seconds until the rate limiter admits the next task
+        self.stragglers: Optional[StragglerDetector] = None
+        if config.hedge:
+            self.stragglers = StragglerDetector(config.hedge_percentile, config.hedge_min_samples)
+        self._hedges: dict[str, HedgeRun] = {}  # in-flight hedges by task ID
+        self._hedged: set[str] = set()  # tasks not to hedge (again) in this run
+        # (task_id, is_hedge) -> how to kill the attempt while it runs
+        self._cancel: dict[tuple[str, bool], Callable[[], None]] = {}
+        # attempts killed after their rival won -> hedge workspace to remove
+        self._losers: dict[tuple[str, bool], Optional[Path]] = {}
+        self.hedges_launched = 0
+        self.hedges_won = 0
+        self._failure_limits: dict[str, int] = {}  # phase -> failed tasks that stop the run
+        self.breaker: Optional[CircuitBreaker] = None
+        if config.breaker_threshold:
+            self.breaker = CircuitBreaker(config.breaker_threshold, config.breaker_cooldown)
+        self.retry_budget: Optional[RetryBudget] = None
+        if config.retry_budget is not None:
+            self.retry_budget = RetryBudget(config.retry_budget, config.retry_budget_min)
+        self.aborted: Optional[str] = None  # why the run stopped early
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self._started_phases: set[str] = set()
+        self._phase_counts: dict[str, list[int]] = {}
+
+    def execute(
+        self,
+        phases: list[Phase],
+        phase_tasks: dict[str, list[Task]],
+        resume: bool = False,
+    ) -> tuple[bool, int, int]:
+        """Execute all tasks of the given phases.
+
+        Args:
+            phases: Phases to execute
+            phase_tasks: Generated tasks per phase name
+            resume: Whether to skip completed tasks
+
+        Returns:
+            Tuple of (all_succeeded, completed_count, failed_count)
+        """
+        self._prepare(phases, phase_tasks, resume)
+        try:
+            self._run()
+        finally:
+            if self.history is not None:
+                self.history.flush()
+            self._discard_hedges()
+            self._reset_interrupted()
+
+        if self.hedges_launched:
+            print(f"\nHedged {self.hedges_launched} straggling tasks ({self.hedges_won} won by the hedge)")
+
+        unscheduled = [task_id for task_id in self.graph.tasks if not self.graph.is_settled(task_id)]
+        if self.aborted is not None:
+            print(f"\nStopped early: {self.aborted}")
+            print(f"  {len(unscheduled)} tasks not finished; run with --resume to continue")
+        elif unscheduled:
+            print(f"\nCould not schedule {len(unscheduled)} tasks (circular requirements):")
+            for task_id in unscheduled[:5]:
+                print(f"  - {task_id}")
+
+        if self.skipped:
+            print(f"\nSkipped {self.skipped} tasks whose dependencies failed")
+
+        all_succeeded = self.failed == 0 and self.skipped == 0 and not unscheduled and self.aborted is None
+        return all_succeeded, self.completed, self.failed
+
+    def _prepare(
+        self,
+        phases: list[Phase],
+        phase_tasks: dict[str, list[Task]],
+        resume: bool,
+    ) -> None:
+        """Build the graph and settle work that is already done."""
+        self.progress = None
+        if self.history is not None:
+            samples = self.history.samples(self.config.name)
+            self.predictor = DurationPredictor(samples)
+            if self.stragglers is not None:
+                for sample in reversed(samples):  # oldest first
+                    self.stragglers.observe(sample.template, sample.duration)
+        self.graph = TaskGraph(phases, phase_tasks, self._expected_duration)
+        self.ready = ReadyQueue(self.graph, self.graph.initial_ready())
+        self.retries = RetryQueue()
+        self.attempts = {}
+        if self.metrics is not None:
+            self.metrics.track(
+                in_flight=lambda: len(self._dispatched_at),
+                ready=lambda: len(self.ready),
+                retrying=lambda: len(self.retries),
+                worker_limit=lambda: self.worker_limit,
+            )
+        self.completed = self.failed = self.skipped = 0
+        self._phase_counts = {phase.name: [0, 0] for phase in phases}
+        self._failure_limits = {
+            phase.name: self.config.max_failures if phase.max_failures is None else phase.max_failures
+            for phase in phases
+        }
+        self.aborted = None
+
+        print(f"\n{'='*60}")
+        if self.controller:
+            workers = f"{self.controller.limit} adaptive ({self.controller.min_limit}-{self.controller.max_limit})"
+            self.state_manager.record_event("concurrency", limit=self.controller.limit, reason="initial")
+        else:
+            workers = str(self.config.workers)
+        print(f"Scheduling {len(self.graph.tasks)} tasks on {workers} workers ({self.engine})")
+        print(f"{'='*60}")
+
+        for phase_name in self.graph.empty_phases():
+            self._start_phase(phase_name)
+            print(f"\nPhase {phase_name}: no tasks to execute")
+            self.state_manager.phase_completed(phase_name)
+
+        if resume:
+            already_done = [
+                task_id for task_id in self.graph.tasks
+                if self.state_manager.is_task_completed(task_id)
+            ]
+            print(f"Resume mode: {len(self.graph.tasks) - len(already_done)} tasks remaining")
+            # Settled tasks are dropped from the ready queue at dispatch
+            for task_id in already_done:
+                self._settle(task_id, True, count=False)
+
+        self.progress = ProgressTracker(
+            {
+                task_id: self.predictor.predict(task) if self.predictor else None
+                for task_id, task in self.graph.tasks.items()
+                if not self.graph.is_settled(task_id)
+            },
+            interval=self.config.progress_interval,
+        )
+
+    def _run(self) -> None:
+        """Dispatch ready tasks to a thread pool until the graph is drained."""
+        task_executor = TaskExecutor(
+            config=self.config,
+            on_start=self.state_manager.task_started,
+            on_complete=self.state_manager.task_completed,
+            on_fail=self.state_manager.task_failed,
+            cache=self.cache,
+        )
+        running: dict[Future, tuple[str, bool]] = {}  # -> (task_id, is_hedge)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            try:
+                while self.ready or self.retries or running:
+                    while len(running) < self.worker_limit:
+                        task = self._next_ready()
+                        if task is None:
+                            break
+                        cancel = CancelToken()
+                        future = pool.submit(task_executor.run_once, task, self.attempts[task.task_id], cancel)
+                        running[future] = (task.task_id, False)
+                        self._cancel[(task.task_id, False)] = cancel.cancel
+
+                    while len(running) < self.worker_limit:
+                        hedge = self._next_hedge()
+                        if hedge is None:
+                            break
+                        task, workspace = hedge
+                        cancel = CancelToken()
+                        future = pool.submit(task_executor.run_hedge, task, workspace, cancel)
+                        running[future] = (task.task_id, True)
+                        self._cancel[(task.task_id, True)] = cancel.cancel
+
+                    if not running:
+                        # Only backoff or rate limit timers left
+                        time.sleep(self._next_wakeup() or 0)
+                        continue
+
+                    done, _ = wait(running, timeout=self._next_wakeup(), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        task_id, is_hedge = running.pop(future)
+                        try:
+                            result, error = future.result(), None
+                        except Exception as e:
+                            result, error = None, str(e)
+                        self._attempt_ended(task_id, is_hedge, result, error)
+            except BaseException:
+                # Kill in-flight CLI sessions (e.g. on Ctrl-C) before the pool waits for them
+                self._cancel_running()
+                raise
+        task_executor.close()
+
+    @property
+    def max_workers(self) -> int:
+        """Largest number of tasks that may ever be in flight."""
+        return self.controller.max_limit if self.controller else self.config.workers
+
+    @property
+    def worker_limit(self) -> int:
+        """Number of tasks allowed in flight right now."""
+        return self.controller.limit if self.controller else self.config.workers
+
+    def _expected_duration(self, task: Task) -> float:
+        """Expected duration from history, else the prompt-length estimate."""
+        if self.predictor:
+            predicted = self.predictor.predict(task)
+            if predicted is not None:
+                return predicted
+        return estimate_duration(task)
+
+    def _next_wakeup(self) -> Optional[float]:
+        """Seconds until a retry or a rate-limited task may be dispatched."""
+        delays = [
+            self.retries.next_due_in() if self._retries_admitted() else None,
+            self._throttled_for or None,
+            self._hedge_due_in(),
+            self.breaker.opens_in() if self.breaker is not None else None,
+        ]
+        delays = [delay for delay in delays if delay is not None]
+        return min(delays) if delays else None
+
+    def _next_ready(self) -> Optional[Task]:
+        """Pop the next dispatchable task and count the attempt.
+
+        Retries whose backoff has elapsed go ahead of newly ready tasks.
+        Returns None while the rate limiter or the circuit breaker holds
+        dispatch.
+        """
+        if self.breaker is not None and not self.breaker.allows_dispatch():
+            return None
+        if self._retries_admitted() or not self.ready:
+            for task_id in self.retries.pop_due():
+                self.ready.push(task_id, first=True)
+
+        while self.ready:
+            task_id = self.ready.peek()
+            if self.graph.is_settled(task_id):
+                self.ready.pop()
+                continue
+            task = self.graph.tasks[task_id]
+            if self.rate_limiter is not None:
+                tokens = self._reserve(task)
+                if tokens is None:
+                    return None
+                self._reserved[task_id] = tokens
+            self.ready.pop()
+            self._start_phase(task.phase_name)
+            self.attempts[task_id] = self.attempts.get(task_id, 0) + 1
+            self._dispatched_at[task_id] = time.monotonic()
+            if self.retry_budget is not None and self.attempts[task_id] == 1:
+                self.retry_budget.attempted()
+            if self.breaker is not None and self.breaker.dispatched(task_id):
+                print(f"  [{task_id}] Circuit breaker: probing")
+            return task
+        return None
+
+    def _retries_admitted(self) -> bool:
+        """Whether due retries may join the ready queue.
+
+        While the circuit breaker is not closed they stay parked, so that
+        the probe is a task that has not failed yet when there is one.
+        """
+        return self.breaker is None or self.breaker.state == CLOSED
+
+    def _reserve(self, task: Task) -> Optional[int]:
+        """Reserve rate limit budget for an attempt, if the budget allows it now.
+
+        Returns:
+            Tokens reserved, or None while dispatch is held
+        """
+        model = self.config.model
+        tokens = self.rate_limiter.estimate(model, task.prompt_length())
+        delay, budget = self.rate_limiter.delay(model, tokens)
+        if delay > 0:
+            if not self._throttled_for:
+                print(f"\nRate limit: holding dispatch {delay:.1f}s ({model} {budget} budget)")
+            self._throttled_for = delay
+            return None
+        self._throttled_for = 0.0
+        self.rate_limiter.acquire(model, tokens)
+        return tokens
+
+    def _hedge_threshold(self, task_id: str) -> Optional[float]:
+        """Seconds after which an in-flight task gets a hedge (None: never)."""
+        if task_id in self._hedged:
+            return None
+        task = self.graph.tasks[task_id]
+        if not hedgeable(task):
+            self._hedged.add(task_id)
+            return None
+        return self.stragglers.threshold(task.template_name)
+
+    def _hedge_due_in(self) -> Optional[float]:
+        """Seconds until the next in-flight task becomes a straggler."""
+        if self.stragglers is None or self.aborted is not None:
+            return None
+        now = time.monotonic()
+        due = None
+        for task_id, dispatched in self._dispatched_at.items():
+            threshold = self._hedge_threshold(task_id)
+            if threshold is None:
+                continue
+            remaining = dispatched + threshold - now
+            if remaining > 0 and (due is None or remaining < due):
+                due = remaining
+        return due
+
+    def _next_hedge(self) -> Optional[tuple[Task, Path]]:
+        """Start a hedge for the most overdue straggler, if there is one.
+
+        Ready tasks take precedence over hedges, and a hedge needs rate
+        limit budget like any attempt.
+
+        Returns:
+            Tuple of (task, workspace for the hedge), or None
+        """
+        if self.stragglers is None or self.ready or self.aborted is not None:
+            return None
+        if self.breaker is not None and self.breaker.state != CLOSED:
+            return None
+        now = time.monotonic()
+        candidate, overdue, threshold = None, 0.0, 0.0
+        for task_id, dispatched in self._dispatched_at.items():
+            task_threshold = self._hedge_threshold(task_id)
+            if task_threshold is not None and now - dispatched - task_threshold > overdue:
+                candidate, overdue, threshold = task_id, now - dispatched - task_threshold, task_threshold
+        if candidate is None:
+            return None
+
+        task = self.graph.tasks[candidate]
+        reserved = 0
+        if self.rate_limiter is not None:
+            reserved = self._reserve(task)
+            if reserved is None:
+                return None
+        self._hedged.add(candidate)
+        self.hedges_launched += 1
+        workspace = Path(self.config.output_dir) / HEDGE_DIR / f"{os.getpid()}-{self.hedges_launched}"
+        self._hedges[candidate] = HedgeRun(workspace, reserved)
+
+        elapsed = now - self._dispatched_at[candidate]
+        print(f"  [{candidate}] Straggling after {elapsed:.1f}s (threshold {threshold:.1f}s), hedging")
+        self.state_manager.record_event(
+            "hedge", task=candidate, outcome="launched", elapsed=round(elapsed, 1), threshold=round(threshold, 1)
+        )
+        return task, workspace
+
+    def _attempt_ended(
+        self,
+        task_id: str,
+        is_hedge: bool,
+        result: Optional[ClaudeResult],
+        error: Optional[str] = None,
+    ) -> None:
+        """Route a finished attempt or hedge, dropping ones that lost a race.
+
+        Args:
+            task_id: Task whose attempt ended
+            is_hedge: Whether it was a hedge
+            result: Result of the attempt (None if it raised or was cancelled)
+            error: Exception message if it raised
+        """
+        key = (task_id, is_hedge)
+        self._cancel.pop(key, None)
+        if key in self._losers:
+            workspace = self._losers.pop(key)
+            if workspace is not None:
+                remove_workspace(workspace)
+            return
+        if self.aborted is not None and error is None and (result is None or result.cancelled):
+            # Killed by _abort; the task is reset once the run is over
+            if is_hedge:
+                remove_workspace(self._hedges.pop(task_id).workspace)
+            return
+
+        if error is not None:
+            print(f"  [{task_id}] Exception: {error}")
+            if not is_hedge:
+                self.state_manager.task_failed(task_id, error)
+        if is_hedge:
+            self._hedge_finished(task_id, result)
+        else:
+            self._primary_finished(task_id, result)
+
+    def _cancel_attempt(self, task_id: str, is_hedge: bool, workspace: Optional[Path] = None) -> None:
+        """Kill the losing side of a race; its result is dropped on arrival."""
+        self._losers[(task_id, is_hedge)] = workspace
+        cancel = self._cancel.get((task_id, is_hedge))
+        if cancel is not None:
+            cancel()
+
+    def _primary_finished(self, task_id: str, result: Optional[ClaudeResult]) -> None:
+        """Handle an original attempt, racing a hedge or not."""
+        hedge = self._hedges.get(task_id)
+        if hedge is not None:
+            if result is None or not result.success:
+                # The hedge may still succeed; decide once it ends
+                hedge.primary_failed = True
+                hedge.primary_result = result
+                return
+            del self._hedges[task_id]
+            self._cancel_attempt(task_id, True, hedge.workspace)
+            self.state_manager.record_event("hedge", task=task_id, outcome="lost")
+        self._attempt_finished(task_id, result)
+
+    def _hedge_finished(self, task_id: str, result: Optional[ClaudeResult]) -> None:
+        """Handle a hedge that ended before the original attempt succeeded."""
+        hedge = self._hedges.pop(task_id)
+        task = self.graph.tasks[task_id]
+        won = False
+        if result is not None and result.success:
+            try:
+                won = adopt_outputs(task, hedge.workspace, self.config.working_dir)
+            except OSError as e:
+                print(f"  [{task_id}] Could not adopt hedge outputs: {e}")
+        remove_workspace(hedge.workspace)
+
+        if not won:
+            print(f"  [{task_id}] Hedge attempt failed")
+            self.state_manager.record_event("hedge", task=task_id, outcome="failed")
+            if hedge.primary_failed:
+                self._attempt_finished(task_id, hedge.primary_result)
+            return
+
+        if not hedge.primary_failed:
+            self._cancel_attempt(task_id, False)
+        self.hedges_won += 1
+        print(f"  [{task_id}] Hedge attempt won")
+        self.state_manager.record_event("hedge", task=task_id, outcome="won")
+        fingerprint = fingerprint_completed(self.config, task, task.get_prompt())
+        self.state_manager.task_completed(task_id, task.outputs.copy(), result.transcript_path, fingerprint)
+        if self.rate_limiter is not None:
+            # The original attempt's usage is unknown; it keeps its reservation
+            self._reserved[task_id] = hedge.reserved
+        self._attempt_finished(task_id, result)
+
+    def _cancel_running(self) -> None:
+        """Kill every attempt and hedge in flight."""
+        for cancel in list(self._cancel.values()):
+            cancel()
+
+    def _abort(self, reason: str) -> None:
+        """Stop the run: drop queued tasks and retries, kill attempts in flight.
+
+        Args:
+            reason: Why the run stops, for the log and the state event
+        """
+        if self.aborted is not None:
+            return
+        self.aborted = reason
+        in_flight = len(self._dispatched_at)
+        print(f"\nStopping: {reason}; cancelling {in_flight} running tasks")
+        self.state_manager.record_event("abort", reason=reason, in_flight=in_flight)
+        self.ready = ReadyQueue(self.graph)
+        self.retries = RetryQueue()
+        self._cancel_running()
+
+    def _reset_interrupted(self) -> None:
+        """Return tasks whose attempt was cut short to pending for --resume."""
+        interrupted = [
+            task_id for task_id in self._dispatched_at
+            if not self.state_manager.is_task_completed(task_id)
+        ]
+        self._dispatched_at.clear()
+        for task_id in interrupted:
+            self.state_manager.task_reset(task_id)
+        if interrupted:
+            print(f"\nReset {len(interrupted)} interrupted tasks to pending")
+            self.state_manager.record_event("interrupted", tasks=len(interrupted))
+
+    def _discard_hedges(self) -> None:
+        """Remove workspaces of hedges that never reported back (e.g. on Ctrl-C)."""
+        for hedge in self._hedges.values():
+            remove_workspace(hedge.workspace)
+        for workspace in self._losers.values():
+            if workspace is not None:
+                remove_workspace(workspace)
+        self._hedges.clear()
+        self._losers.clear()
+
+    def _release(self, task_id: str, result: Optional[ClaudeResult]) -> None:
+        """Settle a task's rate limit reservation with its reported usage."""
+        reserved = self._reserved.pop(task_id, None)
+        if reserved is None or result is None:
+            return
+        model = self.config.model
+        prompt_chars = self.graph.tasks[task_id].prompt_length()
+        self.rate_limiter.record_usage(model, prompt_chars, reserved, result.input_tokens, result.output_tokens)
+        if congestion_signal(result) == "rate limited":
+            self.rate_limiter.penalize(model)
+
+    def _attempt_finished(self, task_id: str, result: Optional[ClaudeResult]) -> None:
+        """Settle a task, or park it in the retry queue if attempts and budget remain.
+
+        Args:
+            task_id: Task whose attempt finished
+            result: Result of the attempt (None if it raised)
+        """
+        success = result is not None and result.success
+        latency = time.monotonic() - self._dispatched_at.pop(task_id)
+        if self.metrics is not None:
+            self.metrics.attempt_finished(self.graph.tasks[task_id].template_name, self.config.model, latency, result)
+        if result is not None and result.cached:
+            # Nothing ran: keep cache hits out of the timing and usage feedback
+            if self.rate_limiter is not None:
+                self.rate_limiter.refund(self.config.model, self._reserved.pop(task_id, 0))
+            if self.breaker is not None:
+                self.breaker.probe_skipped(task_id)
+            self._settle(task_id, success)
+            return
+        if self.controller is not None:
+            self._adjust_concurrency(latency, success, result)
+        if self.rate_limiter is not None:
+            self._release(task_id, result)
+        if self.breaker is not None:
+            self._observe_breaker(task_id, result)
+
+        attempt = self.attempts[task_id]
+        policy = policy_for(self.retry_policies, result.error_class if result is not None else None)
+        if not success and not policy.retry:
+            print(f"  [{task_id}] Not retrying: {result.error_class if result is not None else 'exception'} error")
+        retry = not success and attempt < policy.max_attempts(self.config)
+        if retry and self.aborted is not None:
+            return  # failed and left for --resume
+        if not retry or not self._grant_retry(task_id):
+            if self.history is not None and result is not None:
+                self._record_history(task_id, latency, result)
+            if self.stragglers is not None and success:
+                self.stragglers.observe(self.graph.tasks[task_id].template_name, latency)
+            self._settle(task_id, success, duration=latency)
+            return
+
+        delay = policy.wait(self.config, attempt, result.retry_after if result is not None else None)
+        print(f"  [{task_id}] Retrying in {delay:.1f}s...")
+        if self.metrics is not None:
+            self.metrics.retry_scheduled(result.error_class if result is not None else "exception")
+        self.retries.push(task_id, delay)
+
+    def _observe_breaker(self, task_id: str, result: Optional[ClaudeResult]) -> None:
+        """Feed an attempt into the circuit breaker and report state changes."""
+        success = result is not None and result.success
+        cause = None if success else failure_signature(result)
+        state = self.breaker.record(success, cause, task_id)
+        if state == CLOSED:
+            print("\nCircuit breaker closed: resuming dispatch")
+            self.state_manager.record_event("breaker", state=state)
+        elif state == OPEN:
+            failed_probes = self.breaker.failed_probes
+            if failed_probes:
+                print(f"\nCircuit breaker: probe failed ({cause})")
+            else:
+                print(f"\nCircuit breaker open: {self.breaker.threshold} failures in a row ({cause})")
+            print(f"  Pausing dispatch for {self.breaker.cooldown:.0f}s")
+            self.state_manager.record_event("breaker", state=state, cause=cause, failed_probes=failed_probes)
+            if self.config.breaker_probes and failed_probes >= self.config.breaker_probes:
+                self._abort(f"circuit breaker still open after {failed_probes} probes ({cause})")
+
+    def _grant_retry(self, task_id: str) -> bool:
+        """Check the retry budget before scheduling a retry."""
+        budget = self.retry_budget
+        if budget is None or budget.acquire():
+            return True
+        if budget.denied == 1:
+            print(f"\nRetry budget exhausted: {budget.retries} retries for {budget.first_attempts} tasks")
+            self.state_manager.record_event("retry_budget", retries=budget.retries, tasks=budget.first_attempts)
+        print(f"  [{task_id}] Not retrying: retry budget exhausted")
+        return False
+
+    def _record_history(self, task_id: str, duration: float, result: ClaudeResult) -> None:
+        """Add a settled task's final attempt to the history store."""
+        task = self.graph.tasks[task_id]
+        self.history.record(TaskSample(
+            plan=self.config.name,
+            template=task.template_name,
+            task_id=task_id,
+            prompt_chars=task.prompt_length(),
+            duration=duration,
+            attempts=self.attempts[task_id],
+            input_tokens=result.input_tokens,
+            output_tokens=result.output_tokens,
+            success=result.success,
+        ))
+
+    def _adjust_concurrency(self, latency: float, success: bool, result: Optional[ClaudeResult]) -> None:
+        """Feed an attempt into the controller and record any adjustment."""
+        previous = self.controller.limit
+        signal = congestion_signal(result) if result is not None else None
+        reason = self.controller.observe(latency, success, signal)
+        if reason:
+            print(f"\nConcurrency: {previous} -> {self.controller.limit} ({reason})")
+            self.state_manager.record_event("concurrency", limit=self.controller.limit, reason=reason)
+
+    def _settle(
+        self,
+        task_id: str,
+        success: bool,
+        count: bool = True,
+        duration: Optional[float] = None,
+    ) -> None:
+        """Record a finished task and queue the tasks it unblocks.
+
+        Args:
+            task_id: Task that finished
+            success: Whether it completed successfully
+            count: Whether to count it as run in this execution
+            duration: Seconds its final attempt took
+        """
+        if count:
+            if success:
+                self.completed += 1
+            else:
+                self.failed += 1
+            if self.metrics is not None:
+                self.metrics.tasks_settled("completed" if success else "failed")
+            phase_name = self.graph.tasks[task_id].phase_name
+            self._phase_counts[phase_name][0 if success else 1] += 1
+            limit = self._failure_limits.get(phase_name)
+            failed = self._phase_counts[phase_name][1]
+            if not success and limit and failed >= limit:
+                self._abort(f"{failed} tasks failed in phase {phase_name} (max_failures {limit})")
+
+        newly_ready, skipped, finished = self.graph.settle(task_id, success)
+        if self.aborted is None:
+            self.ready.extend(newly_ready)
+        for skipped_id in skipped:
+            print(f"  [{skipped_id}] Skipped: upstream dependency failed")
+        self.skipped += len(skipped)
+        if skipped and self.metrics is not None:
+            self.metrics.tasks_settled("skipped", len(skipped))
+        self._finish_phases(finished)
+
+        if count and self.progress is not None:
+            self.progress.task_settled(task_id, duration)
+            for skipped_id in skipped:
+                self.progress.task_settled(skipped_id)
+            line = self.progress.report(self.worker_limit)
+            if line:
+                print(f"\n{line}")
+
+    def _start_phase(self, phase_name: str) -> None:
+        """Mark a phase as started the first time one of its tasks runs."""
+        if phase_name in self._started_phases:
+            return
+        self._started_phases.add(phase_name)
+        print(f"\nPhase started: {phase_name}")
+        self.state_manager.phase_started(phase_name)
+
+    def _finish_phases(self, finished: list[tuple[str, bool]]) -> None:
+        """Record phases whose tasks have all settled."""
+        for phase_name, success in finished:
+            self._start_phase(phase_name)
+            if success:
+                self.state_manager.phase_completed(phase_name)
+            else:
+                self.state_manager.phase_failed(phase_name)
+            completed, failed = self._phase_counts.get(phase_name, (0, 0))
+            print(f"\nPhase {phase_name} {'completed' if success else 'failed'}")
+            print(f"  Completed: {completed}, Failed: {failed}")
@@ -0,0 +1,167 @@
+"""Incremental capture of Claude CLI output."""
+
+import json
+import re
+from pathlib import Path
+from typing import Callable, Optional
+
+
+# Lines longer than this (e.g. huge tool results) are written to the
+# transcript but not parsed, so a single line cannot exhaust memory.
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+def transcript_path(transcript_dir: Path, task_id: str) -> Path:
+    """Get the transcript file for a task.
+
+    Args:
+        transcript_dir: Directory holding transcripts
+        task_id: Task identifier
+
+    Returns:
+        Path of the task's ``.jsonl`` transcript
+    """
+    return Path(transcript_dir) / (re.sub(r"[^\w.-]", "_", task_id) + ".jsonl")
+
+
+class OutputTail:
+    """Keep the last ``max_bytes`` of a byte stream."""
+
+    def __init__(self, max_bytes: int = 65536):
+        """Initialize tail buffer.
+
+        Args:
+            max_bytes: Maximum bytes retained
+        """
+        self.max_bytes = max_bytes
+        self._buffer = bytearray()
+        self.total_bytes = 0
+
+    def append(self, chunk: bytes) -> None:
+        """Append a chunk, dropping the oldest bytes beyond the limit."""
+        self.total_bytes += len(chunk)
+        self._buffer += chunk
+        overflow = len(self._buffer) - self.max_bytes
+        if overflow > 0:
+            del self._buffer[:overflow]
+
+    def text(self) -> str:
+        """Decode the retained bytes."""
+        return self._buffer.decode("utf-8", errors="replace")
+
+
+class StreamCollector:
+    """Parse ``--output-format stream-json`` output as it arrives.
+
+    Every chunk is appended to the transcript file (if any) and to a
+    bounded tail; complete lines are parsed so token usage is known while
+    the session is still running. The final ``result`` message supplies the
+    response text and authoritative usage totals.
+    """
+
+    def __init__(
+        self,
+        transcript: Optional[Path] = None,
+        tail_bytes: int = 65536,
+        on_usage: Optional[Callable[[int, int], None]] = None,
+    ):
+        """Initialize collector.
+
+        Args:
+            transcript: File to append raw output to
+            tail_bytes: Bytes of raw output kept in memory
+            on_usage: Called with (input_tokens, output_tokens) whenever usage changes
+        """
+        self.transcript = Path(transcript) if transcript else None
+        self.tail = OutputTail(tail_bytes)
+        self.on_usage = on_usage
+        self.result_text: Optional[str] = None
+        self.is_error = False
+        self.input_tokens: Optional[int] = None
+        self.output_tokens: Optional[int] = None
+        self._message_usage: dict[str, tuple[int, int]] = {}
+        self._line = bytearray()
+        self._skipping_line = False
+        self._file = None
+        if self.transcript is not None:
+            self.transcript.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.transcript.open("ab")
+
+    def feed(self, chunk: bytes) -> None:
+        """Consume a chunk of raw stdout."""
+        if self._file is not None:
+            self._file.write(chunk)
+        self.tail.append(chunk)
+
+        start = 0
+        while True:
+            newline = chunk.find(b"\n", start)
+            if newline < 0:
+                break
+            self._take(chunk[start:newline])
+            self._end_line()
+            start = newline + 1
+        self._take(chunk[start:])
+
+    def close(self) -> None:
+        """Parse any unterminated last line and close the transcript."""
+        self._end_line()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _take(self, part: bytes) -> None:
+        """Add bytes to the current line unless it is being skipped."""
+        if self._skipping_line or not part:
+            return
+        self._line += part
+        if len(self._line) > MAX_LINE_BYTES:
+            self._line = bytearray()
+            self._skipping_line = True
+
+    def _end_line(self) -> None:
+        """Parse the completed line."""
+        line = bytes(self._line).strip()
+        self._line = bytearray()
+        self._skipping_line = False
+        if not line:
+            return
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            return
+        if isinstance(message, dict):
+            self._handle(message)
+
+    def _handle(self, message: dict) -> None:
+        """Update usage and result from one stream-json message."""
+        kind = message.get("type")
+
+        if kind == "assistant":
+            body = message.get("message") or {}
+            usage = body.get("usage")
+            if usage:
+                # Usage repeats on every content block of a message
+                key = body.get("id") or str(len(self._message_usage))
+                self._message_usage[key] = (
+                    usage.get("input_tokens") or 0,
+                    usage.get("output_tokens") or 0,
+                )
+                self._set_usage(
+                    sum(u[0] for u in self._message_usage.values()),
+                    sum(u[1] for u in self._message_usage.values()),
+                )
+
+        elif kind == "result":
+            self.result_text = message.get("result")
+            self.is_error = bool(message.get("is_error"))
+            usage = message.get("usage")
+            if usage:
+                self._set_usage(usage.get("input_tokens"), usage.get("output_tokens"))
+
+    def _set_usage(self, input_tokens: Optional[int], output_tokens: Optional[int]) -> None:
+        """Store usage and notify the listener."""
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        if self.on_usage:
+            self.on_usage(input_tokens or 0, output_tokens or 0)
@@ -1,110 +1,162 @@
-"""Execute individual tasks with retry logic."""
+"""Execute individual task attempts."""
 
-import time
 from pathlib import Path
 from typing import Callable, Optional
 
 from ..models.plan import Task
 from ..models.config import PlanConfig
-from .claude_runner import ClaudeRunner, ClaudeResult
+from ..state.fingerprint import task_fingerprint
+from ..state.result_cache import ResultCache, cache_key, resolve_path
+from .cancellation import CancelToken
+from .failures import policy_for, retry_policies
+from .hedging import create_workspace
+from .runner import ClaudeResult, TaskRunner, create_runner
 
 
 class TaskExecutor:
-    """Execute a single task with retry and backoff.
+    """Execute single attempts of a task for the schedulers.
 
     Provides:
-    - Exponential backoff retry
+    - Single attempts (``run_once``); the schedulers park retries in a
+      RetryQueue, so a worker is never held idle during backoff
     - Output path verification
     - Progress callbacks
+    - Reuse of identical earlier results from a ResultCache
+    - Fingerprints of completed tasks for incremental runs
+    - Hedge attempts in an isolated workspace (``run_hedge``)
+
+    Prompts run on the backend selected by ``config.runner``.
     """
 
     def __init__(
         self,
         config: PlanConfig,
         on_start: Optional[Callable[[str], None]] = None,
-        on_complete: Optional[Callable[[str, dict], None]] = None,
-        on_fail: Optional[Callable[[str, str], None]] = None,
+        on_complete: Optional[Callable[[str, dict, Optional[str], Optional[dict]], None]] = None,
+        on_fail: Optional[Callable[[str, str, Optional[str], Optional[str]], None]] = None,
+        on_usage: Optional[Callable[[str, int, int], None]] = None,
+        cache: Optional[ResultCache] = None,
     ):
         """Initialize task executor.
 
         Args:
             config: Plan configuration
             on_start: Callback when task starts (task_id)
-            on_complete: Callback when task completes (task_id, outputs)
-            on_fail: Callback when task fails (task_id, error)
+            on_complete: Callback when task completes
+                (task_id, outputs, transcript, fingerprint)
+            on_fail: Callback when task fails
+                (task_id, error, transcript, error_class)
+            on_usage: Callback with running token usage while streaming
+                (task_id, input_tokens, output_tokens)
+            cache: Result cache to restore from and store into
         """
         self.config = config
         self.on_start = on_start
         self.on_complete = on_complete
         self.on_fail = on_fail
+        self.on_usage = on_usage
+        self.cache = cache
+        self.policies = retry_policies(config)
+        # Class of each task's last failure, which sets the limit of its next attempt
+        self._failure_classes: dict[str, Optional[str]] = {}
+        # Stamps of required files, shared by tasks that read the same inputs
+        self._digests: dict[str, list] = {}
+
+        self.runner = create_runner(config)
 
-        self.runner = ClaudeRunner(
-            working_dir=config.working_dir,
-            model=config.model,
-            timeout=config.timeout,
-        )
+    def close(self) -> None:
+        """Release the runner's pooled resources."""
+        self.runner.close()
 
-    def execute(self, task: Task, attempt: int = 0) -> tuple[bool, dict[str, str]]:
-        """Execute a task with retry logic.
+    def run_once(self, task: Task, attempt: int, cancel: Optional[CancelToken] = None) -> ClaudeResult:
+        """Run a single attempt of a task.
+
+        Every attempt is reported through the callbacks, so the attempt
+        count in state matches the number of CLI sessions started. A
+        cancelled attempt reports neither completion nor failure.
 
         Args:
             task: Task to execute
-            attempt: Current attempt number (for retry)
+            attempt: Attempt number within this run (1-based, for logging)
+            cancel: Token through which the scheduler may kill the attempt
 
         Returns:
-            Tuple of (success, outputs)
+            ClaudeResult of the attempt
         """
-        max_retries = self.config.retries
-        base_delay = self.config.retry_delay
-
         # Notify start
         if self.on_start:
             self.on_start(task.task_id)
 
-        while attempt < max_retries:
-            attempt += 1
+        prompt = task.get_prompt()
+        key, cached = restore_cached(self.cache, self.config, task, prompt)
+        if cached is not None:
+            if self.on_complete:
+                fingerprint = fingerprint_completed(self.config, task, prompt, self._digests)
+                self.on_complete(task.task_id, task.outputs.copy(), None, fingerprint)
+            return cached
+
+        # Log attempt against the limit of the policy that allowed it
+        limit = policy_for(self.policies, self._failure_classes.pop(task.task_id, None)).max_attempts(self.config)
+        print(f"  [{task.task_id}] Attempt {attempt}/{limit}")
+
+        # Execute via Claude
+        result = self.runner.run(prompt, task.task_id, self._usage_callback(task), cancel)
+        result = save_response(self.runner, task, result)
+
+        if result.success:
+            store_cached(self.cache, self.config, task, prompt, key, result)
 
-            # Log attempt
-            print(f"  [{task.task_id}] Attempt {attempt}/{max_retries}")
+            # Verify outputs exist (optional - outputs might be created by Claude)
+            outputs = task.outputs.copy()
 
-            # Execute via Claude
-            result = self.runner.run(task.prompt, task.task_id)
+            # Notify completion
+            if self.on_complete:
+                fingerprint = fingerprint_completed(self.config, task, prompt, self._digests)
+                self.on_complete(task.task_id, outputs, result.transcript_path, fingerprint)
 
-            if result.success:
-                # Verify outputs exist (optional - outputs might be created by Claude)
-                outputs = task.outputs.copy()
+            print(f"  [{task.task_id}] Completed successfully")
+            log_usage(task, result)
+            return result
 
-                # Notify completion
-                if self.on_complete:
-                    self.on_complete(task.task_id, outputs)
+        if result.cancelled:
+            print(f"  [{task.task_id}] Cancelled")
+            return result
 
-                print(f"  [{task.task_id}] Completed successfully")
+        # Failed - log error
+        error_msg = result.error_message or f"Exit code: {result.exit_code}"
+        print(f"  [{task.task_id}] Failed ({result.error_class}): {error_msg}")
+        self._failure_classes[task.task_id] = result.error_class
+        if self.on_fail:
+            self.on_fail(task.task_id, error_msg, result.transcript_path, result.error_class)
+        return result
 
-                # Log context window usage if available
-                if result.input_tokens is not None or result.output_tokens is not None:
-                    input_t = result.input_tokens or 0
-                    output_t = result.output_tokens or 0
-                    total = input_t + output_t
-                    print(f"  [{task.task_id}] Context: {input_t:,} in + {output_t:,} out = {total:,} tokens")
+    def run_hedge(self, task: Task, workspace: Path, cancel: Optional[CancelToken] = None) -> ClaudeResult:
+        """Run an extra attempt of a task in a copy of the working directory.
 
-                return True, outputs
+        Nothing is reported through the callbacks: the scheduler decides
+        whether this attempt or the original one wins.
 
-            # Failed - log error
-            error_msg = result.error_message or f"Exit code: {result.exit_code}"
-            print(f"  [{task.task_id}] Failed: {error_msg}")
+        Args:
+            task: Task to hedge
+            workspace: Directory for the copy
+            cancel: Token through which the scheduler may kill the attempt
 
-            # Check if we should retry
-            if attempt < max_retries:
-                delay = base_delay * (2 ** (attempt - 1))  # Exponential backoff
-                print(f"  [{task.task_id}] Retrying in {delay}s...")
-                time.sleep(delay)
-            else:
-                # Final failure
-                if self.on_fail:
-                    self.on_fail(task.task_id, error_msg)
-                return False, {}
+        Returns:
+            ClaudeResult of the attempt
+        """
+        try:
+            create_workspace(self.config, task, workspace)
+        except OSError as e:
+            return self.runner.error_result(f"Could not create hedge workspace: {e}")
+        print(f"  [{task.task_id}] Hedge attempt in {workspace}")
+        runner = self.runner.in_directory(workspace)
+        return save_response(runner, task, runner.run(task.get_prompt(), f"{task.task_id}.hedge", cancel=cancel))
 
-        return False, {}
+    def _usage_callback(self, task: Task) -> Optional[Callable[[int, int], None]]:
+        """Bind the usage callback to a task."""
+        if self.on_usage is None:
+            return None
+        return lambda input_tokens, output_tokens: self.on_usage(task.task_id, input_tokens, output_tokens)
 
     def verify_outputs(self, task: Task) -> bool:
         """Verify that task outputs exist.
@@ -120,3 +172,109 @@ class TaskExecutor:
                 print(f"  [{task.task_id}] Output not found: {path}")
                 return False
         return True
+
+
+def save_response(runner: TaskRunner, task: Task, result: ClaudeResult) -> ClaudeResult:
+    """Save the response of a runner without tools to the task's first output.
+
+    Returns:
+        The result, or a failed result if the output could not be written
+    """
+    if runner.writes_outputs or not result.success or not task.outputs:
+        return result
+    path = resolve_path(next(iter(task.outputs.values())), str(runner.working_dir))
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(result.stdout, encoding="utf-8")
+    except OSError as e:
+        return runner.error_result(f"Could not write output {path}: {e}")
+    return result
+
+
+def restore_cached(
+    cache: Optional[ResultCache],
+    config: PlanConfig,
+    task: Task,
+    prompt: str,
+) -> tuple[Optional[str], Optional[ClaudeResult]]:
+    """Look a task up in the result cache and restore its outputs on a hit.
+
+    Cache errors are reported and treated as a miss, and so is an entry
+    whose outputs exist on disk with other contents (e.g. edited by hand):
+    a hit never overwrites them.
+
+    Returns:
+        Tuple of (cache key or None, cached result or None)
+    """
+    if cache is None:
+        return None, None
+    try:
+        key = cache_key(prompt, config.model, config.working_dir, task.requirements, task.outputs, config.runner)
+        entry = cache.lookup(key)
+        if entry is None:
+            return key, None
+        conflicts = cache.conflicts(entry, config.working_dir)
+        if conflicts:
+            print(f"  [{task.task_id}] Not using cached result: {conflicts[0]} has changed")
+            return key, None
+        cache.restore(entry, config.working_dir)
+    except OSError as e:
+        print(f"  [{task.task_id}] Cache unavailable: {e}")
+        return None, None
+    print(f"  [{task.task_id}] Restored from cache")
+    return key, ClaudeResult(**entry["result"], cached=True)
+
+
+def store_cached(
+    cache: Optional[ResultCache],
+    config: PlanConfig,
+    task: Task,
+    prompt: str,
+    key: Optional[str],
+    result: ClaudeResult,
+) -> None:
+    """Store a successful result in the cache (errors are only reported).
+
+    The entry is stored under ``key``, computed with the outputs as they
+    were before the run, and under the key of the outputs the run left, so
+    that running the task again over unchanged outputs is a hit too.
+    """
+    if cache is None or key is None:
+        return
+    fields = {
+        "success": result.success,
+        "exit_code": result.exit_code,
+        "stdout": result.stdout,
+        "stderr": result.stderr,
+        "error_message": result.error_message,
+        "input_tokens": result.input_tokens,
+        "output_tokens": result.output_tokens,
+    }
+    try:
+        after = cache_key(prompt, config.model, config.working_dir, task.requirements, task.outputs, config.runner)
+        cache.store([key, after], task.outputs, config.working_dir, fields)
+    except OSError as e:
+        print(f"  [{task.task_id}] Could not cache result: {e}")
+
+
+def fingerprint_completed(
+    config: PlanConfig,
+    task: Task,
+    prompt: str,
+    digests: Optional[dict] = None,
+) -> Optional[dict]:
+    """Fingerprint a completed task (None if its files could not be read)."""
+    try:
+        return task_fingerprint(task, prompt, config.working_dir, digests)
+    except OSError as e:
+        print(f"  [{task.task_id}] Could not fingerprint outputs: {e}")
+        return None
+
+
+def log_usage(task: Task, result: ClaudeResult) -> None:
+    """Log context window usage if available."""
+    if result.input_tokens is not None or result.output_tokens is not None:
+        input_t = result.input_tokens or 0
+        output_t = result.output_tokens or 0
+        total = input_t + output_t
+        print(f"  [{task.task_id}] Context: {input_t:,} in + {output_t:,} out = {total:,} tokens")
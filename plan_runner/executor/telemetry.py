@@ -0,0 +1,127 @@
+"""Metrics of a plan run, fed by the scheduler and the state manager."""
+
+from typing import Callable, Optional
+
+from ..models.config import PlanConfig
+from ..metrics.registry import MetricsRegistry
+from .runner import ClaudeResult
+
+# Bucket bounds of task attempt durations, in seconds
+DURATION_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200)
+
+# Bucket bounds of state flush durations, in seconds
+FLUSH_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+
+class RunMetrics:
+    """Live telemetry of a run.
+
+    Exposes, with a ``plan`` label on every sample:
+    - ``plan_runner_tasks_in_flight``: attempts running
+    - ``plan_runner_queue_depth``: tasks waiting in the ready and retry queues
+    - ``plan_runner_worker_limit``: attempts allowed in flight
+    - ``plan_runner_task_duration_seconds``: attempt durations per template
+    - ``plan_runner_tasks_settled_total``: settled tasks by outcome
+    - ``plan_runner_retries_total``: retries scheduled, by error class
+    - ``plan_runner_failures_total``: failed attempts, by error class
+    - ``plan_runner_tokens_total``: tokens reported, by model and direction
+    - ``plan_runner_state_flush_seconds``: state writes, by kind
+
+    Gauges are read from the scheduler when collected (see ``track``);
+    everything else is recorded as it happens. Cache hits do not count as
+    attempts.
+    """
+
+    def __init__(self, config: PlanConfig):
+        """Initialize metrics.
+
+        Args:
+            config: Plan configuration
+        """
+        self.registry = MetricsRegistry({"plan": config.name})
+        registry = self.registry
+        self.in_flight = registry.gauge("plan_runner_tasks_in_flight", "Task attempts running.")
+        self.queue_depth = registry.gauge(
+            "plan_runner_queue_depth", "Tasks waiting for a worker, by queue.", ("queue",)
+        )
+        self.worker_limit = registry.gauge("plan_runner_worker_limit", "Task attempts allowed in flight.")
+        self.duration = registry.histogram(
+            "plan_runner_task_duration_seconds",
+            "Duration of task attempts, by template.",
+            DURATION_BUCKETS,
+            ("template",),
+        )
+        self.settled = registry.counter("plan_runner_tasks_settled", "Tasks settled, by outcome.", ("outcome",))
+        self.retries = registry.counter("plan_runner_retries", "Retries scheduled, by error class.", ("error_class",))
+        self.failures = registry.counter(
+            "plan_runner_failures", "Failed task attempts, by error class.", ("error_class",)
+        )
+        self.tokens = registry.counter(
+            "plan_runner_tokens", "Tokens reported by task attempts, by model and direction.", ("model", "direction")
+        )
+        self.state_flush = registry.histogram(
+            "plan_runner_state_flush_seconds",
+            "Duration of state writes to the backend, by kind.",
+            FLUSH_BUCKETS,
+            ("kind",),
+        )
+
+    def track(
+        self,
+        in_flight: Callable[[], int],
+        ready: Callable[[], int],
+        retrying: Callable[[], int],
+        worker_limit: Callable[[], int],
+    ) -> None:
+        """Read the gauges from the current scheduler.
+
+        Args:
+            in_flight: Number of attempts running
+            ready: Number of tasks in the ready queue
+            retrying: Number of tasks waiting out a retry delay
+            worker_limit: Number of attempts allowed in flight
+        """
+        self.in_flight.set_function(in_flight)
+        self.queue_depth.set_function(ready, queue="ready")
+        self.queue_depth.set_function(retrying, queue="retry")
+        self.worker_limit.set_function(worker_limit)
+
+    def attempt_finished(
+        self,
+        template: str,
+        model: str,
+        duration: float,
+        result: Optional[ClaudeResult],
+    ) -> None:
+        """Record a finished attempt.
+
+        Args:
+            template: Template the task was generated from
+            model: Model the attempt ran on
+            duration: Seconds since dispatch
+            result: Result of the attempt (None if it raised)
+        """
+        if result is not None and result.cached:
+            return
+        self.duration.observe(duration, template=template)
+        if result is None:
+            self.failures.inc(error_class="exception")
+        elif not result.success and not result.cancelled:
+            self.failures.inc(error_class=result.error_class or "unknown")
+        if result is not None:
+            if result.input_tokens:
+                self.tokens.inc(result.input_tokens, model=model, direction="input")
+            if result.output_tokens:
+                self.tokens.inc(result.output_tokens, model=model, direction="output")
+
+    def retry_scheduled(self, error_class: Optional[str]) -> None:
+        """Record a retry of a failed attempt."""
+        self.retries.inc(error_class=error_class or "unknown")
+
+    def tasks_settled(self, outcome: str, count: int = 1) -> None:
+        """Record settled tasks ("completed", "failed" or "skipped")."""
+        self.settled.inc(count, outcome=outcome)
+
+    def state_flushed(self, seconds: float, snapshot: bool) -> None:
+        """Record a write of queued state records (or of a full snapshot)."""
+        self.state_flush.observe(seconds, kind="snapshot" if snapshot else "append")
@@ -0,0 +1,14 @@
+"""Run telemetry in the OpenMetrics text format."""
+
+from .registry import Counter, Gauge, Histogram, MetricsRegistry
+from .exporter import MetricsServer, TextfileExporter, start_exporters
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "MetricsServer",
+    "TextfileExporter",
+    "start_exporters",
+]
@@ -0,0 +1,172 @@
+"""Expose a MetricsRegistry over HTTP or as a periodically rewritten textfile."""
+
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+from ..models.config import PlanConfig
+from .registry import OPENMETRICS_CONTENT_TYPE, PROMETHEUS_CONTENT_TYPE, MetricsRegistry
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """Serve ``GET /metrics`` from a background thread.
+
+    Scrapers that accept ``application/openmetrics-text`` get OpenMetrics,
+    everything else the Prometheus text format.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 0):
+        """Initialize server (bound, not yet serving).
+
+        Args:
+            registry: Metrics to expose
+            host: Address to listen on
+            port: Port to listen on (0: any free port)
+        """
+        super().__init__((host, port), MetricsHandler)
+        self.registry = registry
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """URL of the metrics endpoint."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def handle_error(self, request, client_address) -> None:
+        """Ignore scrapers that hung up."""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def start(self) -> None:
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="plan-runner-metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread = None
+        self.server_close()
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Answer scrapes of the metrics endpoint."""
+
+    server: MetricsServer
+
+    def log_message(self, format: str, *args) -> None:
+        """Keep scrapes out of the run's output."""
+
+    def do_GET(self) -> None:
+        """Render the registry."""
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+        body = self.server.registry.render(openmetrics).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TextfileExporter:
+    """Thread that rewrites a metrics file every ``interval`` seconds.
+
+    The file is replaced atomically, in the Prometheus text format read by
+    the node exporter's textfile collector (which expects a ``.prom``
+    suffix). It is written a last time when the exporter stops, so it
+    shows the final state of the run.
+    """
+
+    def __init__(self, registry: MetricsRegistry, path: Path, interval: float = 15.0):
+        """Initialize exporter.
+
+        Args:
+            registry: Metrics to write
+            path: File to rewrite
+            interval: Seconds between rewrites
+        """
+        self.registry = registry
+        self.path = Path(path)
+        self.interval = interval
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="plan-runner-metrics-textfile", daemon=True)
+
+    def start(self) -> None:
+        """Write the file now and then periodically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.write()
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread after a final write."""
+        self._stopping.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self._safe_write()
+
+    def write(self) -> None:
+        """Replace the file with the current metrics."""
+        temp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        temp.write_text(self.registry.render(openmetrics=False), encoding="utf-8")
+        os.replace(temp, self.path)
+
+    def _run(self) -> None:
+        """Rewrite loop."""
+        while not self._stopping.wait(self.interval):
+            self._safe_write()
+
+    def _safe_write(self) -> None:
+        """Write, reporting rather than dying on I/O errors."""
+        try:
+            self.write()
+        except OSError as e:
+            print(f"Warning: Could not write metrics to {self.path}: {e}")
+
+
+def start_exporters(config: PlanConfig, registry: MetricsRegistry) -> list:
+    """Start the endpoint and textfile writer enabled in ``config``.
+
+    An exporter that cannot start (port in use, unwritable directory) is
+    reported and left out; the run goes on without it.
+
+    Args:
+        config: Plan configuration
+        registry: Metrics to expose
+
+    Returns:
+        Started exporters, each with a ``stop()`` method
+    """
+    exporters = []
+    if config.metrics_port:
+        try:
+            server = MetricsServer(registry, config.metrics_host, config.metrics_port)
+        except OSError as e:
+            print(f"Warning: Metrics endpoint unavailable on port {config.metrics_port}: {e}")
+        else:
+            server.start()
+            print(f"Metrics: {server.url}")
+            exporters.append(server)
+    if config.metrics_textfile:
+        textfile = TextfileExporter(
+            registry,
+            Path(config.output_dir) / config.metrics_textfile,
+            config.metrics_interval,
+        )
+        try:
+            textfile.start()
+        except OSError as e:
+            print(f"Warning: Could not write metrics to {textfile.path}: {e}")
+        else:
+            print(f"Metrics: {textfile.path}")
+            exporters.append(textfile)
+    return exporters
@@ -0,0 +1,255 @@
+"""Counters, gauges and histograms rendered in the OpenMetrics text format."""
+
+import math
+import threading
+from typing import Callable, Iterator, Optional
+
+# Content types of the two text formats
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def format_value(value: float) -> str:
+    """Format a sample value (integers without a fraction, infinities as +Inf/-Inf)."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer() and abs(value) < 2**53:
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_bound(bound: float) -> str:
+    """Format a bucket bound as a float (``1.0``, ``0.25``, ``+Inf``)."""
+    return "+Inf" if math.isinf(bound) else repr(float(bound))
+
+
+def escape_label(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    """Format a label set as ``{name="value",...}`` (empty for no labels)."""
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{escape_label(str(value))}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+class Metric:
+    """Base class of a metric family: one value (or series) per label set."""
+
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        """Initialize metric.
+
+        Args:
+            name: Metric name (for counters, without the ``_total`` suffix)
+            help: One-line description
+            labelnames: Names of the labels each sample carries
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        """Label values in ``labelnames`` order."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple[str, ...]) -> dict[str, str]:
+        """Label set of a key."""
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Current samples as (name suffix, labels, value)."""
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        """Initialize counter (see Metric)."""
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Add ``amount`` (not negative) to the count of a label set."""
+        if amount < 0:
+            raise ValueError(f"{self.name} can only increase, got {amount}")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """One ``_total`` sample per label set."""
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield "_total", self._labels(key), value
+
+
+class Gauge(Metric):
+    """Value that goes up and down, set directly or read from a function at collection time."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        """Initialize gauge (see Metric)."""
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._functions: dict[tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the value of a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, function: Callable[[], float], **labels: str) -> None:
+        """Read the value of a label set from ``function`` whenever it is collected."""
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = function
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """One sample per label set, calling value functions now."""
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, function in functions.items():
+            values[key] = function()
+        for key, value in values.items():
+            yield "", self._labels(key), value
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        buckets: tuple[float, ...],
+        labelnames: tuple[str, ...] = (),
+    ):
+        """Initialize histogram.
+
+        Args:
+            name: Metric name
+            help: One-line description
+            buckets: Upper bounds of the buckets, ascending (+Inf is added)
+            labelnames: Names of the labels each series carries
+        """
+        super().__init__(name, help, labelnames)
+        if list(buckets) != sorted(buckets):
+            raise ValueError(f"Buckets of {name} must be ascending")
+        self.buckets = tuple(bound for bound in buckets if not math.isinf(bound)) + (math.inf,)
+        # label key -> [bucket counts (not cumulative)..., sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one value."""
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-1] += value
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Cumulative ``_bucket`` samples, ``_count`` and ``_sum`` per label set."""
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        for key, values in series.items():
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                yield "_bucket", {**labels, "le": format_bound(bound)}, cumulative
+            yield "_count", labels, cumulative
+            yield "_sum", labels, values[-1]
+
+
+class MetricsRegistry:
+    """Set of metric families exposed together.
+
+    ``const_labels`` are added to every sample, e.g. the plan name so that
+    several runs can share one scraper or textfile directory.
+    """
+
+    def __init__(self, const_labels: Optional[dict[str, str]] = None):
+        """Initialize registry.
+
+        Args:
+            const_labels: Labels added to every sample
+        """
+        self.const_labels = dict(const_labels or {})
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric family; names must be unique."""
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Create and register a counter."""
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        """Create and register a gauge."""
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        buckets: tuple[float, ...],
+        labelnames: tuple[str, ...] = (),
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self.register(Histogram(name, help, buckets, labelnames))
+
+    def render(self, openmetrics: bool = True) -> str:
+        """Render all metrics.
+
+        Args:
+            openmetrics: OpenMetrics 1.0 text (for scrapers that negotiate it);
+                False renders the Prometheus 0.0.4 text format read by the
+                node exporter's textfile collector
+
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            # OpenMetrics names the counter family without the _total suffix
+            family = metric.name if openmetrics or metric.type != "counter" else f"{metric.name}_total"
+            lines.append(f"# HELP {family} {metric.help}")
+            lines.append(f"# TYPE {family} {metric.type}")
+            for suffix, labels, value in metric.samples():
+                labels = {**self.const_labels, **labels}
+                lines.append(f"{metric.name}{suffix}{format_labels(labels)} {format_value(value)}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
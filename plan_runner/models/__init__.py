@@ -2,7 +2,7 @@
 
 from .config import PlanConfig, TaskConfig
 from .plan import Plan, Phase, Task, TaskTemplate, DataSource
-from .state import ExecutionState, TaskResult, TaskStatus, PhaseStatus
+from .state import ExecutionState, TaskResult, TaskTable, TaskStatus, PhaseStatus
 
 __all__ = [
     "PlanConfig",
@@ -14,6 +14,7 @@ __all__ = [
     "DataSource",
     "ExecutionState",
     "TaskResult",
+    "TaskTable",
     "TaskStatus",
     "PhaseStatus",
 ]
@@ -1,6 +1,6 @@
 """Configuration dataclasses for plan runner."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Optional
 from pathlib import Path
 
@@ -11,13 +11,58 @@ class PlanConfig:
 
     name: str = "Unnamed Plan"
     workers: int = 5
+    adaptive_workers: bool = False  # adjust in-flight tasks at runtime (AIMD)
+    min_workers: int = 1  # lower bound when adaptive
+    max_workers: Optional[int] = None  # upper bound when adaptive (default: 2 x workers)
     timeout: int = 3600  # seconds per task
     retries: int = 3
     retry_delay: int = 5  # base delay in seconds for exponential backoff
+    retry_jitter: float = 0.2  # +/- fraction of random spread applied to each backoff
+    retry_policies: dict = field(default_factory=dict)  # error class -> RetryPolicy overrides
+    max_failures: int = 0  # failed tasks in one phase that stop the run (0: no limit)
+    retry_budget: Optional[float] = None  # max share of all attempts that are retries, e.g. 0.2 (None: off)
+    retry_budget_min: int = 10  # retries granted regardless of retry_budget
+    breaker_threshold: int = 0  # consecutive failures with one cause that pause dispatch, e.g. 5 (0: off)
+    breaker_cooldown: float = 30.0  # seconds dispatch stays paused before a probe
+    breaker_probes: int = 5  # failed probes in a row that stop the run (0: keep probing)
     model: str = "sonnet"
+    requests_per_minute: Optional[int] = None  # client-side request budget (None: unlimited)
+    tokens_per_minute: Optional[int] = None  # client-side token budget (None: unlimited)
+    rate_limits: dict = field(default_factory=dict)  # model -> {"requests_per_minute", "tokens_per_minute"}
+    chars_per_token: float = 4.0  # prompt length per token for budget estimates
+    runner: str = "cli"  # "cli" (Claude CLI), "http" (Messages API, prompt-only tasks) or "fake" (load tests)
+    claude_command: str = "claude"  # CLI executable, optionally with leading arguments
+    api_url: str = "https://api.anthropic.com"  # Messages API base URL (http runner)
+    api_key_env: str = "ANTHROPIC_API_KEY"  # environment variable holding the API key
+    api_max_tokens: int = 8192  # max_tokens of each API request
+    http_pool_size: int = 10  # idle keep-alive connections kept open
+    http_max_per_host: int = 0  # connections in use per host at a time (0: no limit)
+    output_format: str = "json"  # "json" or "stream-json" (transcripts in output_dir)
+    output_tail_bytes: int = 65536  # CLI output kept in memory per task when streaming
     working_dir: str = "./"
     output_dir: str = "./output"
     state_file: str = "state.json"
+    state_backend: str = "json"  # "json" or "sqlite"
+    state_snapshot_interval: int = 1000  # min journal records between snapshots
+    state_flush_interval: float = 0.25  # seconds between background state flushes
+    state_flush_events: int = 500  # queued records that trigger an early flush
+    state_durability: str = "flush"  # "none", "flush" or "fsync"
+    cache: bool = False  # reuse outputs of identical earlier tasks
+    cache_dir: str = "cache"  # result cache, relative to output_dir
+    cache_max_mb: int = 1024  # evict least recently used results beyond this size
+    cache_max_age_days: float = 30  # evict results unused for longer
+    history_file: str = "history.db"  # task durations across runs, in output_dir ("" to disable)
+    progress_interval: float = 10.0  # seconds between progress/ETA lines
+    metrics_port: int = 0  # serve OpenMetrics on this port while running (0: off)
+    metrics_host: str = "127.0.0.1"  # address the metrics endpoint listens on
+    metrics_textfile: str = ""  # rewrite metrics to this file, in output_dir ("" to disable)
+    metrics_interval: float = 15.0  # seconds between metrics textfile rewrites
+    hedge: bool = False  # race stragglers of hedge: true templates against a copy-workspace attempt
+    hedge_percentile: float = 0.95  # hedge attempts slower than this share of their template
+    hedge_min_samples: int = 20  # durations per template needed before hedging it
+    hedge_link: list = field(default_factory=lambda: ["node_modules", ".git"])  # symlinked, not copied
+    execution: str = "pipeline"  # "pipeline" (task-level) or "barrier" (phase by phase)
+    engine: str = "threads"  # "threads" or "asyncio"
 
     @classmethod
     def from_dict(cls, data: dict) -> "PlanConfig":
@@ -25,27 +70,66 @@ class PlanConfig:
         return cls(
             name=data.get("name", cls.name),
             workers=data.get("workers", cls.workers),
+            adaptive_workers=data.get("adaptive_workers", cls.adaptive_workers),
+            min_workers=data.get("min_workers", cls.min_workers),
+            max_workers=data.get("max_workers", cls.max_workers),
             timeout=data.get("timeout", cls.timeout),
             retries=data.get("retries", cls.retries),
             retry_delay=data.get("retry_delay", cls.retry_delay),
+            retry_jitter=data.get("retry_jitter", cls.retry_jitter),
+            retry_policies=data.get("retry_policies", {}),
+            max_failures=data.get("max_failures", cls.max_failures),
+            retry_budget=data.get("retry_budget", cls.retry_budget),
+            retry_budget_min=data.get("retry_budget_min", cls.retry_budget_min),
+            breaker_threshold=data.get("breaker_threshold", cls.breaker_threshold),
+            breaker_cooldown=data.get("breaker_cooldown", cls.breaker_cooldown),
+            breaker_probes=data.get("breaker_probes", cls.breaker_probes),
             model=data.get("model", cls.model),
+            requests_per_minute=data.get("requests_per_minute", cls.requests_per_minute),
+            tokens_per_minute=data.get("tokens_per_minute", cls.tokens_per_minute),
+            rate_limits=data.get("rate_limits", {}),
+            chars_per_token=data.get("chars_per_token", cls.chars_per_token),
+            runner=data.get("runner", cls.runner),
+            claude_command=data.get("claude_command", cls.claude_command),
+            api_url=data.get("api_url", cls.api_url),
+            api_key_env=data.get("api_key_env", cls.api_key_env),
+            api_max_tokens=data.get("api_max_tokens", cls.api_max_tokens),
+            http_pool_size=data.get("http_pool_size", cls.http_pool_size),
+            http_max_per_host=data.get("http_max_per_host", cls.http_max_per_host),
+            output_format=data.get("output_format", cls.output_format),
+            output_tail_bytes=data.get("output_tail_bytes", cls.output_tail_bytes),
             working_dir=data.get("working_dir", cls.working_dir),
             output_dir=data.get("output_dir", cls.output_dir),
             state_file=data.get("state_file", cls.state_file),
+            state_backend=data.get("state_backend", cls.state_backend),
+            state_snapshot_interval=data.get("state_snapshot_interval", cls.state_snapshot_interval),
+            state_flush_interval=data.get("state_flush_interval", cls.state_flush_interval),
+            state_flush_events=data.get("state_flush_events", cls.state_flush_events),
+            state_durability=data.get("state_durability", cls.state_durability),
+            cache=data.get("cache", cls.cache),
+            cache_dir=data.get("cache_dir", cls.cache_dir),
+            cache_max_mb=data.get("cache_max_mb", cls.cache_max_mb),
+            cache_max_age_days=data.get("cache_max_age_days", cls.cache_max_age_days),
+            history_file=data.get("history_file", cls.history_file),
+            progress_interval=data.get("progress_interval", cls.progress_interval),
+            metrics_port=data.get("metrics_port", cls.metrics_port),
+            metrics_host=data.get("metrics_host", cls.metrics_host),
+            metrics_textfile=data.get("metrics_textfile", cls.metrics_textfile),
+            metrics_interval=data.get("metrics_interval", cls.metrics_interval),
+            hedge=data.get("hedge", cls.hedge),
+            hedge_percentile=data.get("hedge_percentile", cls.hedge_percentile),
+            hedge_min_samples=data.get("hedge_min_samples", cls.hedge_min_samples),
+            hedge_link=data.get("hedge_link", ["node_modules", ".git"]),
+            execution=data.get("execution", cls.execution),
+            engine=data.get("engine", cls.engine),
         )
 
     def resolve_paths(self, base_dir: Path) -> "PlanConfig":
         """Resolve relative paths against a base directory."""
-        return PlanConfig(
-            name=self.name,
-            workers=self.workers,
-            timeout=self.timeout,
-            retries=self.retries,
-            retry_delay=self.retry_delay,
-            model=self.model,
+        return replace(
+            self,
             working_dir=str((base_dir / self.working_dir).resolve()),
             output_dir=str((base_dir / self.output_dir).resolve()),
-            state_file=self.state_file,
         )
 
 
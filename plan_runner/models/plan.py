@@ -1,7 +1,7 @@
 """Plan, Phase, and Task data models."""
 
 from dataclasses import dataclass, field
-from typing import Optional, Any
+from typing import Callable, Optional, Any
 from enum import Enum
 
 
@@ -58,6 +58,8 @@ class TaskTemplate:
     prompt_template: str = ""
     outputs: list[TaskOutput] = field(default_factory=list)
     requirements: list[TaskRequirement] = field(default_factory=list)
+    priority: int = 0  # higher is dispatched first, ahead of critical-path order
+    hedge: bool = False  # output-only task that a hedged attempt may stand in for
 
     @classmethod
     def from_dict(cls, name: str, data: dict) -> "TaskTemplate":
@@ -84,6 +86,8 @@ class TaskTemplate:
             prompt_template=data.get("prompt", ""),
             outputs=outputs,
             requirements=requirements,
+            priority=int(data.get("priority", 0)),
+            hedge=bool(data.get("hedge", False)),
         )
 
 
@@ -97,6 +101,25 @@ class Task:
     outputs: dict[str, str] = field(default_factory=dict)  # name -> resolved path
     requirements: dict[str, str] = field(default_factory=dict)  # alias -> resolved path
     item_data: Optional[dict] = None  # Data from foreach iteration
+    dependencies: list[str] = field(default_factory=list)  # IDs of required tasks
+    priority: int = 0  # from the task template
+    template_name: str = ""
+    hedge: bool = False  # from the task template
+    # Renders the prompt on demand instead of holding it (see get_prompt)
+    render: Optional[Callable[[], str]] = field(default=None, repr=False, compare=False)
+    prompt_chars: int = 0  # prompt length estimate for lazily rendered tasks
+
+    def get_prompt(self) -> str:
+        """Get the prompt, rendering it if the task was created lazily."""
+        if self.render is None:
+            return self.prompt
+        prompt = self.render()
+        self.prompt_chars = len(prompt)
+        return prompt
+
+    def prompt_length(self) -> int:
+        """Prompt length in characters (estimated until a lazy task renders)."""
+        return self.prompt_chars if self.render is not None else len(self.prompt)
 
 
 @dataclass
@@ -106,6 +129,7 @@ class Phase:
     name: str
     execution: ExecutionMode = ExecutionMode.PARALLEL
     depends_on: list[str] = field(default_factory=list)
+    max_failures: Optional[int] = None  # overrides config.max_failures
     task_templates: list[TaskTemplate] = field(default_factory=list)
     tasks: list[Task] = field(default_factory=list)
 
@@ -126,6 +150,7 @@ class Phase:
             name=name,
             execution=execution,
             depends_on=depends_on,
+            max_failures=int(data["max_failures"]) if "max_failures" in data else None,
             task_templates=[],
             tasks=[],
         )
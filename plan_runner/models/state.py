@@ -1,10 +1,12 @@
 """Execution state models for tracking progress and enabling resume."""
 
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
-from typing import Optional, Any
+from typing import Iterator, Optional, Any
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
+import sys
 
 
 class TaskStatus(Enum):
@@ -25,18 +27,136 @@ class PhaseStatus(Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def iso_to_micros(timestamp: Optional[str]) -> Optional[int]:
+    """Convert an ISO timestamp to integer microseconds since the epoch.
+
+    Naive timestamps (as written by plan runner) are treated as wall-clock
+    time, so the conversion round-trips exactly through ``micros_to_iso``.
+    """
+    if timestamp is None:
+        return None
+    value = datetime.fromisoformat(timestamp)
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def micros_to_iso(micros: Optional[int]) -> Optional[str]:
+    """Convert integer microseconds since the epoch back to an ISO timestamp."""
+    if micros is None:
+        return None
+    return (_EPOCH + timedelta(microseconds=micros)).isoformat()
+
+
+def now_micros() -> int:
+    """Current wall-clock time in microseconds since the epoch."""
+    return (datetime.now() - _EPOCH) // _MICROSECOND
+
+
 class TaskResult:
-    """Result of a single task execution."""
+    """Result of a single task execution.
+
+    Stored compactly for plans with millions of tasks: ``__slots__`` instead
+    of an instance dict, interned phase names, integer microsecond timestamps
+    and no outputs dict until the task has outputs. ``started_at`` and
+    ``completed_at`` are still exposed as ISO strings.
+    """
+
+    __slots__ = (
+        "task_id",
+        "phase_name",
+        "status",
+        "attempts",
+        "error_message",
+        "started_ts",
+        "completed_ts",
+        "_outputs",
+        "transcript",
+        "fingerprint",
+        "error_class",
+    )
+
+    def __init__(
+        self,
+        task_id: str,
+        phase_name: str,
+        status: TaskStatus = TaskStatus.PENDING,
+        started_at: Optional[str] = None,
+        completed_at: Optional[str] = None,
+        attempts: int = 0,
+        error_message: Optional[str] = None,
+        outputs: Optional[dict[str, str]] = None,
+        transcript: Optional[str] = None,
+        fingerprint: Optional[dict] = None,
+        error_class: Optional[str] = None,
+    ):
+        self.task_id = task_id
+        self.phase_name = sys.intern(phase_name)
+        self.status = status
+        self.attempts = attempts
+        self.error_message = error_message
+        self.started_ts: Optional[int] = iso_to_micros(started_at)
+        self.completed_ts: Optional[int] = iso_to_micros(completed_at)
+        self._outputs = outputs or None  # output name -> path
+        self.transcript = transcript  # path of the CLI transcript, if captured
+        self.fingerprint = fingerprint  # inputs and outputs at completion (see state.fingerprint)
+        self.error_class = error_class  # kind of the last failure (see executor.failures)
+
+    @property
+    def started_at(self) -> Optional[str]:
+        """Start time as an ISO string."""
+        return micros_to_iso(self.started_ts)
+
+    @started_at.setter
+    def started_at(self, value: Optional[str]) -> None:
+        self.started_ts = iso_to_micros(value)
+
+    @property
+    def completed_at(self) -> Optional[str]:
+        """Completion time as an ISO string."""
+        return micros_to_iso(self.completed_ts)
+
+    @completed_at.setter
+    def completed_at(self, value: Optional[str]) -> None:
+        self.completed_ts = iso_to_micros(value)
+
+    @property
+    def outputs(self) -> dict[str, str]:
+        """Output name -> path."""
+        return self._outputs if self._outputs is not None else {}
+
+    @outputs.setter
+    def outputs(self, value: Optional[dict[str, str]]) -> None:
+        self._outputs = value or None
+
+    def is_untouched(self) -> bool:
+        """Check whether the task has never been started."""
+        return (
+            self.status == TaskStatus.PENDING
+            and self.attempts == 0
+            and self.started_ts is None
+            and self.completed_ts is None
+            and self.error_message is None
+            and self._outputs is None
+            and self.transcript is None
+            and self.fingerprint is None
+            and self.error_class is None
+        )
 
-    task_id: str
-    phase_name: str
-    status: TaskStatus = TaskStatus.PENDING
-    started_at: Optional[str] = None
-    completed_at: Optional[str] = None
-    attempts: int = 0
-    error_message: Optional[str] = None
-    outputs: dict[str, str] = field(default_factory=dict)  # output name -> path
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TaskResult):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return (
+            f"TaskResult(task_id={self.task_id!r}, phase_name={self.phase_name!r}, "
+            f"status={self.status}, attempts={self.attempts})"
+        )
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
@@ -49,6 +169,9 @@ class TaskResult:
             "attempts": self.attempts,
             "error_message": self.error_message,
             "outputs": self.outputs,
+            "transcript": self.transcript,
+            "fingerprint": self.fingerprint,
+            "error_class": self.error_class,
         }
 
     @classmethod
@@ -63,26 +186,131 @@ class TaskResult:
             attempts=data.get("attempts", 0),
             error_message=data.get("error_message"),
             outputs=data.get("outputs", {}),
+            transcript=data.get("transcript"),
+            fingerprint=data.get("fingerprint"),
+            error_class=data.get("error_class"),
         )
 
-    def mark_started(self) -> None:
+    def mark_started(self, timestamp: Optional[str] = None) -> None:
         """Mark task as started."""
         self.status = TaskStatus.RUNNING
-        self.started_at = datetime.now().isoformat()
+        self.started_ts = iso_to_micros(timestamp) if timestamp else now_micros()
         self.attempts += 1
 
-    def mark_completed(self, outputs: dict[str, str]) -> None:
+    def mark_completed(
+        self,
+        outputs: dict[str, str],
+        timestamp: Optional[str] = None,
+        transcript: Optional[str] = None,
+        fingerprint: Optional[dict] = None,
+    ) -> None:
         """Mark task as completed."""
         self.status = TaskStatus.COMPLETED
-        self.completed_at = datetime.now().isoformat()
+        self.completed_ts = iso_to_micros(timestamp) if timestamp else now_micros()
         self.outputs = outputs
         self.error_message = None
-
-    def mark_failed(self, error: str) -> None:
+        self.error_class = None
+        if transcript:
+            self.transcript = transcript
+        self.fingerprint = fingerprint
+
+    def mark_failed(
+        self,
+        error: str,
+        timestamp: Optional[str] = None,
+        transcript: Optional[str] = None,
+        error_class: Optional[str] = None,
+    ) -> None:
         """Mark task as failed."""
         self.status = TaskStatus.FAILED
-        self.completed_at = datetime.now().isoformat()
+        self.completed_ts = iso_to_micros(timestamp) if timestamp else now_micros()
         self.error_message = error
+        self.error_class = error_class
+        if transcript:
+            self.transcript = transcript
+
+    def reset(self) -> None:
+        """Return task to pending, keeping its attempt count and last outcome."""
+        self.status = TaskStatus.PENDING
+        self.started_ts = None
+        self.completed_ts = None
+
+
+class TaskTable(MutableMapping):
+    """Mapping of task ID -> TaskResult that stores untouched tasks implicitly.
+
+    Every task costs one dict entry mapping its ID to its (interned) phase
+    name. A TaskResult is only kept for tasks that have been started;
+    reading an untouched task returns a fresh PENDING result that is not
+    stored, so it must be written back (or transitioned through
+    ExecutionState) to persist any change.
+    """
+
+    def __init__(self):
+        self._phases: dict[str, str] = {}
+        self._records: dict[str, TaskResult] = {}
+
+    def add_pending(self, task_id: str, phase_name: str) -> None:
+        """Register an untouched task."""
+        self._phases[task_id] = sys.intern(phase_name)
+        self._records.pop(task_id, None)
+
+    def phase_of(self, task_id: str) -> str:
+        """Get a task's phase name without materializing a result."""
+        return self._phases[task_id]
+
+    def status_of(self, task_id: str) -> TaskStatus:
+        """Get a task's status without materializing a result."""
+        record = self._records.get(task_id)
+        if record is not None:
+            return record.status
+        if task_id not in self._phases:
+            raise KeyError(task_id)
+        return TaskStatus.PENDING
+
+    def materialize(self, task_id: str) -> TaskResult:
+        """Get the stored result for a task, creating it if untouched."""
+        record = self._records.get(task_id)
+        if record is None:
+            record = TaskResult(task_id=task_id, phase_name=self._phases[task_id])
+            self._records[task_id] = record
+        return record
+
+    def iter_entries(self) -> Iterator[tuple[str, str, Optional[TaskResult]]]:
+        """Iterate (task_id, phase_name, stored result or None) without materializing."""
+        records = self._records
+        for task_id, phase_name in self._phases.items():
+            yield task_id, phase_name, records.get(task_id)
+
+    def touched_count(self) -> int:
+        """Number of tasks with a stored result."""
+        return len(self._records)
+
+    def __getitem__(self, task_id: str) -> TaskResult:
+        record = self._records.get(task_id)
+        if record is not None:
+            return record
+        return TaskResult(task_id=task_id, phase_name=self._phases[task_id])
+
+    def __setitem__(self, task_id: str, result: TaskResult) -> None:
+        if result.is_untouched():
+            self.add_pending(task_id, result.phase_name)
+        else:
+            self._phases[task_id] = result.phase_name
+            self._records[task_id] = result
+
+    def __delitem__(self, task_id: str) -> None:
+        del self._phases[task_id]
+        self._records.pop(task_id, None)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._phases
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._phases)
+
+    def __len__(self) -> int:
+        return len(self._phases)
 
 
 @dataclass
@@ -116,14 +344,38 @@ class PhaseResult:
 
 @dataclass
 class ExecutionState:
-    """Complete execution state for a plan run."""
+    """Complete execution state for a plan run.
+
+    Tasks live in a sparse TaskTable: untouched tasks are stored implicitly
+    as PENDING. Alongside it the state keeps each phase's task IDs in plan
+    order and a live index of started tasks by phase and status. Tasks must
+    be added with ``add_task``/``add_pending_task`` and transitioned with
+    ``mark_started``/``mark_completed``/``mark_failed``/``reset_task`` so that the index
+    stays in sync; completion checks and stats then cost O(1) regardless of
+    plan size.
+    """
 
     plan_name: str
     plan_file: str
     started_at: str = field(default_factory=lambda: datetime.now().isoformat())
     completed_at: Optional[str] = None
     phases: dict[str, PhaseResult] = field(default_factory=dict)
-    tasks: dict[str, TaskResult] = field(default_factory=dict)
+    tasks: TaskTable = field(default_factory=TaskTable)
+    journal_seq: int = 0  # sequence number of the last journal record applied
+    # run-level events (e.g. concurrency adjustments), oldest first
+    events: list[dict] = field(default_factory=list)
+    # phase name -> task IDs in plan order
+    _members: dict[str, list[str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # phase name -> status -> insertion-ordered task IDs (PENDING is implicit)
+    _index: dict[str, dict[TaskStatus, dict[str, None]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _status_counts: dict[TaskStatus, int] = field(
+        default_factory=lambda: {status: 0 for status in TaskStatus},
+        init=False, repr=False, compare=False,
+    )
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
@@ -132,8 +384,10 @@ class ExecutionState:
             "plan_file": self.plan_file,
             "started_at": self.started_at,
             "completed_at": self.completed_at,
+            "journal_seq": self.journal_seq,
             "phases": {name: result.to_dict() for name, result in self.phases.items()},
             "tasks": {task_id: result.to_dict() for task_id, result in self.tasks.items()},
+            "events": self.events,
         }
 
     @classmethod
@@ -144,13 +398,15 @@ class ExecutionState:
             plan_file=data["plan_file"],
             started_at=data.get("started_at", datetime.now().isoformat()),
             completed_at=data.get("completed_at"),
+            journal_seq=data.get("journal_seq", 0),
+            events=data.get("events", []),
         )
 
         for name, phase_data in data.get("phases", {}).items():
             state.phases[name] = PhaseResult.from_dict(phase_data)
 
-        for task_id, task_data in data.get("tasks", {}).items():
-            state.tasks[task_id] = TaskResult.from_dict(task_data)
+        for task_data in data.get("tasks", {}).values():
+            state.add_task(TaskResult.from_dict(task_data))
 
         return state
 
@@ -163,6 +419,100 @@ class ExecutionState:
         """Deserialize from JSON string."""
         return cls.from_dict(json.loads(json_str))
 
+    def add_pending_task(self, task_id: str, phase_name: str) -> None:
+        """Add an untouched task without allocating a TaskResult.
+
+        Args:
+            task_id: Task identifier
+            phase_name: Phase the task belongs to
+        """
+        if task_id in self.tasks:
+            self.add_task(TaskResult(task_id=task_id, phase_name=phase_name))
+            return
+        self._members.setdefault(phase_name, []).append(task_id)
+        self.tasks.add_pending(task_id, phase_name)
+        self._status_counts[TaskStatus.PENDING] += 1
+
+    def add_task(self, result: TaskResult) -> None:
+        """Add (or replace) a task result and index it.
+
+        Args:
+            result: Task result to add
+        """
+        task_id = result.task_id
+        if task_id in self.tasks:
+            self._unindex(task_id, self.tasks.phase_of(task_id), self.tasks.status_of(task_id))
+        else:
+            self._members.setdefault(result.phase_name, []).append(task_id)
+        self.tasks[task_id] = result
+        self._reindex(task_id, result.phase_name, result.status)
+
+    def mark_started(self, task_id: str, timestamp: Optional[str] = None) -> None:
+        """Mark a task as started, keeping the index in sync."""
+        result = self._begin_transition(task_id)
+        result.mark_started(timestamp)
+        self._reindex(task_id, result.phase_name, result.status)
+
+    def mark_completed(
+        self,
+        task_id: str,
+        outputs: dict[str, str],
+        timestamp: Optional[str] = None,
+        transcript: Optional[str] = None,
+        fingerprint: Optional[dict] = None,
+    ) -> None:
+        """Mark a task as completed, keeping the index in sync."""
+        result = self._begin_transition(task_id)
+        result.mark_completed(outputs, timestamp, transcript, fingerprint)
+        self._reindex(task_id, result.phase_name, result.status)
+
+    def mark_failed(
+        self,
+        task_id: str,
+        error: str,
+        timestamp: Optional[str] = None,
+        transcript: Optional[str] = None,
+        error_class: Optional[str] = None,
+    ) -> None:
+        """Mark a task as failed, keeping the index in sync."""
+        result = self._begin_transition(task_id)
+        result.mark_failed(error, timestamp, transcript, error_class)
+        self._reindex(task_id, result.phase_name, result.status)
+
+    def reset_task(self, task_id: str) -> None:
+        """Return a task to PENDING so that it runs again.
+
+        The task keeps its total of attempts across runs.
+        """
+        result = self._begin_transition(task_id)
+        result.reset()
+        if result.is_untouched():
+            self.tasks.add_pending(task_id, result.phase_name)
+        self._reindex(task_id, result.phase_name, TaskStatus.PENDING)
+
+    def _begin_transition(self, task_id: str) -> TaskResult:
+        """Materialize a task's result and remove it from the index."""
+        result = self.tasks.materialize(task_id)
+        self._unindex(task_id, result.phase_name, result.status)
+        return result
+
+    def _unindex(self, task_id: str, phase_name: str, status: TaskStatus) -> None:
+        """Remove a task from the index bucket for a status."""
+        if status != TaskStatus.PENDING:
+            del self._index[phase_name][status][task_id]
+        self._status_counts[status] -= 1
+
+    def _reindex(self, task_id: str, phase_name: str, status: TaskStatus) -> None:
+        """Add a task to the index bucket for a status."""
+        if status != TaskStatus.PENDING:
+            phase_index = self._index.get(phase_name)
+            if phase_index is None:
+                phase_index = self._index[phase_name] = {
+                    s: {} for s in TaskStatus if s != TaskStatus.PENDING
+                }
+            phase_index[status][task_id] = None
+        self._status_counts[status] += 1
+
     def get_task_result(self, task_id: str) -> TaskResult:
         """Get or create task result."""
         if task_id not in self.tasks:
@@ -176,40 +526,61 @@ class ExecutionState:
             self.phases[phase_name] = PhaseResult(phase_name=phase_name)
         return self.phases[phase_name]
 
+    def get_task_ids(self, phase_name: str, status: TaskStatus) -> list[str]:
+        """Get task IDs in a phase with a given status.
+
+        O(k) for started statuses; PENDING scans the phase's members since
+        untouched tasks are not indexed.
+        """
+        if status == TaskStatus.PENDING:
+            status_of = self.tasks.status_of
+            return [
+                task_id for task_id in self._members.get(phase_name, [])
+                if status_of(task_id) == TaskStatus.PENDING
+            ]
+        phase_index = self._index.get(phase_name)
+        if phase_index is None:
+            return []
+        return list(phase_index[status])
+
+    def get_tasks_with_status(self, status: TaskStatus) -> list[TaskResult]:
+        """Get results of all tasks with a given status, across phases."""
+        return [
+            self.tasks[task_id]
+            for phase_name in self._members
+            for task_id in self.get_task_ids(phase_name, status)
+        ]
+
     def get_pending_tasks(self, phase_name: str) -> list[str]:
         """Get task IDs that are pending or failed in a phase."""
-        pending = []
-        for task_id, result in self.tasks.items():
-            if result.phase_name == phase_name:
-                if result.status in (TaskStatus.PENDING, TaskStatus.FAILED):
-                    pending.append(task_id)
-        return pending
+        status_of = self.tasks.status_of
+        return [
+            task_id for task_id in self._members.get(phase_name, [])
+            if status_of(task_id) in (TaskStatus.PENDING, TaskStatus.FAILED)
+        ]
 
     def get_completed_task_outputs(self, task_id: str) -> dict[str, str]:
         """Get outputs from a completed task."""
-        if task_id in self.tasks:
-            result = self.tasks[task_id]
-            if result.status == TaskStatus.COMPLETED:
-                return result.outputs
+        if task_id in self.tasks and self.tasks.status_of(task_id) == TaskStatus.COMPLETED:
+            return self.tasks[task_id].outputs
         return {}
 
     def is_phase_complete(self, phase_name: str) -> bool:
         """Check if all tasks in a phase are completed."""
-        phase_tasks = [r for r in self.tasks.values() if r.phase_name == phase_name]
-        return all(t.status == TaskStatus.COMPLETED for t in phase_tasks)
+        members = self._members.get(phase_name)
+        if not members:
+            return True
+        phase_index = self._index.get(phase_name)
+        if phase_index is None:
+            return False
+        return len(phase_index[TaskStatus.COMPLETED]) == len(members)
 
     def get_stats(self) -> dict:
         """Get execution statistics."""
-        total = len(self.tasks)
-        completed = sum(1 for t in self.tasks.values() if t.status == TaskStatus.COMPLETED)
-        failed = sum(1 for t in self.tasks.values() if t.status == TaskStatus.FAILED)
-        pending = sum(1 for t in self.tasks.values() if t.status == TaskStatus.PENDING)
-        running = sum(1 for t in self.tasks.values() if t.status == TaskStatus.RUNNING)
-
         return {
-            "total": total,
-            "completed": completed,
-            "failed": failed,
-            "pending": pending,
-            "running": running,
+            "total": len(self.tasks),
+            "completed": self._status_counts[TaskStatus.COMPLETED],
+            "failed": self._status_counts[TaskStatus.FAILED],
+            "pending": self._status_counts[TaskStatus.PENDING],
+            "running": self._status_counts[TaskStatus.RUNNING],
         }
@@ -180,6 +180,15 @@ class PlanParser:
         # Parse prompt block
         prompt = PromptParser.extract_prompt(content) or ""
 
+        try:
+            priority = int(data.get("priority", 0))
+        except ValueError:
+            raise ValueError(f"Invalid priority for task template {name}: {data['priority']}")
+
+        hedge = data.get("hedge", "false").lower()
+        if hedge not in ("true", "false"):
+            raise ValueError(f"Invalid hedge for task template {name}: {data['hedge']} (expected true or false)")
+
         return TaskTemplate(
             name=name,
             foreach=data.get("foreach"),
@@ -187,6 +196,8 @@ class PlanParser:
             prompt_template=prompt,
             outputs=outputs,
             requirements=requires,
+            priority=priority,
+            hedge=hedge == "true",
         )
 
     def _parse_outputs_section(self, content: str) -> list[TaskOutput]:
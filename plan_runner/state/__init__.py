@@ -1,5 +1,20 @@
 """State management modules."""
 
 from .state_manager import StateManager
+from .journal import StateJournal
+from .backend import StateBackend, JsonStateBackend, create_backend
+from .sqlite_backend import SqliteStateBackend
+from .history import HistoryStore, DurationPredictor
+from .result_cache import ResultCache
 
-__all__ = ["StateManager"]
+__all__ = [
+    "StateManager",
+    "StateJournal",
+    "StateBackend",
+    "JsonStateBackend",
+    "SqliteStateBackend",
+    "create_backend",
+    "HistoryStore",
+    "DurationPredictor",
+    "ResultCache",
+]
@@ -0,0 +1,189 @@
+"""Pluggable persistence backends for execution state."""
+
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+from ..models.state import ExecutionState
+from .journal import StateJournal
+from .codec import codec_for_path, read_state
+
+
+class StateBackend:
+    """Base class for state persistence backends.
+
+    StateManager keeps the authoritative state in memory and hands the
+    backend two kinds of writes:
+    - snapshots: a full copy of the state, produced by ``serialize`` while
+      the state lock is held and written by ``write_snapshot`` outside it
+    - batches: lists of transition records (see ``journal.apply_record``)
+    """
+
+    name = ""
+
+    def __init__(self, path: Path, durability: str = "flush"):
+        """Initialize backend.
+
+        Args:
+            path: Path to the state file
+            durability: "none", "flush" or "fsync"
+        """
+        self.path = Path(path)
+        self.durability = durability
+
+    def exists(self) -> bool:
+        """Check whether saved state exists."""
+        return self.path.exists()
+
+    def load(self) -> Optional[ExecutionState]:
+        """Load saved state.
+
+        Returns:
+            ExecutionState if saved state exists, None otherwise
+        """
+        raise NotImplementedError
+
+    def wants_snapshot(self, pending: int, task_count: int, final: bool = False) -> bool:
+        """Decide whether the next flush should write a snapshot instead of a batch.
+
+        Args:
+            pending: Number of records about to be flushed
+            task_count: Number of tasks in the state
+            final: True when the execution has completed
+
+        Returns:
+            True to write a snapshot
+        """
+        return False
+
+    def serialize(self, state: ExecutionState) -> Any:
+        """Capture a snapshot of the state. Called with the state lock held."""
+        raise NotImplementedError
+
+    def write_snapshot(self, snapshot: Any) -> None:
+        """Persist a snapshot produced by ``serialize``."""
+        raise NotImplementedError
+
+    def append(self, records: list[dict]) -> None:
+        """Persist a batch of transition records."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any open resources."""
+
+
+class JsonStateBackend(StateBackend):
+    """Snapshot file plus append-only journal (the default backend).
+
+    The snapshot is indented JSON by default; a ``.bin``/``.marshal`` or
+    ``.msgpack`` state file selects a compact binary codec instead (see
+    ``codec``). The snapshot is rewritten, and the journal truncated, once
+    the journal holds at least ``snapshot_interval`` records or as many
+    records as there are tasks, whichever is larger, which keeps the
+    amortized cost per event constant as plans grow.
+    """
+
+    name = "json"
+
+    def __init__(self, path: Path, durability: str = "flush", snapshot_interval: int = 1000):
+        """Initialize backend.
+
+        Args:
+            path: Path to the state snapshot file
+            durability: "none", "flush" or "fsync"
+            snapshot_interval: Minimum journal records between snapshots
+        """
+        super().__init__(path, durability)
+        self.snapshot_interval = snapshot_interval
+        self.codec = codec_for_path(self.path)
+        self.journal = StateJournal(self.path.with_name(self.path.name + ".journal"))
+
+    def load(self) -> Optional[ExecutionState]:
+        """Load the snapshot and replay the journal tail."""
+        if not self.path.exists():
+            return None
+
+        try:
+            state = read_state(self.path)
+            replayed = self.journal.replay(state)
+        except (ValueError, KeyError, EOFError) as e:
+            print(f"Warning: Could not load state file: {e}")
+            return None
+
+        # Fold the replayed tail into a fresh snapshot
+        if replayed:
+            self.write_snapshot(self.serialize(state))
+        return state
+
+    def wants_snapshot(self, pending: int, task_count: int, final: bool = False) -> bool:
+        """Compact once the journal outgrows the snapshot, and at completion."""
+        threshold = max(self.snapshot_interval, task_count)
+        return final or self.journal.record_count + pending >= threshold
+
+    def serialize(self, state: ExecutionState) -> bytes:
+        """Serialize the state with the codec for the file extension."""
+        return self.codec.encode(state)
+
+    def write_snapshot(self, snapshot: bytes) -> None:
+        """Atomically replace the snapshot file and truncate the journal."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.path.with_name(self.path.name + ".tmp")
+        with tmp_file.open("wb") as f:
+            f.write(snapshot)
+            if self.durability == "fsync":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_file, self.path)
+        self.journal.reset()
+
+    def append(self, records: list[dict]) -> None:
+        """Append records to the journal."""
+        self.journal.append_batch(records, self.durability)
+
+    def close(self) -> None:
+        """Close the journal file handle."""
+        self.journal.close()
+
+
+STATE_BACKENDS = ("json", "sqlite")
+
+
+def create_backend(
+    name: str,
+    path: Path,
+    durability: str = "flush",
+    snapshot_interval: int = 1000,
+) -> StateBackend:
+    """Create a state backend by name.
+
+    Args:
+        name: One of STATE_BACKENDS
+        path: Path to the state file
+        durability: "none", "flush" or "fsync"
+        snapshot_interval: Minimum journal records between JSON snapshots
+
+    Returns:
+        StateBackend instance
+    """
+    if name == "json":
+        return JsonStateBackend(path, durability, snapshot_interval)
+    if name == "sqlite":
+        from .sqlite_backend import SqliteStateBackend
+        return SqliteStateBackend(path, durability)
+    raise ValueError(f"Unknown state backend: {name}")
+
+
+def default_state_path(state_file: Path, backend: str) -> Path:
+    """Adjust the default state file name to the backend.
+
+    Args:
+        state_file: Configured state file path
+        backend: Backend name
+
+    Returns:
+        ``state.db`` instead of ``state.json`` for SQLite, else unchanged
+    """
+    state_file = Path(state_file)
+    if backend == "sqlite" and state_file.suffix == ".json":
+        return state_file.with_suffix(".db")
+    return state_file
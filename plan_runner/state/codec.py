@@ -0,0 +1,310 @@
+"""Serialization codecs for execution state snapshots.
+
+Two families of formats are supported:
+- JSON (``.json``): human-readable, indented. Parsed with orjson when it is
+  installed.
+- Framed binary (``.bin``/``.marshal`` via marshal, ``.msgpack`` via msgpack
+  when installed): an 8-byte magic header followed by length-prefixed
+  frames. The first frame holds plan and phase metadata; every following
+  frame holds a batch of task rows, so decoding streams the file batch by
+  batch instead of materializing the whole document.
+
+Writers pick the codec from the file extension; readers sniff the magic
+header, so a binary snapshot is recognised whatever it is called.
+"""
+
+import json
+import marshal
+import struct
+import sys
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Union
+
+from ..models.state import ExecutionState, TaskResult, PhaseResult, TaskStatus
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional binary format
+    msgpack = None
+
+
+MAGIC = b"PRSTATE"  # followed by a one-byte format id
+FRAME_HEADER = struct.Struct("<I")
+BATCH_SIZE = 4096
+
+# Integer codes used in binary task rows
+STATUS_CODES = {status: code for code, status in enumerate(TaskStatus)}
+STATUS_BY_CODE = list(TaskStatus)
+
+
+def json_dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Encode JSON, using orjson when installed.
+
+    Args:
+        obj: Object to encode
+        pretty: Indent for human readers
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class StateCodec:
+    """Base class for snapshot codecs."""
+
+    name = ""
+    extensions: tuple[str, ...] = ()
+
+    def encode(self, state: ExecutionState) -> bytes:
+        """Serialize a state to bytes."""
+        raise NotImplementedError
+
+    def decode(self, handle: BinaryIO) -> ExecutionState:
+        """Deserialize a state from an open binary file."""
+        raise NotImplementedError
+
+
+class JsonCodec(StateCodec):
+    """Indented JSON, compatible with ExecutionState.to_json/from_json."""
+
+    name = "json"
+    extensions = (".json",)
+
+    def encode(self, state: ExecutionState) -> bytes:
+        """Serialize to indented JSON."""
+        return json_dumps(state.to_dict(), pretty=True)
+
+    def decode(self, handle: BinaryIO) -> ExecutionState:
+        """Parse the whole document."""
+        return ExecutionState.from_dict(json_loads(handle.read()))
+
+
+class FramedCodec(StateCodec):
+    """Length-prefixed frames of plain Python values.
+
+    Task rows are ``(task_id, phase_index)`` for untouched tasks and
+    ``(task_id, phase_index, status_code, started_us, completed_us, attempts,
+    error_message, outputs, transcript, fingerprint, error_class)`` otherwise. Each batch frame carries its own
+    phase-name table so frames decode independently.
+    """
+
+    format_id = b""
+
+    def pack(self, obj: Any) -> bytes:
+        """Encode one frame payload."""
+        raise NotImplementedError
+
+    def unpack(self, data: bytes) -> Any:
+        """Decode one frame payload."""
+        raise NotImplementedError
+
+    def encode(self, state: ExecutionState) -> bytes:
+        """Serialize header and task batches."""
+        header = {
+            "plan_name": state.plan_name,
+            "plan_file": state.plan_file,
+            "started_at": state.started_at,
+            "completed_at": state.completed_at,
+            "journal_seq": state.journal_seq,
+            "phases": [phase.to_dict() for phase in state.phases.values()],
+            "events": state.events,
+            "task_count": len(state.tasks),
+        }
+        chunks = [MAGIC + self.format_id, self._frame(header)]
+
+        phase_table: dict[str, int] = {}
+        rows: list[tuple] = []
+        for task_id, phase_name, record in state.tasks.iter_entries():
+            phase_index = phase_table.get(phase_name)
+            if phase_index is None:
+                phase_index = phase_table[phase_name] = len(phase_table)
+            if record is None:
+                rows.append((task_id, phase_index))
+            else:
+                rows.append((
+                    task_id,
+                    phase_index,
+                    STATUS_CODES[record.status],
+                    record.started_ts,
+                    record.completed_ts,
+                    record.attempts,
+                    record.error_message,
+                    record.outputs or None,
+                    record.transcript,
+                    record.fingerprint,
+                    record.error_class,
+                ))
+            if len(rows) >= BATCH_SIZE:
+                chunks.append(self._frame((list(phase_table), rows)))
+                phase_table, rows = {}, []
+        if rows:
+            chunks.append(self._frame((list(phase_table), rows)))
+
+        return b"".join(chunks)
+
+    def decode(self, handle: BinaryIO) -> ExecutionState:
+        """Stream frames into a new state."""
+        magic = handle.read(len(MAGIC) + 1)
+        if magic != MAGIC + self.format_id:
+            raise ValueError("Not a plan runner state file")
+
+        frames = self._iter_frames(handle)
+        header = next(frames)
+        state = ExecutionState(
+            plan_name=header["plan_name"],
+            plan_file=header["plan_file"],
+            started_at=header["started_at"],
+            completed_at=header["completed_at"],
+            journal_seq=header["journal_seq"],
+            events=header.get("events", []),
+        )
+        for phase_data in header["phases"]:
+            state.phases[phase_data["phase_name"]] = PhaseResult.from_dict(phase_data)
+
+        for phase_names, rows in frames:
+            phase_names = [sys.intern(name) for name in phase_names]
+            for row in rows:
+                if len(row) == 2:
+                    state.add_pending_task(row[0], phase_names[row[1]])
+                    continue
+                task_id, phase_index, status, started, completed, attempts, error, outputs = row[:8]
+                result = TaskResult(
+                    task_id=task_id,
+                    phase_name=phase_names[phase_index],
+                    status=STATUS_BY_CODE[status],
+                    attempts=attempts,
+                    error_message=error,
+                    outputs=outputs,
+                    transcript=row[8] if len(row) > 8 else None,
+                    fingerprint=row[9] if len(row) > 9 else None,
+                    error_class=row[10] if len(row) > 10 else None,
+                )
+                result.started_ts = started
+                result.completed_ts = completed
+                state.add_task(result)
+
+        return state
+
+    def _frame(self, obj: Any) -> bytes:
+        """Encode a length-prefixed frame."""
+        payload = self.pack(obj)
+        return FRAME_HEADER.pack(len(payload)) + payload
+
+    def _iter_frames(self, handle: BinaryIO) -> Iterator[Any]:
+        """Read frames until end of file."""
+        while True:
+            size_bytes = handle.read(FRAME_HEADER.size)
+            if not size_bytes:
+                return
+            if len(size_bytes) < FRAME_HEADER.size:
+                raise ValueError("Truncated state file")
+            (size,) = FRAME_HEADER.unpack(size_bytes)
+            payload = handle.read(size)
+            if len(payload) < size:
+                raise ValueError("Truncated state file")
+            yield self.unpack(payload)
+
+
+class MarshalCodec(FramedCodec):
+    """Framed codec using the stdlib marshal module (local files only)."""
+
+    name = "marshal"
+    extensions = (".bin", ".marshal")
+    format_id = b"M"
+
+    def pack(self, obj: Any) -> bytes:
+        """Encode with marshal."""
+        return marshal.dumps(obj)
+
+    def unpack(self, data: bytes) -> Any:
+        """Decode with marshal."""
+        return marshal.loads(data)
+
+
+class MsgpackCodec(FramedCodec):
+    """Framed codec using msgpack (requires the msgpack package)."""
+
+    name = "msgpack"
+    extensions = (".msgpack",)
+    format_id = b"P"
+
+    def pack(self, obj: Any) -> bytes:
+        """Encode with msgpack."""
+        if msgpack is None:
+            raise ValueError("The msgpack package is required for .msgpack state files")
+        return msgpack.packb(obj, use_bin_type=True)
+
+    def unpack(self, data: bytes) -> Any:
+        """Decode with msgpack."""
+        if msgpack is None:
+            raise ValueError("The msgpack package is required for .msgpack state files")
+        return msgpack.unpackb(data, raw=False)
+
+
+CODECS: list[StateCodec] = [JsonCodec(), MarshalCodec(), MsgpackCodec()]
+
+
+def codec_for_path(path: Path) -> StateCodec:
+    """Choose a codec from a file extension (JSON if unknown).
+
+    Args:
+        path: State file path
+
+    Returns:
+        Matching codec
+    """
+    suffix = Path(path).suffix.lower()
+    for codec in CODECS:
+        if suffix in codec.extensions:
+            return codec
+    return CODECS[0]
+
+
+def sniff_codec(handle: BinaryIO) -> StateCodec:
+    """Choose a codec from a file's magic header.
+
+    Args:
+        handle: Seekable binary file positioned at the start
+
+    Returns:
+        Matching codec
+    """
+    head = handle.read(len(MAGIC) + 1)
+    handle.seek(0)
+    if head[:len(MAGIC)] == MAGIC:
+        for codec in CODECS:
+            if isinstance(codec, FramedCodec) and codec.format_id == head[len(MAGIC):]:
+                return codec
+        raise ValueError(f"Unknown state format: {head!r}")
+    return CODECS[0]
+
+
+def read_state(path: Path) -> ExecutionState:
+    """Read a state snapshot in any supported format.
+
+    Args:
+        path: State file path
+
+    Returns:
+        Decoded state
+    """
+    with Path(path).open("rb") as handle:
+        return sniff_codec(handle).decode(handle)
+
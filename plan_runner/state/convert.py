@@ -0,0 +1,40 @@
+"""Convert a state file (snapshot + journal) between formats.
+
+Usage:
+    python -m plan_runner.state.convert state.bin state.json
+
+Kept out of ``codec`` so that running it with ``-m`` does not execute a
+module the ``plan_runner.state`` package has already imported.
+"""
+
+import argparse
+from pathlib import Path
+
+from .codec import codec_for_path, read_state
+from .journal import StateJournal
+
+
+def main(args: list[str] = None) -> int:
+    """Convert a state file, e.g. to JSON for debugging."""
+    parser = argparse.ArgumentParser(
+        prog="plan_runner.state.convert",
+        description="Convert plan runner state between formats, e.g. to JSON for debugging",
+    )
+    parser.add_argument("source", type=Path, help="State file to read")
+    parser.add_argument("target", type=Path, help="File to write (format from extension)")
+    parsed = parser.parse_args(args)
+
+    try:
+        state = read_state(parsed.source)
+    except (OSError, ValueError, EOFError) as e:
+        print(f"Error: Could not read state: {e}")
+        return 1
+    # Read-only: a torn journal tail is skipped, not truncated
+    StateJournal(parsed.source.with_name(parsed.source.name + ".journal")).replay(state, repair=False)
+    parsed.target.write_bytes(codec_for_path(parsed.target).encode(state))
+    print(f"Wrote {len(state.tasks)} tasks to {parsed.target}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
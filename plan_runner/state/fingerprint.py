@@ -0,0 +1,112 @@
+"""Fingerprints of task inputs and outputs for incremental runs."""
+
+import hashlib
+from stat import S_ISREG
+from typing import Optional
+
+from ..models.plan import Task
+from .result_cache import file_digest, resolve_path
+
+
+def prompt_digest(prompt: str) -> str:
+    """SHA-256 of a rendered prompt."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def file_stamp(path: str, working_dir: str, digests: Optional[dict] = None) -> Optional[list]:
+    """Stamp a file as ``[size, mtime_ns, sha256]``.
+
+    Args:
+        path: File path as declared by the task
+        working_dir: Directory relative paths are resolved against
+        digests: Resolved path -> earlier stamp; its hash is reused while
+            size and mtime still match, and the new stamp is stored
+
+    Returns:
+        Stamp, or None if the file does not exist
+    """
+    resolved = resolve_path(path, working_dir)
+    try:
+        stat = resolved.stat()
+    except OSError:
+        return None
+    if not S_ISREG(stat.st_mode):
+        return None
+    key = str(resolved)
+    known = digests.get(key) if digests is not None else None
+    if known is not None and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+        return known
+    stamp = [stat.st_size, stat.st_mtime_ns, file_digest(resolved)]
+    if digests is not None:
+        digests[key] = stamp
+    return stamp
+
+
+def task_fingerprint(
+    task: Task,
+    prompt: str,
+    working_dir: str,
+    digests: Optional[dict] = None,
+) -> dict:
+    """Fingerprint a completed task.
+
+    Args:
+        task: Task that completed
+        prompt: Prompt it ran with
+        working_dir: Directory relative paths are resolved against
+        digests: Shared stamps of required files (see ``file_stamp``)
+
+    Returns:
+        Dict with the prompt hash and stamps of required and output paths
+    """
+    return {
+        "prompt": prompt_digest(prompt),
+        "requires": {
+            path: file_stamp(path, working_dir, digests)
+            for path in sorted(set(task.requirements.values()))
+        },
+        "outputs": {
+            path: file_stamp(path, working_dir)
+            for path in sorted(set(task.outputs.values()))
+        },
+    }
+
+
+def stale_reason(task: Task, prompt: str, fingerprint: Optional[dict], working_dir: str) -> Optional[str]:
+    """Decide whether a completed task has to run again.
+
+    Like make, a file whose size and mtime match its stamp counts as
+    unchanged without reading it; otherwise its contents are compared. A
+    changed output does not make the task itself stale, but tasks that
+    require it see a changed input.
+
+    Args:
+        task: Task as generated from the current plan
+        prompt: Its prompt as rendered now
+        fingerprint: Fingerprint recorded when it completed
+        working_dir: Directory relative paths are resolved against
+
+    Returns:
+        Reason the task is stale, or None if it is up to date
+    """
+    if not fingerprint:
+        return "no fingerprint recorded"
+    if fingerprint.get("prompt") != prompt_digest(prompt):
+        return "prompt changed"
+
+    recorded = fingerprint.get("requires", {})
+    if set(recorded) != set(task.requirements.values()):
+        return "requirements changed"
+    for path, stamp in recorded.items():
+        known = {str(resolve_path(path, working_dir)): stamp} if stamp else None
+        current = file_stamp(path, working_dir, known)
+        if current is None:
+            if stamp is not None:
+                return f"input missing: {path}"
+        elif stamp is None or current[2] != stamp[2]:
+            return f"input changed: {path}"
+
+    for path in task.outputs.values():
+        if not resolve_path(path, working_dir).is_file():
+            return f"output missing: {path}"
+    return None
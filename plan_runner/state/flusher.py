@@ -0,0 +1,73 @@
+"""Background flushing of queued state transitions."""
+
+import threading
+from typing import Callable
+
+
+class StateFlusher:
+    """Dedicated thread that periodically drains pending state writes.
+
+    Worker threads only append records to an in-memory queue owned by the
+    StateManager; this thread calls ``flush`` every ``interval`` seconds, or
+    sooner once ``max_events`` records are waiting, so that all disk I/O is
+    coalesced off the worker threads.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[], None],
+        interval: float = 0.25,
+        max_events: int = 500,
+    ):
+        """Initialize flusher.
+
+        Args:
+            flush: Callable that writes all pending records
+            interval: Maximum seconds a record may wait before being written
+            max_events: Pending record count that triggers an early flush
+        """
+        self._flush = flush
+        self.interval = interval
+        self.max_events = max_events
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="plan-runner-state-flusher",
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        """Start the flusher thread."""
+        self._thread.start()
+
+    def notify(self, pending: int) -> None:
+        """Tell the flusher how many records are waiting.
+
+        Args:
+            pending: Number of queued records
+        """
+        if pending >= self.max_events:
+            self._wake.set()
+
+    def stop(self) -> None:
+        """Stop the thread after a final flush."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread.is_alive() and threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        """Flush loop."""
+        while not self._stopping.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self._safe_flush()
+        self._safe_flush()
+
+    def _safe_flush(self) -> None:
+        """Flush, reporting rather than dying on errors (the records stay queued)."""
+        try:
+            self._flush()
+        except Exception as e:
+            print(f"Warning: Could not write state: {e}")
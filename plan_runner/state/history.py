@@ -0,0 +1,226 @@
+"""Persistent per-task performance history across runs."""
+
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from ..models.plan import Task
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_runs (
+    plan TEXT NOT NULL,
+    template TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    prompt_chars INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    attempts INTEGER NOT NULL,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    success INTEGER NOT NULL,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_task_runs_template ON task_runs (plan, template, finished_at);
+CREATE INDEX IF NOT EXISTS idx_task_runs_task ON task_runs (plan, task_id);
+"""
+
+# Samples per template used for predictions (most recent first)
+SAMPLES_PER_TEMPLATE = 500
+
+# Samples needed before a per-template prompt-length regression is trusted
+MIN_REGRESSION_SAMPLES = 5
+
+
+@dataclass
+class TaskSample:
+    """Outcome of one task execution."""
+
+    plan: str
+    template: str
+    task_id: str
+    prompt_chars: int
+    duration: float  # seconds of the final attempt
+    attempts: int
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    success: bool = True
+    finished_at: float = 0.0
+
+
+class HistoryStore:
+    """Task durations, attempts and token usage in a SQLite database.
+
+    Samples are keyed by plan name and template name, plus task ID for
+    plans whose task IDs stay the same between runs. Writes are buffered
+    and committed in batches.
+    """
+
+    def __init__(self, path: Path, batch_size: int = 100):
+        """Initialize store.
+
+        Args:
+            path: Path to the SQLite database
+            batch_size: Buffered samples that trigger a commit
+        """
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._pending: list[TaskSample] = []
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open the database on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path))
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def record(self, sample: TaskSample) -> None:
+        """Buffer a sample, committing once a batch is full."""
+        if not sample.finished_at:
+            sample.finished_at = time.time()
+        self._pending.append(sample)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit buffered samples."""
+        if not self._pending:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO task_runs (plan, template, task_id, prompt_chars, duration, attempts,"
+                " input_tokens, output_tokens, success, finished_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        s.plan, s.template, s.task_id, s.prompt_chars, s.duration, s.attempts,
+                        s.input_tokens, s.output_tokens, int(s.success), s.finished_at,
+                    )
+                    for s in self._pending
+                ],
+            )
+        self._pending = []
+
+    def samples(self, plan: str, limit_per_template: int = SAMPLES_PER_TEMPLATE) -> list[TaskSample]:
+        """Load the most recent successful samples of a plan.
+
+        Args:
+            plan: Plan name
+            limit_per_template: Maximum samples per template
+
+        Returns:
+            Samples, most recent first within each template
+        """
+        self.flush()
+        rows = self.conn.execute(
+            "SELECT plan, template, task_id, prompt_chars, duration, attempts, input_tokens,"
+            " output_tokens, success, finished_at FROM ("
+            "  SELECT *, ROW_NUMBER() OVER (PARTITION BY template ORDER BY finished_at DESC) AS n"
+            "  FROM task_runs WHERE plan = ? AND success = 1"
+            ") WHERE n <= ?",
+            (plan, limit_per_template),
+        ).fetchall()
+        return [TaskSample(*row[:8], bool(row[8]), row[9]) for row in rows]
+
+    def close(self) -> None:
+        """Commit buffered samples and close the database."""
+        if self._conn is not None or self._pending:
+            self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def fit_line(xs: list[float], ys: list[float]) -> Optional[tuple[float, float]]:
+    """Least-squares fit ``y = a + b * x``.
+
+    Returns:
+        Tuple of (a, b), or None if x does not vary
+    """
+    mean_x = statistics.fmean(xs)
+    mean_y = statistics.fmean(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return None
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+    return mean_y - slope * mean_x, slope
+
+
+@dataclass
+class TemplateStats:
+    """Duration statistics of one template."""
+
+    count: int
+    median: float
+    p90: float
+    line: Optional[tuple[float, float]] = None  # duration vs prompt chars
+
+
+class DurationPredictor:
+    """Predict task durations from history.
+
+    In order of preference:
+    - median of earlier runs of the same task ID
+    - per-template regression on prompt length, if it has enough samples
+      and a positive slope
+    - per-template median
+    - plan-wide regression on prompt length, or the plan-wide median
+    """
+
+    def __init__(self, samples: list[TaskSample]):
+        """Build statistics.
+
+        Args:
+            samples: Successful samples of one plan
+        """
+        self.count = len(samples)
+        by_template: dict[str, list[TaskSample]] = {}
+        by_task: dict[str, list[float]] = {}
+        for sample in samples:
+            by_template.setdefault(sample.template, []).append(sample)
+            by_task.setdefault(sample.task_id, []).append(sample.duration)
+
+        self.templates = {name: self._stats(group) for name, group in by_template.items()}
+        self.task_medians = {task_id: statistics.median(values) for task_id, values in by_task.items()}
+        self.overall = self._stats(samples) if samples else None
+
+    @staticmethod
+    def _stats(samples: list[TaskSample]) -> TemplateStats:
+        durations = [s.duration for s in samples]
+        line = None
+        if len(samples) >= MIN_REGRESSION_SAMPLES:
+            line = fit_line([s.prompt_chars for s in samples], durations)
+            if line is not None and line[1] <= 0:
+                line = None
+        return TemplateStats(len(samples), statistics.median(durations), percentile(durations, 0.9), line)
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    def predict(self, task: Task) -> Optional[float]:
+        """Expected duration of a task in seconds (None without history)."""
+        if task.task_id in self.task_medians:
+            return self.task_medians[task.task_id]
+        stats = self.templates.get(task.template_name)
+        if stats is None:
+            stats = self.overall
+            if stats is None:
+                return None
+        if stats.line is not None:
+            intercept, slope = stats.line
+            # Keep extrapolation within reason for prompts far outside the samples
+            return min(max(intercept + slope * task.prompt_length(), stats.median / 4), stats.p90 * 4)
+        return stats.median
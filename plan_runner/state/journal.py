@@ -0,0 +1,199 @@
+"""Append-only event journal for execution state."""
+
+import json
+import os
+from pathlib import Path
+from typing import Iterator, Optional
+
+from ..models.state import ExecutionState, PhaseResult, PhaseStatus
+from .codec import json_dumps, json_loads
+
+
+class StateJournal:
+    """Append-only log of state transitions.
+
+    Each transition is written as one compact JSON line (encoded with orjson
+    when it is installed). The journal sits next to the state snapshot and is
+    truncated whenever a new snapshot is written, so replaying snapshot +
+    journal always yields the latest state.
+
+    Records carry a monotonically increasing ``seq`` so that replay can skip
+    records already folded into the snapshot (e.g. after a crash between
+    writing the snapshot and truncating the journal).
+
+    A line torn by a crash mid-write is cut off when the journal is
+    replayed or first appended to, so new records never follow it.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize journal.
+
+        Args:
+            path: Path to the journal file
+        """
+        self.path = Path(path)
+        self._handle = None
+        self.record_count = 0
+        self.valid_length = 0  # bytes of whole records seen by the last full read
+        self._repaired = False
+
+    def append_batch(self, records: list[dict], durability: str = "flush") -> None:
+        """Append records to the journal in a single write.
+
+        Args:
+            records: Event records (each must contain ``seq`` and ``op``)
+            durability: "none", "flush" or "fsync"
+        """
+        if self._handle is None:
+            if not self._repaired:
+                self.repair()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self.path.open("ab")
+
+        try:
+            self._handle.write(b"".join(json_dumps(record) + b"\n" for record in records))
+            if durability != "none":
+                self._handle.flush()
+            if durability == "fsync":
+                os.fsync(self._handle.fileno())
+        except OSError:
+            # A partial write is cut off before the batch is appended again
+            handle, self._handle = self._handle, None
+            try:
+                handle.close()
+            except OSError:
+                pass
+            self._repaired = False
+            raise
+        self.record_count += len(records)
+
+    def read(self) -> Iterator[dict]:
+        """Iterate over records in the journal.
+
+        A truncated trailing line (from a crash mid-write) is ignored;
+        ``valid_length`` is left at the offset where it starts.
+
+        Yields:
+            Event records in write order
+        """
+        self.valid_length = 0
+        if not self.path.exists():
+            return
+
+        with self.path.open("rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Partial write at the tail - the newline comes last
+                    break
+                stripped = line.strip()
+                if stripped:
+                    try:
+                        record = json_loads(stripped)
+                    except json.JSONDecodeError:
+                        # Torn or corrupt line - nothing after it is valid
+                        break
+                    yield record
+                self.valid_length += len(line)
+
+    def replay(self, state: ExecutionState, repair: bool = True) -> int:
+        """Apply journal records newer than the state's snapshot.
+
+        Args:
+            state: State loaded from the snapshot (modified in place)
+            repair: Truncate a torn tail (False leaves the file untouched)
+
+        Returns:
+            Number of records applied
+        """
+        applied = 0
+        for record in self.read():
+            seq = record.get("seq", 0)
+            if seq <= state.journal_seq:
+                continue
+            apply_record(state, record)
+            state.journal_seq = seq
+            applied += 1
+        if repair:
+            self._truncate_torn_tail()
+        return applied
+
+    def repair(self) -> None:
+        """Cut off a torn tail so that appended records start on a new line."""
+        for _record in self.read():
+            pass
+        self._truncate_torn_tail()
+
+    def _truncate_torn_tail(self) -> None:
+        """Truncate the file to ``valid_length`` after a full read."""
+        self._repaired = True
+        if not self.path.exists():
+            return
+        size = self.path.stat().st_size
+        if size > self.valid_length:
+            self.close()
+            os.truncate(self.path, self.valid_length)
+            print(f"Warning: Dropped {size - self.valid_length} bytes of a torn state journal tail")
+
+    def reset(self) -> None:
+        """Truncate the journal after a snapshot has been written."""
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text("", encoding="utf-8")
+        self.record_count = 0
+        self._repaired = True
+
+    def close(self) -> None:
+        """Close the underlying file handle."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+def apply_record(state: ExecutionState, record: dict) -> None:
+    """Apply a single journal record to a state.
+
+    Args:
+        state: State to modify
+        record: Event record produced by StateManager
+    """
+    op = record["op"]
+    at: Optional[str] = record.get("at")
+
+    if op.startswith("task_"):
+        task_id = record["id"]
+        if task_id not in state.tasks:
+            return
+        if op == "task_started":
+            state.mark_started(task_id, at)
+        elif op == "task_completed":
+            state.mark_completed(
+                task_id, record.get("outputs", {}), at, record.get("transcript"), record.get("fingerprint")
+            )
+        elif op == "task_failed":
+            state.mark_failed(task_id, record.get("error", ""), at, record.get("transcript"), record.get("class"))
+        elif op == "task_reset":
+            state.reset_task(task_id)
+        return
+
+    if op.startswith("phase_"):
+        phase_name = record["phase"]
+        if phase_name not in state.phases:
+            state.phases[phase_name] = PhaseResult(phase_name=phase_name)
+        phase = state.phases[phase_name]
+        if op == "phase_started":
+            phase.status = PhaseStatus.RUNNING
+            phase.started_at = at
+        elif op == "phase_completed":
+            phase.status = PhaseStatus.COMPLETED
+            phase.completed_at = at
+        elif op == "phase_failed":
+            phase.status = PhaseStatus.FAILED
+            phase.completed_at = at
+        return
+
+    if op == "event":
+        state.events.append(record["event"])
+        return
+
+    if op == "execution_completed":
+        state.completed_at = at
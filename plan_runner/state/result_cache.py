@@ -0,0 +1,248 @@
+"""Content-addressed cache of successful task results."""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+
+# Bump when the key or entry layout changes, so old entries stop matching
+CACHE_VERSION = 2
+
+HASH_CHUNK = 1024 * 1024
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def resolve_path(path: str, working_dir: str) -> Path:
+    """Resolve a task path the way the CLI sees it (relative to working_dir)."""
+    resolved = Path(path)
+    if not resolved.is_absolute():
+        resolved = Path(working_dir) / resolved
+    return resolved
+
+
+def cache_key(
+    prompt: str,
+    model: str,
+    working_dir: str,
+    requirements: dict[str, str],
+    outputs: dict[str, str],
+    runner: str = "cli",
+) -> str:
+    """Hash everything that determines a task's result.
+
+    Args:
+        prompt: Rendered prompt
+        model: Model name
+        working_dir: Directory the CLI runs in
+        requirements: Alias -> path of required files; their contents are hashed
+        outputs: Output name -> declared path; the current contents of
+            existing outputs are hashed, so a key only matches outputs in
+            the state they were in when the entry was stored
+        runner: Backend that produced the result (a plain API call has no tools)
+
+    Returns:
+        Hex digest identifying the task's inputs
+    """
+    parts = {
+        "version": CACHE_VERSION,
+        "prompt": prompt,
+        "model": model,
+        "working_dir": str(Path(working_dir).resolve()),
+        "runner": runner,
+        "outputs": {},
+        "requires": {},
+    }
+    for alias, path in sorted(requirements.items()):
+        resolved = resolve_path(path, working_dir)
+        parts["requires"][alias] = [path, file_digest(resolved) if resolved.is_file() else None]
+    for name, path in sorted(outputs.items()):
+        resolved = resolve_path(path, working_dir)
+        parts["outputs"][name] = [path, file_digest(resolved) if resolved.is_file() else None]
+    encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ResultCache:
+    """Local cache of task outputs and CLI result metadata.
+
+    Layout under ``root``:
+    - ``blobs/<sha256>``: output file contents, stored once per content
+    - ``entries/<key>.json``: declared output paths with their blob
+      hashes, plus the ClaudeResult fields
+
+    An entry's mtime is its last use; ``prune`` drops entries older than
+    ``max_age`` and then the least recently used ones until the blobs fit
+    in ``max_bytes``.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = 1024**3, max_age: float = 30 * 86400):
+        """Initialize cache.
+
+        Args:
+            root: Cache directory
+            max_bytes: Size limit of stored outputs
+            max_age: Seconds after which unused entries are evicted
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.blobs = self.root / "blobs"
+        self.entries = self.root / "entries"
+
+    def _entry_path(self, key: str) -> Path:
+        return self.entries / f"{key}.json"
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """Get the entry for a key if all of its blobs are present.
+
+        Returns:
+            Entry dict, or None on a miss
+        """
+        path = self._entry_path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not all((self.blobs / blob).is_file() for _, blob in entry["outputs"].values()):
+            return None
+        os.utime(path)
+        return entry
+
+    def conflicts(self, entry: dict, working_dir: str) -> list[str]:
+        """Find outputs that exist with other contents than the entry's.
+
+        Args:
+            entry: Entry from ``lookup``
+            working_dir: Directory relative output paths are resolved against
+
+        Returns:
+            Declared paths that a restore would overwrite
+        """
+        conflicting = []
+        for path, blob in entry["outputs"].values():
+            target = resolve_path(path, working_dir)
+            if target.exists() and (not target.is_file() or file_digest(target) != blob):
+                conflicting.append(path)
+        return conflicting
+
+    def restore(self, entry: dict, working_dir: str) -> dict[str, str]:
+        """Copy an entry's missing outputs back to their declared paths.
+
+        Outputs that already exist are left alone; callers check
+        ``conflicts`` first, so those already hold the cached contents.
+
+        Args:
+            entry: Entry from ``lookup``
+            working_dir: Directory relative output paths are resolved against
+
+        Returns:
+            Output name -> declared path
+        """
+        outputs = {}
+        for name, (path, blob) in entry["outputs"].items():
+            target = resolve_path(path, working_dir)
+            if not target.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(self.blobs / blob, target)
+            outputs[name] = path
+        return outputs
+
+    def store(self, keys: list[str], outputs: dict[str, str], working_dir: str, result: dict) -> bool:
+        """Store a successful task's outputs under its keys.
+
+        Only tasks whose declared outputs all exist as files are cached:
+        anything else the task did would not be reproduced on a hit.
+
+        Args:
+            keys: Keys from ``cache_key`` (e.g. with the outputs as they were
+                before and as they are after the run)
+            outputs: Output name -> declared path
+            working_dir: Directory relative output paths are resolved against
+            result: ClaudeResult fields to return on a hit
+
+        Returns:
+            True if the entry was stored
+        """
+        files = {name: resolve_path(path, working_dir) for name, path in outputs.items()}
+        if not files or not all(path.is_file() for path in files.values()):
+            return False
+
+        self.blobs.mkdir(parents=True, exist_ok=True)
+        self.entries.mkdir(parents=True, exist_ok=True)
+        stored = {}
+        for name, path in files.items():
+            blob = file_digest(path)
+            if not (self.blobs / blob).exists():
+                self._write_atomic(self.blobs / blob, path.read_bytes())
+            stored[name] = [outputs[name], blob]
+
+        entry = json.dumps({"outputs": stored, "result": result, "created_at": time.time()}).encode("utf-8")
+        for key in dict.fromkeys(keys):
+            self._write_atomic(self._entry_path(key), entry)
+        return True
+
+    def _write_atomic(self, target: Path, data: bytes) -> None:
+        """Write via a temporary file so readers never see partial content."""
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def prune(self) -> tuple[int, int]:
+        """Evict old and least recently used entries, then unreferenced blobs.
+
+        Returns:
+            Tuple of (entries removed, bytes freed)
+        """
+        if not self.entries.is_dir():
+            return 0, 0
+
+        now = time.time()
+        entries = []
+        for path in self.entries.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path, json.loads(path.read_text(encoding="utf-8"))))
+            except (OSError, ValueError):
+                path.unlink(missing_ok=True)
+        entries.sort(key=lambda item: item[0], reverse=True)  # most recently used first
+
+        blob_sizes = {}
+        for blob in self.blobs.glob("*"):
+            blob_sizes[blob.name] = blob.stat().st_size
+
+        kept: set[str] = set()
+        kept_bytes = 0
+        removed = 0
+        for used_at, path, entry in entries:
+            blobs = {blob for _, blob in entry["outputs"].values()}
+            added = sum(blob_sizes.get(blob, 0) for blob in blobs - kept)
+            if now - used_at > self.max_age or kept_bytes + added > self.max_bytes:
+                path.unlink(missing_ok=True)
+                removed += 1
+                continue
+            kept |= blobs
+            kept_bytes += added
+
+        freed = 0
+        for name, size in blob_sizes.items():
+            if name not in kept:
+                (self.blobs / name).unlink(missing_ok=True)
+                freed += size
+        return removed, freed
@@ -0,0 +1,272 @@
+"""SQLite-backed execution state store."""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+from ..models.state import ExecutionState, TaskResult, PhaseResult, TaskStatus, PhaseStatus
+from .backend import StateBackend, JsonStateBackend
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS phases (
+    phase_name TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    started_at TEXT,
+    completed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    phase_name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at TEXT,
+    completed_at TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error_message TEXT,
+    outputs TEXT,
+    transcript TEXT,
+    fingerprint TEXT,
+    error_class TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_phase_status ON tasks (phase_name, status);
+CREATE TABLE IF NOT EXISTS events (
+    at TEXT,
+    kind TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+# PRAGMA synchronous level per durability setting
+SYNCHRONOUS = {
+    "none": "OFF",
+    "flush": "NORMAL",
+    "fsync": "FULL",
+}
+
+
+class SqliteStateBackend(StateBackend):
+    """Store execution state in a SQLite database.
+
+    Provides:
+    - WAL-mode database with one transaction per flushed batch
+    - Index on (phase_name, status) for inspecting a run with sqlite3
+      (the runner itself answers status queries from ExecutionState)
+    - Import from an existing JSON state file
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Path, durability: str = "flush"):
+        """Initialize backend.
+
+        Args:
+            path: Path to the SQLite database
+            durability: "none", "flush" or "fsync"
+        """
+        super().__init__(path, durability)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open the database on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Writes come from the flusher thread; StateManager serializes access
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(f"PRAGMA synchronous={SYNCHRONOUS[self.durability]}")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def load(self) -> Optional[ExecutionState]:
+        """Load state from the database."""
+        if not self.path.exists():
+            return None
+
+        meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        if "plan_name" not in meta:
+            return None
+
+        state = ExecutionState(
+            plan_name=meta["plan_name"],
+            plan_file=meta.get("plan_file", ""),
+            started_at=meta.get("started_at"),
+            completed_at=meta.get("completed_at"),
+            journal_seq=int(meta.get("journal_seq") or 0),
+        )
+
+        for (data,) in self.conn.execute("SELECT data FROM events ORDER BY rowid"):
+            state.events.append(json.loads(data))
+
+        for phase_name, status, started_at, completed_at in self.conn.execute(
+            "SELECT phase_name, status, started_at, completed_at FROM phases"
+        ):
+            state.phases[phase_name] = PhaseResult(
+                phase_name=phase_name,
+                status=PhaseStatus(status),
+                started_at=started_at,
+                completed_at=completed_at,
+            )
+
+        for row in self.conn.execute(
+            "SELECT task_id, phase_name, status, started_at, completed_at,"
+            " attempts, error_message, outputs, transcript, fingerprint, error_class FROM tasks ORDER BY rowid"
+        ):
+            (task_id, phase_name, status, started_at, completed_at,
+             attempts, error, outputs, transcript, fingerprint, error_class) = row
+            state.add_task(TaskResult(
+                task_id=task_id,
+                phase_name=phase_name,
+                status=TaskStatus(status),
+                started_at=started_at,
+                completed_at=completed_at,
+                attempts=attempts,
+                error_message=error,
+                outputs=json.loads(outputs) if outputs else {},
+                transcript=transcript,
+                fingerprint=json.loads(fingerprint) if fingerprint else None,
+                error_class=error_class,
+            ))
+
+        return state
+
+    def serialize(self, state: ExecutionState) -> dict:
+        """Capture state as table rows."""
+        return {
+            "meta": [
+                ("plan_name", state.plan_name),
+                ("plan_file", state.plan_file),
+                ("started_at", state.started_at),
+                ("completed_at", state.completed_at),
+                ("journal_seq", str(state.journal_seq)),
+            ],
+            "phases": [
+                (p.phase_name, p.status.value, p.started_at, p.completed_at)
+                for p in state.phases.values()
+            ],
+            "tasks": [
+                (
+                    t.task_id, t.phase_name, t.status.value, t.started_at, t.completed_at,
+                    t.attempts, t.error_message, json.dumps(t.outputs) if t.outputs else None,
+                    t.transcript, json.dumps(t.fingerprint) if t.fingerprint else None, t.error_class,
+                )
+                for t in state.tasks.values()
+            ],
+            "events": [
+                (event.get("at"), event.get("kind", ""), json.dumps(event))
+                for event in state.events
+            ],
+        }
+
+    def write_snapshot(self, snapshot: dict) -> None:
+        """Replace all rows in a single transaction."""
+        with self.conn:
+            self.conn.execute("DELETE FROM meta")
+            self.conn.execute("DELETE FROM phases")
+            self.conn.execute("DELETE FROM tasks")
+            self.conn.execute("DELETE FROM events")
+            self.conn.executemany("INSERT INTO meta VALUES (?, ?)", snapshot["meta"])
+            self.conn.executemany("INSERT INTO phases VALUES (?, ?, ?, ?)", snapshot["phases"])
+            self.conn.executemany(
+                "INSERT INTO tasks (task_id, phase_name, status, started_at, completed_at,"
+                " attempts, error_message, outputs, transcript, fingerprint, error_class)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                snapshot["tasks"],
+            )
+            self.conn.executemany("INSERT INTO events VALUES (?, ?, ?)", snapshot["events"])
+
+    def append(self, records: list[dict]) -> None:
+        """Apply a batch of transition records in a single transaction."""
+        with self.conn:
+            for record in records:
+                self._apply(record)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('journal_seq', ?)",
+                (str(records[-1]["seq"]),),
+            )
+
+    def _apply(self, record: dict) -> None:
+        """Translate one transition record into SQL."""
+        op = record["op"]
+        at = record.get("at")
+
+        if op == "task_started":
+            self.conn.execute(
+                "UPDATE tasks SET status = ?, started_at = ?, attempts = attempts + 1"
+                " WHERE task_id = ?",
+                (TaskStatus.RUNNING.value, at, record["id"]),
+            )
+        elif op == "task_completed":
+            outputs = record.get("outputs") or {}
+            fingerprint = record.get("fingerprint")
+            self.conn.execute(
+                "UPDATE tasks SET status = ?, completed_at = ?, outputs = ?, error_message = NULL, error_class = NULL,"
+                " transcript = COALESCE(?, transcript), fingerprint = ? WHERE task_id = ?",
+                (
+                    TaskStatus.COMPLETED.value, at, json.dumps(outputs) if outputs else None,
+                    record.get("transcript"), json.dumps(fingerprint) if fingerprint else None,
+                    record["id"],
+                ),
+            )
+        elif op == "task_failed":
+            self.conn.execute(
+                "UPDATE tasks SET status = ?, completed_at = ?, error_message = ?, error_class = ?,"
+                " transcript = COALESCE(?, transcript) WHERE task_id = ?",
+                (
+                    TaskStatus.FAILED.value, at, record.get("error", ""), record.get("class"),
+                    record.get("transcript"), record["id"],
+                ),
+            )
+        elif op == "task_reset":
+            self.conn.execute(
+                "UPDATE tasks SET status = ?, started_at = NULL, completed_at = NULL WHERE task_id = ?",
+                (TaskStatus.PENDING.value, record["id"]),
+            )
+        elif op == "phase_started":
+            self.conn.execute(
+                "INSERT INTO phases (phase_name, status, started_at) VALUES (?, ?, ?)"
+                " ON CONFLICT (phase_name) DO UPDATE SET status = excluded.status,"
+                " started_at = excluded.started_at",
+                (record["phase"], PhaseStatus.RUNNING.value, at),
+            )
+        elif op in ("phase_completed", "phase_failed"):
+            status = PhaseStatus.COMPLETED if op == "phase_completed" else PhaseStatus.FAILED
+            self.conn.execute(
+                "UPDATE phases SET status = ?, completed_at = ? WHERE phase_name = ?",
+                (status.value, at, record["phase"]),
+            )
+        elif op == "event":
+            event = record["event"]
+            self.conn.execute(
+                "INSERT INTO events VALUES (?, ?, ?)",
+                (event.get("at"), event.get("kind", ""), json.dumps(event)),
+            )
+        elif op == "execution_completed":
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('completed_at', ?)", (at,)
+            )
+
+    def import_json(self, json_file: Path) -> Optional[ExecutionState]:
+        """Import an existing JSON state file (snapshot + journal).
+
+        Args:
+            json_file: Path to state.json
+
+        Returns:
+            Imported state, or None if the file could not be read
+        """
+        state = JsonStateBackend(json_file, durability="none").load()
+        if state is not None:
+            self.write_snapshot(self.serialize(state))
+        return state
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
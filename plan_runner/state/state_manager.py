@@ -1,33 +1,73 @@
 """State persistence for resume functionality."""
 
-import json
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from datetime import datetime
 import threading
+import time
 
-from ..models.state import ExecutionState, TaskResult, PhaseResult, TaskStatus, PhaseStatus
+from ..models.state import ExecutionState, PhaseResult, TaskStatus, PhaseStatus
 from ..models.plan import Plan, Task
+from .backend import create_backend
+from .flusher import StateFlusher
 
 
 class StateManager:
     """Manage execution state persistence.
 
     Provides:
-    - State persistence to JSON file
+    - Pluggable persistence (JSON snapshot + journal by default, or SQLite)
+    - Background coalescing of writes with a selectable durability policy
     - Resume capability after failure
     - Thread-safe state updates
+
+    Every transition updates the in-memory state and is queued as a record;
+    a background flusher hands queued records to the backend in batches.
+
+    Durability levels:
+    - ``none``: leave written records in the process buffer
+    - ``flush``: flush each batch to the operating system
+    - ``fsync``: additionally fsync each batch and snapshot to disk
     """
 
-    def __init__(self, state_file: Path):
+    DURABILITY_LEVELS = ("none", "flush", "fsync")
+
+    def __init__(
+        self,
+        state_file: Path,
+        snapshot_interval: int = 1000,
+        flush_interval: float = 0.25,
+        flush_events: int = 500,
+        durability: str = "flush",
+        backend: str = "json",
+        on_flush: Optional[Callable[[float, bool], None]] = None,
+    ):
         """Initialize state manager.
 
         Args:
-            state_file: Path to state JSON file
+            state_file: Path to state file
+            snapshot_interval: Minimum journal records between JSON snapshots
+            flush_interval: Seconds between background flushes (0 writes synchronously)
+            flush_events: Queued record count that triggers an early flush
+            durability: One of DURABILITY_LEVELS
+            backend: One of STATE_BACKENDS
+            on_flush: Called after each batch is written to the backend
+                (seconds, whether it was written as a full snapshot)
         """
+        if durability not in self.DURABILITY_LEVELS:
+            raise ValueError(f"Unknown state durability: {durability}")
+
         self.state_file = Path(state_file)
+        self.flush_interval = flush_interval
+        self.flush_events = flush_events
+        self.durability = durability
+        self.backend = create_backend(backend, self.state_file, durability, snapshot_interval)
         self.state: Optional[ExecutionState] = None
         self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._pending: list[dict] = []
+        self._flusher: Optional[StateFlusher] = None
+        self.on_flush = on_flush
 
     def initialize(self, plan: Plan, tasks: list[Task]) -> ExecutionState:
         """Initialize fresh state for a plan.
@@ -50,40 +90,128 @@ class StateManager:
 
         # Initialize task results
         for task in tasks:
-            self.state.tasks[task.task_id] = TaskResult(
-                task_id=task.task_id,
-                phase_name=task.phase_name,
-            )
+            self.state.add_pending_task(task.task_id, task.phase_name)
 
         self.save()
+        self._start_flusher()
         return self.state
 
+    def has_saved_state(self) -> bool:
+        """Check whether there is saved state to resume from."""
+        return self.backend.exists() or self._legacy_json_file() is not None
+
     def load(self) -> Optional[ExecutionState]:
-        """Load state from file.
+        """Load state from the backend.
+
+        With a non-JSON backend and no saved state yet, an existing JSON
+        state file next to it is imported.
 
         Returns:
-            ExecutionState if file exists, None otherwise
+            ExecutionState if saved state exists, None otherwise
         """
-        if not self.state_file.exists():
+        if not self.backend.exists():
+            legacy_file = self._legacy_json_file()
+            if legacy_file is not None:
+                print(f"Importing state from {legacy_file}")
+                self.state = self.backend.import_json(legacy_file)
+                self._start_flusher()
+                return self.state
             return None
 
-        try:
-            content = self.state_file.read_text(encoding="utf-8")
-            self.state = ExecutionState.from_json(content)
-            return self.state
-        except (json.JSONDecodeError, KeyError) as e:
-            print(f"Warning: Could not load state file: {e}")
+        self.state = self.backend.load()
+        if self.state is not None:
+            self._start_flusher()
+        return self.state
+
+    def _legacy_json_file(self) -> Optional[Path]:
+        """Find a JSON state file that the current backend could import."""
+        if not hasattr(self.backend, "import_json"):
             return None
+        json_file = self.state_file.with_suffix(".json")
+        return json_file if json_file.exists() else None
 
     def save(self) -> None:
-        """Save current state to file."""
+        """Write a full snapshot of the current state.
+
+        Any queued records are covered by the snapshot and discarded.
+        """
         if self.state is None:
             return
 
-        with self._lock:
-            # Ensure parent directory exists
-            self.state_file.parent.mkdir(parents=True, exist_ok=True)
-            self.state_file.write_text(self.state.to_json(), encoding="utf-8")
+        with self._io_lock:
+            with self._lock:
+                self._pending = []
+                snapshot = self.backend.serialize(self.state)
+            self.backend.write_snapshot(snapshot)
+
+    def flush(self, final: bool = False) -> None:
+        """Hand all queued records to the backend.
+
+        If the backend fails, the records stay queued and the error is
+        raised; the next flush writes them again.
+
+        Args:
+            final: True once execution has completed (lets the backend compact)
+        """
+        with self._io_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                if not batch:
+                    return
+                snapshot = None
+                if self.backend.wants_snapshot(len(batch), len(self.state.tasks), final):
+                    # The in-memory state already includes every queued record
+                    snapshot = self.backend.serialize(self.state)
+
+            start = time.perf_counter()
+            try:
+                if snapshot is None:
+                    self.backend.append(batch)
+                else:
+                    self.backend.write_snapshot(snapshot)
+            except BaseException:
+                # Keep the records for the next flush, ahead of newer ones
+                with self._lock:
+                    self._pending[:0] = batch
+                raise
+            if self.on_flush is not None:
+                self.on_flush(time.perf_counter() - start, snapshot is not None)
+
+    def close(self) -> None:
+        """Drain queued records, stop the flusher and release the backend."""
+        if self._flusher is not None:
+            self._flusher.stop()
+            self._flusher = None
+        self.flush()
+        with self._io_lock:
+            self.backend.close()
+
+    def _start_flusher(self) -> None:
+        """Start the background flusher if configured and not yet running."""
+        if self.flush_interval > 0 and self._flusher is None:
+            self._flusher = StateFlusher(
+                self.flush,
+                interval=self.flush_interval,
+                max_events=self.flush_events,
+            )
+            self._flusher.start()
+
+    def _record(self, record: dict) -> None:
+        """Queue a transition for the backend. Caller must hold the lock.
+
+        Args:
+            record: Event record without sequence number
+        """
+        self.state.journal_seq += 1
+        record["seq"] = self.state.journal_seq
+        self._pending.append(record)
+
+    def _schedule_flush(self) -> None:
+        """Hand queued records to the flusher, or write them now if there is none."""
+        if self._flusher is not None:
+            self._flusher.notify(len(self._pending))
+        else:
+            self.flush()
 
     def task_started(self, task_id: str) -> None:
         """Mark a task as started.
@@ -93,32 +221,76 @@ class StateManager:
         """
         with self._lock:
             if self.state and task_id in self.state.tasks:
-                self.state.tasks[task_id].mark_started()
-        self.save()
-
-    def task_completed(self, task_id: str, outputs: dict[str, str]) -> None:
+                at = datetime.now().isoformat()
+                self.state.mark_started(task_id, at)
+                self._record({"op": "task_started", "id": task_id, "at": at})
+        self._schedule_flush()
+
+    def task_completed(
+        self,
+        task_id: str,
+        outputs: dict[str, str],
+        transcript: Optional[str] = None,
+        fingerprint: Optional[dict] = None,
+    ) -> None:
         """Mark a task as completed.
 
         Args:
             task_id: Task identifier
             outputs: Output paths produced by the task
+            transcript: Path of the CLI transcript, if captured
+            fingerprint: Stamps of the task's inputs and outputs
         """
         with self._lock:
             if self.state and task_id in self.state.tasks:
-                self.state.tasks[task_id].mark_completed(outputs)
-        self.save()
-
-    def task_failed(self, task_id: str, error: str) -> None:
+                at = datetime.now().isoformat()
+                self.state.mark_completed(task_id, outputs, at, transcript, fingerprint)
+                record = {"op": "task_completed", "id": task_id, "at": at, "outputs": outputs}
+                if transcript:
+                    record["transcript"] = transcript
+                if fingerprint:
+                    record["fingerprint"] = fingerprint
+                self._record(record)
+        self._schedule_flush()
+
+    def task_failed(
+        self,
+        task_id: str,
+        error: str,
+        transcript: Optional[str] = None,
+        error_class: Optional[str] = None,
+    ) -> None:
         """Mark a task as failed.
 
         Args:
             task_id: Task identifier
             error: Error message
+            transcript: Path of the CLI transcript, if captured
+            error_class: Kind of failure (see executor.failures)
         """
         with self._lock:
             if self.state and task_id in self.state.tasks:
-                self.state.tasks[task_id].mark_failed(error)
-        self.save()
+                at = datetime.now().isoformat()
+                self.state.mark_failed(task_id, error, at, transcript, error_class)
+                record = {"op": "task_failed", "id": task_id, "at": at, "error": error}
+                if transcript:
+                    record["transcript"] = transcript
+                if error_class:
+                    record["class"] = error_class
+                self._record(record)
+        self._schedule_flush()
+
+    def task_reset(self, task_id: str) -> None:
+        """Return a task to pending so that it runs again.
+
+        Args:
+            task_id: Task identifier
+        """
+        with self._lock:
+            if self.state and task_id in self.state.tasks:
+                self.state.reset_task(task_id)
+                self._record({"op": "task_reset", "id": task_id})
+        self._schedule_flush()
 
     def phase_started(self, phase_name: str) -> None:
         """Mark a phase as started.
@@ -128,11 +300,13 @@ class StateManager:
         """
         with self._lock:
             if self.state:
+                at = datetime.now().isoformat()
                 if phase_name not in self.state.phases:
                     self.state.phases[phase_name] = PhaseResult(phase_name=phase_name)
                 self.state.phases[phase_name].status = PhaseStatus.RUNNING
-                self.state.phases[phase_name].started_at = datetime.now().isoformat()
-        self.save()
+                self.state.phases[phase_name].started_at = at
+                self._record({"op": "phase_started", "phase": phase_name, "at": at})
+        self._schedule_flush()
 
     def phase_completed(self, phase_name: str) -> None:
         """Mark a phase as completed.
@@ -142,9 +316,11 @@ class StateManager:
         """
         with self._lock:
             if self.state and phase_name in self.state.phases:
+                at = datetime.now().isoformat()
                 self.state.phases[phase_name].status = PhaseStatus.COMPLETED
-                self.state.phases[phase_name].completed_at = datetime.now().isoformat()
-        self.save()
+                self.state.phases[phase_name].completed_at = at
+                self._record({"op": "phase_completed", "phase": phase_name, "at": at})
+        self._schedule_flush()
 
     def phase_failed(self, phase_name: str) -> None:
         """Mark a phase as failed.
@@ -154,16 +330,34 @@ class StateManager:
         """
         with self._lock:
             if self.state and phase_name in self.state.phases:
+                at = datetime.now().isoformat()
                 self.state.phases[phase_name].status = PhaseStatus.FAILED
-                self.state.phases[phase_name].completed_at = datetime.now().isoformat()
-        self.save()
+                self.state.phases[phase_name].completed_at = at
+                self._record({"op": "phase_failed", "phase": phase_name, "at": at})
+        self._schedule_flush()
+
+    def record_event(self, kind: str, **fields) -> None:
+        """Record a run-level event, e.g. a concurrency adjustment.
+
+        Args:
+            kind: Event type
+            **fields: JSON-serializable event details
+        """
+        with self._lock:
+            if self.state:
+                event = {"at": datetime.now().isoformat(), "kind": kind, **fields}
+                self.state.events.append(event)
+                self._record({"op": "event", "event": event})
+        self._schedule_flush()
 
     def execution_completed(self) -> None:
-        """Mark the entire execution as completed."""
+        """Mark the entire execution as completed and drain queued writes."""
         with self._lock:
             if self.state:
-                self.state.completed_at = datetime.now().isoformat()
-        self.save()
+                at = datetime.now().isoformat()
+                self.state.completed_at = at
+                self._record({"op": "execution_completed", "at": at})
+        self.flush(final=True)
 
     def get_pending_tasks(self, phase_name: str) -> list[str]:
         """Get task IDs that need to be executed in a phase.
@@ -179,13 +373,7 @@ class StateManager:
         if self.state is None:
             return []
 
-        pending = []
-        for task_id, result in self.state.tasks.items():
-            if result.phase_name == phase_name:
-                if result.status in (TaskStatus.PENDING, TaskStatus.FAILED):
-                    pending.append(task_id)
-
-        return pending
+        return self.state.get_pending_tasks(phase_name)
 
     def get_completed_task_outputs(self, task_id: str) -> dict[str, str]:
         """Get outputs from a completed task.
@@ -199,12 +387,7 @@ class StateManager:
         if self.state is None:
             return {}
 
-        if task_id in self.state.tasks:
-            result = self.state.tasks[task_id]
-            if result.status == TaskStatus.COMPLETED:
-                return result.outputs
-
-        return {}
+        return self.state.get_completed_task_outputs(task_id)
 
     def is_task_completed(self, task_id: str) -> bool:
         """Check if a task is completed.
@@ -219,7 +402,7 @@ class StateManager:
             return False
 
         if task_id in self.state.tasks:
-            return self.state.tasks[task_id].status == TaskStatus.COMPLETED
+            return self.state.tasks.status_of(task_id) == TaskStatus.COMPLETED
 
         return False
 
@@ -265,10 +448,7 @@ class StateManager:
         print(f"  Running:     {stats['running']}")
 
         # Show failed tasks
-        failed_tasks = [
-            result for result in self.state.tasks.values()
-            if result.status == TaskStatus.FAILED
-        ]
+        failed_tasks = self.state.get_tasks_with_status(TaskStatus.FAILED)
         if failed_tasks:
             print("\nFailed tasks:")
             for task in failed_tasks:
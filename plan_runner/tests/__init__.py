@@ -0,0 +1 @@
+"""Tests of plan_runner (run with ``python -m pytest plan_runner/tests``)."""
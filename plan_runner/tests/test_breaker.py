@@ -0,0 +1,51 @@
+"""CircuitBreaker counting only its probe while half-open."""
+
+from plan_runner.executor.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def open_breaker() -> CircuitBreaker:
+    """Breaker opened by two failures, past its (zero) cooldown."""
+    breaker = CircuitBreaker(threshold=2, cooldown=0)
+    assert breaker.record(False, "boom", "task-1") is None
+    assert breaker.record(False, "boom", "task-2") == OPEN
+    assert breaker.allows_dispatch()
+    assert breaker.state == HALF_OPEN
+    return breaker
+
+
+def test_late_failures_are_not_failed_probes():
+    breaker = open_breaker()
+
+    # Attempts dispatched before the breaker opened fail after the cooldown
+    assert breaker.record(False, "boom", "task-3") is None
+    assert breaker.record(False, "boom", "task-4") is None
+    assert breaker.failed_probes == 0
+    assert breaker.state == HALF_OPEN
+    assert breaker.allows_dispatch()
+
+
+def test_probe_failure_reopens():
+    breaker = open_breaker()
+    assert breaker.dispatched("task-5")
+    assert not breaker.allows_dispatch()
+
+    assert breaker.record(False, "boom", "task-3") is None
+    assert breaker.record(False, "boom", "task-5") == OPEN
+    assert breaker.failed_probes == 1
+
+
+def test_probe_success_closes():
+    breaker = open_breaker()
+    assert breaker.dispatched("task-5")
+    assert breaker.record(True, None, "task-5") == CLOSED
+    assert breaker.failed_probes == 0
+    assert not breaker.dispatched("task-6")
+
+
+def test_skipped_probe_lets_another_task_probe():
+    breaker = open_breaker()
+    assert breaker.dispatched("task-5")
+    breaker.probe_skipped("task-3")
+    assert not breaker.allows_dispatch()
+    breaker.probe_skipped("task-5")
+    assert breaker.dispatched("task-6")
@@ -0,0 +1,49 @@
+"""Hedging only tasks whose templates opt in."""
+
+import pytest
+
+from plan_runner.executor.hedging import hedgeable
+from plan_runner.models.plan import Task
+from plan_runner.parser.plan_parser import PlanParser
+
+TEMPLATE = """## Task Template: report
+**task_id:** report-0
+{hedge}
+**outputs:**
+- name: report
+  path: reports/report.md
+
+```prompt
+Write the report.
+```
+"""
+
+
+def parse_template(tmp_path, hedge: str):
+    """Parse the report template with the given hedge metadata line."""
+    parser = PlanParser(tmp_path / "plan.md")
+    return parser._parse_single_template("report", TEMPLATE.format(hedge=hedge))
+
+
+@pytest.mark.parametrize("line, expected", [("", False), ("**hedge:** true", True), ("**hedge:** False", False)])
+def test_template_hedge_opt_in(tmp_path, line, expected):
+    assert parse_template(tmp_path, line).hedge is expected
+
+
+def test_invalid_hedge_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Invalid hedge for task template report"):
+        parse_template(tmp_path, "**hedge:** yes")
+
+
+@pytest.mark.parametrize(
+    "outputs, hedge, expected",
+    [
+        ({"report": "reports/report.md"}, True, True),
+        ({"report": "reports/report.md"}, False, False),
+        ({"report": "/abs/reports/report.md"}, True, False),
+        ({}, True, False),
+    ],
+)
+def test_hedgeable(outputs, hedge, expected):
+    task = Task(task_id="report-0", phase_name="build", prompt="", outputs=outputs, hedge=hedge)
+    assert hedgeable(task) is expected
@@ -0,0 +1,212 @@
+"""HttpRunner against the local stub of the Messages API."""
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from plan_runner.bench.stub_api import StubApiHandler, StubApiServer
+from plan_runner.executor.cancellation import CancelToken
+from plan_runner.executor.failures import PERMANENT
+from plan_runner.executor.http_runner import HttpRunner
+
+
+@pytest.fixture
+def server():
+    """Stub API answering right away."""
+    with StubApiServer() as stub:
+        yield stub
+
+
+@pytest.fixture
+def slow_server():
+    """Stub API taking a second per response."""
+    with StubApiServer(latency=1.0) as stub:
+        yield stub
+
+
+def make_runner(stub: StubApiServer, tmp_path: Path, **kwargs) -> HttpRunner:
+    """Create a runner pointed at the stub."""
+    kwargs.setdefault("timeout", 5)
+    kwargs.setdefault("api_key", "test-key")
+    return HttpRunner(
+        working_dir=str(tmp_path),
+        transcript_dir=tmp_path / "transcripts",
+        api_url=stub.url,
+        **kwargs,
+    )
+
+
+def test_plain_response(server, tmp_path):
+    runner = make_runner(server, tmp_path)
+    result = runner.run("hello", "task-1")
+    runner.close()
+
+    assert result.success
+    assert result.stdout == "ok"
+    assert result.output_tokens == 16
+    assert result.input_tokens > 0
+    assert result.transcript_path is None
+
+
+def test_plain_response_async(server, tmp_path):
+    runner = make_runner(server, tmp_path)
+    result = asyncio.run(runner.run_async("hello", "task-1"))
+    runner.close()
+
+    assert result.success
+    assert result.stdout == "ok"
+
+
+def test_streamed_response(server, tmp_path):
+    runner = make_runner(server, tmp_path, output_format="stream-json")
+    usage = []
+    result = runner.run("x" * 100, "task-1", on_usage=lambda i, o: usage.append((i, o)))
+    runner.close()
+
+    assert result.success
+    assert result.stdout == "ok"
+    assert result.output_tokens == 16
+    assert usage and usage[-1] == (result.input_tokens, 16)
+    events = [json.loads(line)["type"] for line in Path(result.transcript_path).read_text().splitlines()]
+    assert events[0] == "message_start"
+    assert events[-1] == "message_stop"
+
+
+def test_streamed_response_async(server, tmp_path):
+    runner = make_runner(server, tmp_path, output_format="stream-json")
+    result = asyncio.run(runner.run_async("x" * 100, "task-1"))
+    runner.close()
+
+    assert result.success
+    assert result.stdout == "ok"
+    assert Path(result.transcript_path).exists()
+
+
+@pytest.mark.parametrize("output_format", ["json", "stream-json"])
+def test_connection_reuse(server, tmp_path, output_format):
+    runner = make_runner(server, tmp_path, output_format=output_format)
+    results = [runner.run("hello", f"task-{i}") for i in range(3)]
+    runner.close()
+
+    assert all(result.success for result in results)
+    assert server.requests == 3
+    assert server.connections == 1
+
+
+def test_connection_reuse_async(server, tmp_path):
+    runner = make_runner(server, tmp_path)
+
+    async def run_all():
+        return [await runner.run_async("hello", f"task-{i}") for i in range(3)]
+
+    results = asyncio.run(run_all())
+    runner.close()
+
+    assert all(result.success for result in results)
+    assert server.connections == 1
+
+
+def test_stale_pooled_connection(server, tmp_path, monkeypatch):
+    # The stub drops connections idle for longer than this
+    monkeypatch.setattr(StubApiHandler, "timeout", 0.2)
+    runner = make_runner(server, tmp_path)
+    first = runner.run("hello")
+    time.sleep(0.5)
+    second = runner.run("hello")
+    runner.close()
+
+    assert first.success
+    assert second.success
+    assert server.requests == 2
+    assert server.connections == 2
+
+
+def test_stale_pooled_connection_async(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(StubApiHandler, "timeout", 0.2)
+    runner = make_runner(server, tmp_path)
+
+    async def run_twice():
+        first = await runner.run_async("hello")
+        await asyncio.sleep(0.5)
+        return first, await runner.run_async("hello")
+
+    first, second = asyncio.run(run_twice())
+    runner.close()
+
+    assert first.success
+    assert second.success
+    assert server.connections == 2
+
+
+def test_timeout(slow_server, tmp_path):
+    runner = make_runner(slow_server, tmp_path, timeout=0.3)
+    start = time.monotonic()
+    result = runner.run("hello")
+    elapsed = time.monotonic() - start
+    runner.close()
+
+    assert not result.success
+    assert "timed out" in result.error_message.lower()
+    assert elapsed < 0.9
+
+
+def test_timeout_async(slow_server, tmp_path):
+    runner = make_runner(slow_server, tmp_path, timeout=0.3)
+    start = time.monotonic()
+    result = asyncio.run(runner.run_async("hello"))
+    elapsed = time.monotonic() - start
+    runner.close()
+
+    assert not result.success
+    assert "timed out" in result.error_message.lower()
+    assert elapsed < 0.9
+
+
+def test_cancellation(slow_server, tmp_path):
+    runner = make_runner(slow_server, tmp_path)
+    token = CancelToken()
+    threading.Timer(0.2, token.cancel).start()
+    start = time.monotonic()
+    result = runner.run("hello", cancel=token)
+    elapsed = time.monotonic() - start
+    runner.close()
+
+    assert result.cancelled
+    assert not result.success
+    assert elapsed < 0.9
+
+
+def test_cancellation_async(slow_server, tmp_path):
+    runner = make_runner(slow_server, tmp_path)
+
+    async def cancel_soon():
+        task = asyncio.create_task(runner.run_async("hello"))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await task
+
+    start = time.monotonic()
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancel_soon())
+    elapsed = time.monotonic() - start
+    runner.close()
+
+    assert elapsed < 0.9
+
+
+def test_missing_api_key(server, tmp_path):
+    runner = make_runner(server, tmp_path, api_key=None)
+    result = runner.run("hello")
+    async_result = asyncio.run(runner.run_async("hello"))
+    runner.close()
+
+    for outcome in (result, async_result):
+        assert not outcome.success
+        assert outcome.error_class == PERMANENT
+        assert "API key" in outcome.error_message
+    assert server.requests == 0
+    assert not runner.check_available()
@@ -0,0 +1,60 @@
+"""StateJournal recovery from a torn tail."""
+
+from plan_runner.models.state import ExecutionState
+from plan_runner.state.journal import StateJournal
+
+
+def event(seq: int, kind: str) -> dict:
+    """Journal record of a run event."""
+    return {"seq": seq, "op": "event", "event": {"kind": kind}}
+
+
+def replayed_kinds(path) -> list[str]:
+    """Kinds of the events a fresh state gets from replaying the journal."""
+    state = ExecutionState(plan_name="test", plan_file="test.md")
+    StateJournal(path).replay(state)
+    return [e["kind"] for e in state.events]
+
+
+def tear(path, data: bytes) -> None:
+    """Append a partial record, as a crash mid-write leaves it."""
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def test_replay_truncates_torn_tail(tmp_path):
+    path = tmp_path / "state.json.journal"
+    journal = StateJournal(path)
+    journal.append_batch([event(1, "a"), event(2, "b")])
+    journal.close()
+    tear(path, b'{"seq": 3, "op": "ev')
+
+    journal = StateJournal(path)
+    state = ExecutionState(plan_name="test", plan_file="test.md")
+    assert journal.replay(state) == 2
+    assert path.read_bytes().endswith(b"\n")
+
+    journal.append_batch([event(3, "c")])
+    journal.close()
+    assert replayed_kinds(path) == ["a", "b", "c"]
+
+
+def test_first_append_truncates_torn_tail(tmp_path):
+    path = tmp_path / "state.json.journal"
+    journal = StateJournal(path)
+    journal.append_batch([event(1, "a")])
+    journal.close()
+    tear(path, b'{"seq": 2')
+
+    journal = StateJournal(path)
+    journal.append_batch([event(2, "b")])
+    journal.close()
+    assert replayed_kinds(path) == ["a", "b"]
+
+
+def test_record_without_newline_is_dropped(tmp_path):
+    path = tmp_path / "state.json.journal"
+    path.write_bytes(b'{"seq": 1, "op": "event", "event": {"kind": "a"}}\n{"seq": 2, "op": "event", "event": {}}')
+
+    assert replayed_kinds(path) == ["a"]
+    assert path.read_bytes().count(b"\n") == 1
@@ -0,0 +1,53 @@
+"""TaskScheduler settling attempts against the fake CLI."""
+
+import sys
+
+import pytest
+
+from plan_runner.bench.engines import FAKE_CLAUDE
+from plan_runner.bench.load import make_plan
+from plan_runner.executor.async_engine import AsyncTaskExecutor
+from plan_runner.executor.plan_executor import PlanExecutor
+from plan_runner.executor.task_executor import TaskExecutor
+from plan_runner.models.config import PlanConfig
+from plan_runner.models.state import TaskStatus
+
+
+def make_config(tmp_path, **overrides) -> PlanConfig:
+    """Config running the fake CLI in process, without history or cache."""
+    settings = dict(
+        name="test",
+        workers=2,
+        retry_delay=0,
+        working_dir=str(tmp_path),
+        output_dir=str(tmp_path / "output"),
+        runner="fake",
+        claude_command=f"{sys.executable} {FAKE_CLAUDE} --latency 0",
+        history_file="",
+        progress_interval=3600,
+    )
+    settings.update(overrides)
+    return PlanConfig(**settings)
+
+
+@pytest.mark.parametrize("engine", ["threads", "asyncio"])
+def test_raising_attempt_under_no_retry_policy(tmp_path, monkeypatch, capsys, engine):
+    def raise_sync(self, task, attempt, cancel=None):
+        raise RuntimeError("runner exploded")
+
+    async def raise_async(self, task, attempt):
+        raise RuntimeError("runner exploded")
+
+    monkeypatch.setattr(TaskExecutor, "run_once", raise_sync)
+    monkeypatch.setattr(AsyncTaskExecutor, "run_once", raise_async)
+    config = make_config(tmp_path, engine=engine, retry_policies={"task": {"retry": False}})
+    executor = PlanExecutor(make_plan(2, 1, 50, config))
+
+    assert executor.execute() is False
+
+    output = capsys.readouterr().out
+    assert "Not retrying: exception error" in output
+    state = executor.state_manager.state
+    for task_id in executor.tasks:
+        assert state.tasks.status_of(task_id) == TaskStatus.FAILED
+        assert state.tasks[task_id].error_message == "runner exploded"
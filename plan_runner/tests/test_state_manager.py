@@ -0,0 +1,81 @@
+"""StateManager keeps records a failed flush could not write."""
+
+import sqlite3
+import time
+
+import pytest
+
+from plan_runner.models.config import PlanConfig
+from plan_runner.models.plan import Phase, Plan, Task
+from plan_runner.models.state import TaskStatus
+from plan_runner.state.sqlite_backend import SqliteStateBackend
+from plan_runner.state.state_manager import StateManager
+
+
+def make_manager(tmp_path, flush_interval: float) -> StateManager:
+    """SQLite-backed manager initialized with three pending tasks."""
+    plan = Plan(name="test", config=PlanConfig(name="test"), phases=[Phase(name="build")])
+    tasks = [Task(task_id=f"task-{i}", phase_name="build", prompt="") for i in range(3)]
+    manager = StateManager(tmp_path / "state.db", flush_interval=flush_interval, backend="sqlite")
+    manager.initialize(plan, tasks)
+    return manager
+
+
+def fail_once(monkeypatch, manager: StateManager) -> list:
+    """Make the backend's next append raise a locked-database error."""
+    failures = []
+    append = manager.backend.append
+
+    def flaky_append(records):
+        if not failures:
+            failures.append(len(records))
+            raise sqlite3.OperationalError("database is locked")
+        append(records)
+
+    monkeypatch.setattr(manager.backend, "append", flaky_append)
+    return failures
+
+
+def stored_statuses(tmp_path) -> dict:
+    """Task statuses as a fresh reader of the database sees them."""
+    backend = SqliteStateBackend(tmp_path / "state.db")
+    try:
+        state = backend.load()
+        return {task_id: state.tasks.status_of(task_id) for task_id in state.tasks}
+    finally:
+        backend.close()
+
+
+def test_failed_flush_keeps_records(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, flush_interval=3600)
+    failures = fail_once(monkeypatch, manager)
+    manager.task_started("task-0")
+    manager.task_completed("task-0", {})
+    manager.task_started("task-1")
+
+    with pytest.raises(sqlite3.OperationalError):
+        manager.flush()
+    assert failures == [3]
+    assert stored_statuses(tmp_path)["task-0"] == TaskStatus.PENDING
+
+    manager.flush()
+    statuses = stored_statuses(tmp_path)
+    assert statuses["task-0"] == TaskStatus.COMPLETED
+    assert statuses["task-1"] == TaskStatus.RUNNING
+    manager.close()
+
+
+def test_flusher_survives_backend_error(tmp_path, monkeypatch, capsys):
+    manager = make_manager(tmp_path, flush_interval=0.05)
+    failures = fail_once(monkeypatch, manager)
+    manager.task_started("task-0")
+    manager.task_completed("task-0", {})
+
+    deadline = time.monotonic() + 5
+    while stored_statuses(tmp_path)["task-0"] != TaskStatus.COMPLETED:
+        assert time.monotonic() < deadline, "records never reached the database"
+        time.sleep(0.05)
+
+    assert failures
+    assert "database is locked" in capsys.readouterr().out
+    manager.close()